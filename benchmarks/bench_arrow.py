@@ -0,0 +1,64 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares binary_decode_arrow with building a table from get_dict rows.
+
+Run from the repository root: python -m benchmarks.bench_arrow
+"""
+
+import time
+
+import pyarrow as pa
+
+from openlr import binary_decode, binary_encode, get_dict
+from openlr.arrow_format import binary_decode_arrow, binary_encode_arrow
+from openlr.testing import GeneratorConfig, generate_references
+
+
+def dict_rows(references):
+    rows = []
+    for reference in references:
+        location_dict = get_dict(binary_decode(reference))
+        row = dict(location_dict["properties"], type=location_dict["type"])
+        rows.append(row)
+    return pa.Table.from_pylist(rows)
+
+
+def timed(name, function, argument, n):
+    start = time.perf_counter()
+    result = function(argument)
+    elapsed = time.perf_counter() - start
+    print("%-36s %8.0f locs/s" % (name, n / elapsed))
+    return result
+
+
+def main(n=50000):
+    for label, config in (
+        ("all types", None),
+        ("lines only", GeneratorConfig(type_weights={"LineLocationReference": 1})),
+    ):
+        references = list(generate_references(n, config=config))
+        print(label)
+        timed("  get_dict rows -> Table", dict_rows, references, n)
+        table = timed("  binary_decode_arrow", binary_decode_arrow, references, n)
+        timed("  binary_encode_arrow", binary_encode_arrow, table, n)
+        timed(
+            "  binary_decode + binary_encode",
+            lambda refs: [binary_encode(binary_decode(r)) for r in refs],
+            references,
+            n,
+        )
+
+
+if __name__ == "__main__":
+    main()
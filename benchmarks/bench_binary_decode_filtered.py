@@ -0,0 +1,74 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares binary_decode_filtered with decoding everything and filtering after.
+
+Run from the repository root: python -m benchmarks.bench_binary_decode_filtered
+"""
+
+import timeit
+
+from openlr import binary_decode_many, binary_decode_filtered, binary_encode
+from openlr.binary_format import LocationTypes
+from tests.data import random_locations
+
+# a regional shard interested in lines and points along lines
+TYPES = {LocationTypes.LineLocation, LocationTypes.PointAlongLineLocation}
+BBOX = (0.0, 40.0, 20.0, 60.0)
+
+
+def first_lonlat(location):
+    if hasattr(location, "points"):
+        return location.points[0][:2]
+    if hasattr(location, "point"):
+        return location.point
+    if hasattr(location, "corners"):
+        return location.corners[0]
+    return location.lowerLeft
+
+
+def decode_then_filter(data):
+    lines = (
+        "LineLocationReference",
+        "PointAlongLineLocationReference",
+        "PoiWithAccessPointLocationReference",
+    )
+    result = []
+    for location in binary_decode_many(data):
+        if type(location).__name__ in lines:
+            lon, lat = first_lonlat(location)
+            if BBOX[0] <= lon <= BBOX[2] and BBOX[1] <= lat <= BBOX[3]:
+                result.append(location)
+    return result
+
+
+def main(n=50000, repeat=5):
+    data = [binary_encode(location) for location in random_locations(n)]
+    expected = decode_then_filter(data)
+    assert binary_decode_filtered(data, TYPES, BBOX)[0] == expected
+
+    full = min(timeit.repeat(lambda: decode_then_filter(data), number=1, repeat=repeat))
+    pushed = min(
+        timeit.repeat(
+            lambda: binary_decode_filtered(data, TYPES, BBOX), number=1, repeat=repeat
+        )
+    )
+    print(
+        "%d of %d references match  decode+filter: %8.0f refs/s  "
+        "filtered decode: %8.0f refs/s  speedup: %.2fx"
+        % (len(expected), n, n / full, n / pushed, full / pushed)
+    )
+
+
+if __name__ == "__main__":
+    main()
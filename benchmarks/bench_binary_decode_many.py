@@ -0,0 +1,67 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares binary_decode_many with a Python loop around binary_decode.
+
+Run from the repository root: python -m benchmarks.bench_binary_decode_many
+"""
+
+import timeit
+
+from openlr import binary_decode, binary_decode_many
+
+REFERENCES = [
+    "CwRbWyNG9RpsCQCb/jsbtAT/6/+jK1lE",
+    "CwB67CGukRxiCACyAbwaMXU=",
+    "K/6P+SKSuBJGGAUn/1gSUyM=",
+    "KwOg5iUNnCOTAv+D/5QjQ1j/gP/r",
+    "AwOgxCUNmwEs",
+    "QwOgcSUNGgGIAX8=",
+    "EwOgUCUNEwJFAH//yAEv/vIAxw==",
+    "WwRboCNGfhJrBAAJ/zkb9AgTFQ==",
+]
+MALFORMED = ["ewGkNSK5Wg==", "CQcm6yX4vTPGFwM7AskzCw=="]
+
+
+def loop_decode(data):
+    locations = []
+    for item in data:
+        try:
+            locations.append(binary_decode(item))
+        except (ValueError, NotImplementedError, IndexError):
+            pass
+    return locations
+
+
+def main(n=20000, repeat=5):
+    valid = (REFERENCES * (n // len(REFERENCES) + 1))[:n]
+    # a few percent of the feed is malformed
+    mixed = list(valid)
+    for i in range(0, n, 25):
+        mixed[i] = MALFORMED[i % len(MALFORMED)]
+
+    for name, data in (("valid", valid), ("3% malformed", mixed)):
+        loop = min(timeit.repeat(lambda: loop_decode(data), number=1, repeat=repeat))
+        bulk = min(
+            timeit.repeat(
+                lambda: binary_decode_many(data, errors="skip"), number=1, repeat=repeat
+            )
+        )
+        print(
+            "%-14s loop: %8.0f refs/s  bulk: %8.0f refs/s  speedup: %.2fx"
+            % (name, n / loop, n / bulk, loop / bulk)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares the memory of a LocationCorpus with a list of binary_decode results,
+both the memory kept after building and the peak while building.
+
+Run from the repository root: python -m benchmarks.bench_corpus_memory
+"""
+
+import tracemalloc
+
+from openlr import binary_decode, binary_encode, LineLocationReference
+from openlr.corpus import LocationCorpus
+from tests.data import random_locations
+
+
+def traced(build):
+    """returns the object built, the bytes it keeps and the peak bytes"""
+    tracemalloc.start()
+    try:
+        result = build()
+        size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size, peak
+
+
+def main(n=50000):
+    locations = [
+        location
+        for location in random_locations(n * 10)
+        if isinstance(location, LineLocationReference)
+    ][:n]
+    data = [binary_encode(location) for location in locations]
+
+    _, list_size, list_peak = traced(lambda: [binary_decode(item) for item in data])
+    print(
+        "%-20s %8.1f MB  peak %8.1f MB"
+        % ("list of NamedTuples", list_size / 1e6, list_peak / 1e6)
+    )
+    for coordinates in ("float64", "int32"):
+        corpus, corpus_size, corpus_peak = traced(
+            lambda: LocationCorpus.from_binary(data, coordinates=coordinates)
+        )
+        print(
+            "%-20s %8.1f MB  peak %8.1f MB  %.1fx smaller peak"
+            % (
+                "corpus " + coordinates,
+                corpus_size / 1e6,
+                corpus_peak / 1e6,
+                list_peak / corpus_peak,
+            )
+        )
+    print("%d line locations, %d points" % (len(corpus), len(corpus._lon)))
+
+
+if __name__ == "__main__":
+    main()
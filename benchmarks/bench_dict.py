@@ -0,0 +1,58 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares to_dict, to_json and from_dict with get_dict and binary decoding.
+
+Run from the repository root: python -m benchmarks.bench_dict
+"""
+
+import json
+import time
+
+from openlr import (
+    binary_decode,
+    binary_encode,
+    from_dict,
+    from_json,
+    get_dict,
+    to_dict,
+    to_json,
+)
+from openlr.testing import generate_locations
+
+
+def timed(name, function, items):
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    elapsed = time.perf_counter() - start
+    print("%-28s %8.1f us/location" % (name, elapsed / len(items) * 1e6))
+
+
+def main(n=20000):
+    locations = list(generate_locations(n))
+    timed("get_dict", get_dict, locations)
+    timed("to_dict", to_dict, locations)
+    timed("to_dict enum_names", lambda l: to_dict(l, enum_names=True), locations)
+    timed("json.dumps(get_dict)", lambda l: json.dumps(get_dict(l)), locations)
+    timed("to_json", to_json, locations)
+    references = [binary_encode(location) for location in locations]
+    dicts = [to_dict(location) for location in locations]
+    strings = [to_json(location) for location in locations]
+    timed("binary_decode", binary_decode, references)
+    timed("from_dict", from_dict, dicts)
+    timed("from_json", from_json, strings)
+
+
+if __name__ == "__main__":
+    main()
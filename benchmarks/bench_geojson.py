@@ -0,0 +1,70 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares geojson_encode_to_file with dumping a FeatureCollection built in memory.
+
+Run from the repository root: python -m benchmarks.bench_geojson
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from openlr import geojson_encode_feature, geojson_encode_to_file
+from openlr.testing import generate_locations
+
+
+def collection_dump(locations, filename):
+    collection = {
+        "type": "FeatureCollection",
+        "features": [geojson_encode_feature(location) for location in locations],
+    }
+    with open(filename, "w") as f:
+        f.write(json.dumps(collection))
+
+
+def stream_dump(locations, filename):
+    geojson_encode_to_file(locations, filename)
+
+
+def measure(dump, n, filename):
+    """returns the run time and the peak of the traced memory"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    # the locations are generated lazily as a decoder of a feed would
+    dump(generate_locations(n), filename)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes=(1000, 10000, 50000)):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "export.geojson")
+        for n in sizes:
+            for name, dump in (
+                ("collection", collection_dump),
+                ("stream", stream_dump),
+            ):
+                elapsed, peak = measure(dump, n, filename)
+                print(
+                    "%6d locations  %-10s %8.0f locs/s  peak %7.1f MB"
+                    % (n, name, n / elapsed, peak / 1e6)
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures the scaling of decode_many and encode_many over worker counts.
+
+Run from the repository root: python -m benchmarks.bench_parallel
+"""
+
+import timeit
+
+from openlr import binary_encode, decode_many, encode_many, xml_encode_to_string
+from tests.data import random_locations
+
+WORKERS = (1, 2, 4, 8)
+
+
+def main(n=100000, n_xml=10000, repeat=3):
+    locations = random_locations(n)
+    binary = [binary_encode(location) for location in locations]
+    xml = [xml_encode_to_string(location) for location in locations[:n_xml]]
+
+    cases = (
+        ("binary decode", n, lambda w: decode_many(binary, workers=w)),
+        ("binary encode", n, lambda w: encode_many(locations, workers=w)),
+        ("xml decode", n_xml, lambda w: decode_many(xml, workers=w, format="xml")),
+    )
+    for name, count, run in cases:
+        base = None
+        for workers in WORKERS:
+            elapsed = min(
+                timeit.repeat(lambda: list(run(workers)), number=1, repeat=repeat)
+            )
+            base = base or elapsed
+            print(
+                "%-14s workers: %d  %9.0f refs/s  speedup: %.2fx"
+                % (name, workers, count / elapsed, base / elapsed)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Reports the build time of the spatial index and compares its bounding box,
+radius and nearest neighbor queries with linear scans over the bounding boxes.
+
+Run from the repository root: python -m benchmarks.bench_spatial_index
+"""
+
+import heapq
+import math
+import random
+import time
+
+from openlr import LocationIndex, get_bbox
+from openlr.testing import GeneratorConfig, generate_locations
+
+# a country sized extent with city sized locations
+CONFIG = GeneratorConfig(
+    extent=(2.0, 46.0, 8.0, 52.0),
+    radius=(10, 5000),
+    grid_size=(1, 10),
+    rectangle_size=(0.001, 0.05),
+)
+
+
+def scan_bbox(bboxes, min_lon, min_lat, max_lon, max_lat):
+    return [
+        key
+        for key, b in bboxes.items()
+        if b[0] <= max_lon and min_lon <= b[2] and b[1] <= max_lat and min_lat <= b[3]
+    ]
+
+
+def distance(lon, lat, bbox):
+    d_lon = max(bbox[0] - lon, 0.0, lon - bbox[2]) * math.cos(math.radians(lat))
+    d_lat = max(bbox[1] - lat, 0.0, lat - bbox[3])
+    return math.hypot(d_lon, d_lat) * 111320.0
+
+
+def scan_radius(bboxes, lon, lat, radius):
+    return [key for key, b in bboxes.items() if distance(lon, lat, b) <= radius]
+
+
+def scan_nearest(bboxes, lon, lat, k):
+    return heapq.nsmallest(
+        k, ((distance(lon, lat, b), key) for key, b in bboxes.items())
+    )
+
+
+def rate(function, queries):
+    start = time.perf_counter()
+    for query in queries:
+        function(*query)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main(n=200000, n_queries=200):
+    locations = list(generate_locations(n, config=CONFIG))
+    start = time.perf_counter()
+    index = LocationIndex(enumerate(locations))
+    print(
+        "build LocationIndex     %8.2f s for %d locations"
+        % (time.perf_counter() - start, n)
+    )
+    bboxes = {key: get_bbox(location) for key, location in enumerate(locations)}
+
+    rng = random.Random(0)
+    points = [
+        (rng.uniform(2.0, 8.0), rng.uniform(46.0, 52.0)) for _ in range(n_queries)
+    ]
+    cases = [
+        (
+            "bbox 0.05 deg",
+            [(lon, lat, lon + 0.05, lat + 0.05) for lon, lat in points],
+            index.query_bbox,
+            lambda *q: scan_bbox(bboxes, *q),
+        ),
+        (
+            "radius 2 km",
+            [(lon, lat, 2000) for lon, lat in points],
+            index.query_radius,
+            lambda *q: scan_radius(bboxes, *q),
+        ),
+        (
+            "nearest k=10",
+            [(lon, lat, 10) for lon, lat in points],
+            index.nearest,
+            lambda *q: scan_nearest(bboxes, *q),
+        ),
+    ]
+    for name, queries, indexed, scan in cases:
+        indexed_rate = rate(indexed, queries)
+        # the scans are slow, a tenth of the queries is enough
+        scan_rate = rate(scan, queries[: max(len(queries) // 10, 1)])
+        print(
+            "%-16s index %10.0f q/s  linear scan %8.1f q/s  (x%.0f)"
+            % (name, indexed_rate, scan_rate, indexed_rate / scan_rate)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Reports the throughput of the WKB, WKT and PostgreSQL COPY export, and of
+building shapely geometries when shapely is installed.
+
+Run from the repository root: python -m benchmarks.bench_wkb
+"""
+
+import io
+import time
+
+from openlr import geojson_encode_geometry
+from openlr.testing import generate_locations
+from openlr.wkb_format import wkb_encode_many, wkt_encode_many, write_pgcopy
+
+try:
+    import shapely.geometry
+except ImportError:
+    shapely = None
+
+
+def shapely_wkb(locations):
+    return [
+        shapely.geometry.shape(geojson_encode_geometry(location)).wkb
+        for location in locations
+    ]
+
+
+def main(n=50000):
+    locations = list(generate_locations(n))
+    cases = [
+        ("wkb_encode_many", wkb_encode_many),
+        ("wkb_encode_many srid", lambda locs: wkb_encode_many(locs, 4326)),
+        ("wkt_encode_many", wkt_encode_many),
+        ("write_pgcopy", lambda locs: write_pgcopy(locs, io.BytesIO())),
+    ]
+    if shapely is not None:
+        cases.append(("shapely .wkb", shapely_wkb))
+    for name, export in cases:
+        start = time.perf_counter()
+        export(locations)
+        elapsed = time.perf_counter() - start
+        print("%-24s %8.0f locs/s" % (name, n / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures the XML decoders on the test samples and on long line locations.
+
+The time per location reference point stays flat with the line length when
+the decoding is linear.
+
+Run from the repository root: python -m benchmarks.bench_xml_decode_scaling
+"""
+
+import glob
+import os
+import time
+from xml.dom import minidom
+
+from openlr import (
+    FRC,
+    FOW,
+    LineLocationReference,
+    LocationReferencePoint,
+    xml_decode_document,
+    xml_decode_string,
+    xml_encode_to_string,
+)
+from openlr import xml_format
+
+
+def backend_decode(data):
+    return xml_decode_string(data)
+
+
+def minidom_decode(data):
+    return xml_decode_document(minidom.parseString(data))
+
+
+DECODERS = (("backend", backend_decode), ("minidom", minidom_decode))
+
+
+def long_line(n_points):
+    points = [
+        LocationReferencePoint(
+            5.0 + i * 1e-3, 52.0, FRC.FRC3, FOW.SINGLE_CARRIAGEWAY, 90, FRC.FRC3, 70
+        )
+        for i in range(n_points)
+    ]
+    points[-1] = points[-1]._replace(lfrcnp=FRC.FRC7, dnp=0)
+    return LineLocationReference(points, 0.5, 0.25)
+
+
+def timed(decode, data, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode(data)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(sizes=(100, 400, 1600, 6400), repeat=200):
+    print("XML backend: %s" % xml_format._backend.name)
+    pattern = os.path.join(os.path.dirname(__file__), "..", "tests", "xml_data", "*")
+    samples = []
+    for filename in sorted(glob.glob(pattern)):
+        with open(filename, "rb") as f:
+            samples.append(f.read())
+    for name, decode in DECODERS:
+        elapsed = sum(timed(decode, data, repeat) for data in samples)
+        print(
+            "%d samples  %-8s %8.0f locs/s"
+            % (len(samples), name, len(samples) / elapsed)
+        )
+    for n in sizes:
+        data = xml_encode_to_string(long_line(n))
+        for name, decode in DECODERS:
+            elapsed = timed(decode, data, max(1, repeat * 10 // n))
+            print("%5d LRPs  %-8s %8.1f us/LRP" % (n, name, elapsed / n * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares xml_decode_stream with decoding a minidom DOM of the whole file.
+
+Run from the repository root: python -m benchmarks.bench_xml_decode_stream
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from xml.dom import minidom
+
+from openlr import xml_decode_document, xml_decode_stream, xml_encode_to_string
+from tests.data import random_locations
+
+
+def minidom_decode(filename):
+    doc = minidom.parse(filename)
+    return [xml_decode_document(el) for el in doc.getElementsByTagNameNS("*", "OpenLR")]
+
+
+def stream_decode(filename):
+    # consumers process the locations one by one, none are kept
+    count = 0
+    for _ in xml_decode_stream(filename):
+        count += 1
+    return count
+
+
+def measure(decode, filename):
+    """returns the run time and the peak of the traced memory"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    decode(filename)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes=(1000, 10000)):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in sizes:
+            filename = os.path.join(tmp_dir, "export_%d.xml" % n)
+            with open(filename, "w") as f:
+                f.write("<Export>")
+                for location in random_locations(n):
+                    f.write(xml_encode_to_string(location).split("?>", 1)[1])
+                f.write("</Export>")
+            mb = os.path.getsize(filename) / 1e6
+            for name, decode in (
+                ("minidom", minidom_decode),
+                ("stream", stream_decode),
+            ):
+                elapsed, peak = measure(decode, filename)
+                print(
+                    "%6d locations (%5.1f MB)  %-8s %8.0f locs/s  peak %7.1f MB"
+                    % (n, mb, name, n / elapsed, peak / 1e6)
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares the direct XML writer with serializing minidom documents.
+
+Run from the repository root: python -m benchmarks.bench_xml_encode
+"""
+
+import io
+import time
+
+from openlr import xml_encode_to_document, xml_encode_to_file, xml_encode_to_string
+from tests.data import random_locations
+
+
+def minidom_encode(locations, is_pretty):
+    for location in locations:
+        doc = xml_encode_to_document(location)
+        doc.toprettyxml(indent="  ") if is_pretty else doc.toxml()
+
+
+def direct_encode(locations, is_pretty):
+    for location in locations:
+        xml_encode_to_string(location, is_pretty)
+
+
+def file_encode(locations, is_pretty):
+    xml_encode_to_file(locations, io.StringIO(), is_pretty)
+
+
+def main(n=10000):
+    locations = random_locations(n)
+    for is_pretty in (False, True):
+        for name, encode in (
+            ("minidom", minidom_encode),
+            ("direct", direct_encode),
+            ("file", file_encode),
+        ):
+            start = time.perf_counter()
+            encode(locations, is_pretty)
+            elapsed = time.perf_counter() - start
+            print("pretty=%-5s %-8s %8.0f locs/s" % (is_pretty, name, n / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The cases of openlr.benchmark as pytest-benchmark tests.
+
+Run from the repository root: pytest benchmarks --benchmark-json=bench.json
+"""
+
+import pytest
+
+from openlr.benchmark import FORMATS, OPERATIONS, build_cases, _CODECS
+
+pytest.importorskip("pytest_benchmark")
+
+CASES = build_cases(50)
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+@pytest.mark.parametrize("operation", OPERATIONS)
+@pytest.mark.parametrize("format", FORMATS)
+def test_openlr(benchmark, format, operation, case):
+    encode, decode = _CODECS[format]
+    if operation == "encode":
+        func, args = encode, case.locations
+    else:
+        func, args = decode, [encode(location) for location in case.locations]
+
+    def run_case():
+        for arg in args:
+            func(arg)
+
+    benchmark.extra_info["locations"] = len(args)
+    benchmark(run_case)
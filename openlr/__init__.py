@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """OpenLR physical format encoder/decoder"""
+
 from openlr._version import (
     __title__,
     __description__,
@@ -39,13 +40,65 @@ from openlr.locations import (
     GridLocationReference,
     PolygonLocationReference,
     ClosedLineLocationReference,
+    FrozenLineLocationReference,
+    FrozenPointAlongLineLocationReference,
+    FrozenPoiWithAccessPointLocationReference,
+    FrozenPolygonLocationReference,
+    FrozenClosedLineLocationReference,
+)
+from openlr.binary_format import (
+    DecodeError,
+    FilterCounts,
+    binary_decode,
+    binary_decode_many,
+    binary_decode_from,
+    binary_decode_framed,
+    binary_decode_filtered,
+    binary_decode_columnar,
+    binary_encode,
+    binary_encode_columnar,
 )
-from openlr.binary_format import binary_decode, binary_encode
 from openlr.xml_format import (
     xml_decode_document,
+    xml_decode_element,
     xml_decode_file,
+    xml_decode_stream,
     xml_decode_string,
     xml_encode_to_document,
     xml_encode_to_string,
+    set_xml_backend,
+    XMLParseError,
+)
+from openlr.utils import (
+    get_dict,
+    get_lonlat_list,
+    get_bbox,
+    freeze,
+    thaw,
+    to_dict,
+    from_dict,
+    to_json,
+    from_json,
+)
+from openlr.streaming import iter_reference_file, open_reference_file
+from openlr.parallel import decode_many, encode_many
+from openlr.aio import aiter_references
+from openlr.cache import CacheStats, DecodeCache, EncodeCache
+from openlr.corpus import LocationCorpus, LocationView
+from openlr.lazy import binary_decode_lazy, LazyLocation
+from openlr.xml_writer import xml_encode_to_file, XMLWriter
+from openlr.geojson_format import (
+    geojson_encode_geometry,
+    geojson_encode_feature,
+    geojson_encode_to_string,
+    geojson_encode_to_file,
+    GeoJSONWriter,
+)
+from openlr.wkb_format import (
+    wkb_encode,
+    wkb_encode_many,
+    wkt_encode,
+    wkt_encode_many,
+    write_pgcopy,
 )
-from openlr.utils import get_dict, get_lonlat_list
+from openlr.spatial_index import LocationIndex
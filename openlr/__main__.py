@@ -12,16 +12,138 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import argparse
+import io
+import sys
 
 from openlr import binary_decode, xml_encode_to_string, __version__
+from openlr.convert import convert, INPUT_FORMATS, OUTPUT_FORMATS, ERROR_POLICIES
 
+# defaults of the conversion options, None when not given on the command line
+_DEFAULTS = {
+    "from_format": "base64",
+    "to_format": "xml",
+    "output": "-",
+    "workers": 1,
+    "errors": "report",
+}
 
-parser = argparse.ArgumentParser(
-    description="Decode an OpenLR binary location reference"
-)
-parser.add_argument("lr", help="the base 64 binary location reference string")
-parser.add_argument("--version", "-v", action="version", version=__version__)
-args = parser.parse_args()
 
-location = binary_decode(args.lr)
-print(xml_encode_to_string(location, is_pretty=True))
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["bench"]:
+        from openlr.benchmark import main as bench_main
+
+        return bench_main(argv[1:])
+    if argv[:1] == ["generate"]:
+        from openlr.testing import main as generate_main
+
+        return generate_main(argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Decode and convert OpenLR location references"
+    )
+    parser.add_argument(
+        "lr",
+        nargs="?",
+        help="the base 64 binary location reference string, printed as pretty "
+        "XML unless conversion options are given",
+    )
+    parser.add_argument(
+        "--file",
+        "-f",
+        action="append",
+        help="input file, plain or gzip, bz2 or xz compressed; '-' reads from "
+        "stdin, which is also read when neither a location reference nor a "
+        "file is given and stdin is not a terminal. May be given several times",
+    )
+    parser.add_argument(
+        "--from",
+        dest="from_format",
+        choices=INPUT_FORMATS,
+        help="input format, one reference per line except for framed binary "
+        "and multi-location XML documents (default: base64)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_format",
+        choices=OUTPUT_FORMATS,
+        help="output format, one reference per line except for framed binary "
+        "(default: xml)",
+    )
+    parser.add_argument(
+        "--output", "-o", help="output file, '-' for stdout (default: '-')"
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        help="number of processes converting the references, 0 for one per CPU",
+    )
+    parser.add_argument(
+        "--errors",
+        choices=ERROR_POLICIES,
+        help="skip invalid references, report them on stderr or stop at the "
+        "first one (default: report)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print throughput, counts per location type and failures on stderr",
+    )
+    parser.add_argument("--version", "-v", action="version", version=__version__)
+    args = parser.parse_args(argv)
+
+    if args.lr is not None:
+        if args.file is not None:
+            parser.error("a location reference cannot be combined with --file")
+        is_plain = all(getattr(args, option) is None for option in _DEFAULTS)
+        if is_plain and not args.stats:
+            location = binary_decode(args.lr)
+            print(xml_encode_to_string(location, is_pretty=True))
+            return 0
+        # converted like a file of one line
+        args.file = [io.BytesIO(args.lr.encode("utf-8") + b"\n")]
+    elif args.file is None:
+        if sys.stdin is None or sys.stdin.isatty():
+            parser.error(
+                "either a location reference, --file or piped input is required"
+            )
+        args.file = ["-"]
+    for option, default in _DEFAULTS.items():
+        if getattr(args, option) is None:
+            setattr(args, option, default)
+
+    inputs = [sys.stdin.buffer if f == "-" else f for f in args.file]
+    is_binary = args.to_format == "framed"
+    is_stdout = args.output == "-"
+    if is_stdout:
+        output = sys.stdout.buffer if is_binary else sys.stdout
+    elif is_binary:
+        output = open(args.output, "wb")
+    else:
+        output = open(args.output, "w", encoding="utf-8")
+    try:
+        stats = convert(
+            inputs,
+            output,
+            args.from_format,
+            args.to_format,
+            workers=args.workers or None,
+            errors=args.errors,
+        )
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    finally:
+        if is_stdout:
+            output.flush()
+        else:
+            output.close()
+    if args.stats:
+        print(stats.summary(), file=sys.stderr)
+    return 1 if stats.failed and args.errors == "report" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Asynchronous decoding of reference feeds read from an asyncio stream.
+"""
+
+import asyncio
+import struct
+
+from openlr.binary_format import DECODE_ERROR_POLICIES
+from openlr.parallel import _decode_chunk
+
+FRAMINGS = ("line", "length")
+DEFAULT_READ_SIZE = 1 << 16
+# like the limit of asyncio.StreamReader, references are far smaller
+DEFAULT_LIMIT = 1 << 16
+
+_END = object()
+
+
+async def aiter_references(
+    reader,
+    framing="line",
+    length_format=">H",
+    is_base64=None,
+    errors="raise",
+    batch_size=256,
+    max_pending=4,
+    executor=None,
+    read_size=DEFAULT_READ_SIZE,
+    limit=DEFAULT_LIMIT,
+):
+    """Iterates asynchronously over the locations of a framed reference feed
+
+    The stream is read by a background task which splits the received data
+    into frames and groups them into batches of at most `batch_size`,
+    whatever arrived at once is decoded together. At most `max_pending`
+    batches wait for decoding, the stream is not read further until the
+    consumer catches up.
+
+    Parameters
+    -------
+    reader : asyncio.StreamReader
+        Stream of the feed
+    framing : str
+        "line" for newline-delimited references, "length" for references
+        preceded by their byte size packed with `length_format`
+    length_format : str
+        `struct` format of the length prefix, 2 bytes big endian by default
+    is_base64 : bool
+        Boolean flag for base64 encoded data, by default True for "line"
+        and False for "length" framing
+    errors : str
+        Policy for references that cannot be decoded: "raise", "skip" or
+        "record", see :func:`openlr.binary_decode_many`. Indices of
+        `DecodeError` records count the frames from the start of the stream.
+    batch_size : int
+        Maximum number of references decoded at once
+    max_pending : int
+        Maximum number of batches waiting for decoding
+    executor : concurrent.futures.Executor
+        Executor to decode the batches in, keeping the event loop free;
+        by default the batches are decoded on the event loop
+    read_size : int
+        Maximum number of bytes read from the stream at once
+    limit : int
+        Maximum byte size of a reference without its newline or length
+        prefix. A longer line, or a length prefix above it, raises
+        ValueError, so the buffer does not grow without bound on a stream
+        that never sends a newline.
+
+    Yields
+    -------
+    location : NamedTuple
+        Location object (or `DecodeError` record)
+    """
+    if framing not in FRAMINGS:
+        raise ValueError(
+            "framing requires one of %s but %r is given" % (FRAMINGS, framing)
+        )
+    if errors not in DECODE_ERROR_POLICIES:
+        raise ValueError(
+            "errors requires one of %s but %r is given"
+            % (", ".join(DECODE_ERROR_POLICIES), errors)
+        )
+    if limit < 1:
+        raise ValueError("limit requires a positive number but %s is given" % limit)
+    if is_base64 is None:
+        is_base64 = framing == "line"
+    if framing == "line":
+        split = _line_splitter(limit)
+    else:
+        split = _length_splitter(struct.Struct(length_format), limit)
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(max_pending)
+    producer = asyncio.ensure_future(
+        _read_batches(reader, split, batch_size, read_size, queue)
+    )
+    try:
+        start = 0
+        while True:
+            batch = await queue.get()
+            if batch is _END:
+                break
+            if isinstance(batch, BaseException):
+                raise batch
+            if executor is None:
+                locations = _decode_chunk(start, batch, "binary", is_base64, errors)
+            else:
+                locations = await loop.run_in_executor(
+                    executor, _decode_chunk, start, batch, "binary", is_base64, errors
+                )
+            start += len(batch)
+            for location in locations:
+                yield location
+    finally:
+        producer.cancel()
+
+
+async def _read_batches(reader, split, batch_size, read_size, queue):
+    """reads the stream, puts batches of frames and finally `_END` in the queue"""
+    buffer = bytearray()
+    try:
+        while True:
+            data = await reader.read(read_size)
+            buffer += data
+            frames = split(buffer, not data)
+            for i in range(0, len(frames), batch_size):
+                await queue.put(frames[i : i + batch_size])
+            if not data:
+                break
+        if buffer:
+            raise ValueError(
+                "Truncated record of %s bytes at end of stream" % len(buffer)
+            )
+    except Exception as error:
+        await queue.put(error)
+    else:
+        await queue.put(_END)
+
+
+def _line_splitter(limit):
+    def split(buffer, at_eof):
+        """removes the complete lines from the buffer and returns the non-empty ones"""
+        end = len(buffer) if at_eof else buffer.rfind(b"\n") + 1
+        lines = bytes(buffer[:end]).split(b"\n")
+        del buffer[:end]
+        if len(buffer) > limit or any(len(line) > limit for line in lines):
+            raise ValueError("Record exceeds the limit of %s bytes" % limit)
+        return [line for line in map(bytes.strip, lines) if line]
+
+    return split
+
+
+def _length_splitter(prefix, limit=None):
+    def split(buffer, at_eof):
+        """removes the complete length-prefixed records from the buffer"""
+        frames = []
+        offset = 0
+        end = len(buffer)
+        while offset + prefix.size <= end:
+            (length,) = prefix.unpack_from(buffer, offset)
+            if limit is not None and length > limit:
+                raise ValueError(
+                    "Record of %s bytes exceeds the limit of %s bytes" % (length, limit)
+                )
+            if offset + prefix.size + length > end:
+                break
+            offset += prefix.size
+            frames.append(bytes(buffer[offset : offset + length]))
+            offset += length
+        del buffer[:offset]
+        return frames
+
+    return split
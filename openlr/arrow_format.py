@@ -0,0 +1,509 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Apache Arrow tables and Parquet files of decoded location references.
+
+One row holds one location, with the columns named after the fields of the
+location types. Columns not used by a location type are null. Requires
+pyarrow and NumPy (``pip install openlr[arrow]``).
+"""
+
+import binascii
+from itertools import islice
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    np = pa = pq = None
+
+from openlr.binary_format import (
+    LocationTypeCode,
+    ColumnarLocations,
+    binary_decode,
+    binary_decode_columnar,
+    binary_encode,
+    binary_encode_columnar,
+    _header_type_code,
+)
+from openlr.locations import (
+    Coordinates,
+    GeoCoordinateLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    PolygonLocationReference,
+)
+
+DEFAULT_ROW_GROUP_SIZE = 1 << 16
+
+# location types held in the list of location reference points
+_LRP_TYPE_CODES = (
+    LocationTypeCode.LineLocation,
+    LocationTypeCode.PointAlongLineLocation,
+    LocationTypeCode.PoiWithAccessPointLocation,
+    LocationTypeCode.ClosedLineLocation,
+)
+_POINT_FIELDS = ("lon", "lat", "frc", "fow", "bear", "lfrcnp", "dnp")
+
+
+def arrow_schema():
+    """Returns the schema of the tables of :func:`binary_decode_arrow`
+
+    ======================== ============================ =======================
+    column                   type                         location types
+    ======================== ============================ =======================
+    location_type            uint8, `LocationTypeCode`    all
+    points                   list of struct lon, lat,     line, point along line,
+                             frc, fow, bear, lfrcnp, dnp  POI, closed line
+    poffs                    float64                      line, point along line,
+                                                          POI
+    noffs                    float64                      line
+    orientation, sideOfRoad  uint8                        point along line, POI
+    point                    struct lon, lat              geo-coordinate, circle,
+                                                          POI
+    radius                   uint32                       circle
+    lowerLeft, upperRight    struct lon, lat              rectangle, grid
+    n_cols, n_rows           uint16                       grid
+    corners                  list of struct lon, lat      polygon
+    lastLine                 struct frc, fow, bear        closed line
+    ======================== ============================ =======================
+
+    Returns
+    -------
+    schema : pyarrow.Schema
+    """
+    _require_pyarrow("arrow_schema")
+    coordinates = pa.struct([("lon", pa.float64()), ("lat", pa.float64())])
+    point = pa.struct(
+        [
+            ("lon", pa.float64()),
+            ("lat", pa.float64()),
+            ("frc", pa.uint8()),
+            ("fow", pa.uint8()),
+            ("bear", pa.uint16()),
+            ("lfrcnp", pa.uint8()),
+            ("dnp", pa.int32()),
+        ]
+    )
+    return pa.schema(
+        [
+            pa.field("location_type", pa.uint8(), nullable=False),
+            ("points", pa.list_(point)),
+            ("poffs", pa.float64()),
+            ("noffs", pa.float64()),
+            ("orientation", pa.uint8()),
+            ("sideOfRoad", pa.uint8()),
+            ("point", coordinates),
+            ("radius", pa.uint32()),
+            ("lowerLeft", coordinates),
+            ("upperRight", coordinates),
+            ("n_cols", pa.uint16()),
+            ("n_rows", pa.uint16()),
+            ("corners", pa.list_(coordinates)),
+            (
+                "lastLine",
+                pa.struct(
+                    [("frc", pa.uint8()), ("fow", pa.uint8()), ("bear", pa.uint16())]
+                ),
+            ),
+        ]
+    )
+
+
+def binary_decode_arrow(data, is_base64=True):
+    """Decodes binary location references into an Arrow table
+
+    The location reference points of line, point along line, POI and closed
+    line locations are decoded by :func:`binary_decode_columnar` and wrapped
+    into Arrow arrays without copying, the other location types are decoded
+    one by one.
+
+    Parameters
+    -------
+    data : iterable of str, bytearray, bytes
+        Bytes-like objects that contain the binary data of locations
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+
+    Returns
+    -------
+    table : pyarrow.Table
+        One row per location with the columns of :func:`arrow_schema`
+    """
+    _require_pyarrow("binary_decode_arrow")
+    if is_base64:
+        raws = [binascii.a2b_base64(item) for item in data]
+    else:
+        raws = [bytes(item) for item in data]
+    n = len(raws)
+    codes = np.empty(n, dtype=np.uint8)
+    for i, raw in enumerate(raws):
+        if not raw:
+            raise ValueError("Empty data at index %s" % i)
+        codes[i] = _header_type_code(raw[0], len(raw))
+
+    is_lrp = np.isin(codes, _LRP_TYPE_CODES)
+    lrp_rows = np.flatnonzero(is_lrp)
+    lrp = binary_decode_columnar([raws[i] for i in lrp_rows], is_base64=False)
+    columns = _ArrowColumns(n)
+    columns.set_points(lrp_rows, lrp)
+    for i in np.flatnonzero(~is_lrp).tolist():
+        columns.set_area(i, binary_decode(raws[i], is_base64=False))
+    return columns.table(codes)
+
+
+def binary_encode_arrow(table, is_base64=True):
+    """Encodes the rows of an Arrow table into binary location references
+
+    This is the inverse of :func:`binary_decode_arrow`. The rows of line,
+    point along line, POI and closed line locations are encoded from the
+    column arrays by :func:`binary_encode_columnar` without creating
+    location objects.
+
+    Parameters
+    -------
+    table : pyarrow.Table, pyarrow.RecordBatch
+        Rows with the columns of :func:`arrow_schema`, columns not used by
+        the location types of the rows may be left out
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+
+    Returns
+    -------
+    data : list of str, bytes
+        Binary data of the rows in order
+    """
+    _require_pyarrow("binary_encode_arrow")
+    columns = {name: _column(table, name) for name in table.schema.names}
+    codes = columns["location_type"].to_numpy(zero_copy_only=False)
+    results = [None] * len(codes)
+    is_lrp = np.isin(codes, _LRP_TYPE_CODES)
+    lrp_rows = np.flatnonzero(is_lrp)
+    if len(lrp_rows):
+        encoded = binary_encode_columnar(_columnar(columns, lrp_rows), is_base64)
+        if not is_base64:
+            data, offsets = encoded
+            encoded = [
+                data[start:end]
+                for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+            ]
+        for row, reference in zip(lrp_rows.tolist(), encoded):
+            results[row] = reference
+    for row in np.flatnonzero(~is_lrp).tolist():
+        location = _area_location(columns, int(codes[row]), row)
+        results[row] = binary_encode(location, is_base64)
+    return results
+
+
+def write_parquet(
+    data,
+    filename_or_file,
+    is_base64=True,
+    row_group_size=DEFAULT_ROW_GROUP_SIZE,
+    compression="snappy",
+):
+    """Decodes binary location references into a Parquet file
+
+    The references are decoded and written one row group at a time, so the
+    memory usage depends on the row group size and not on the number of
+    references.
+
+    Parameters
+    -------
+    data : iterable of str, bytearray, bytes
+        Bytes-like objects that contain the binary data of locations
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in binary mode
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+    row_group_size : int
+        Number of rows per row group
+    compression : str
+        Parquet compression codec
+
+    Returns
+    -------
+    count : int
+        Number of written rows
+    """
+    _require_pyarrow("write_parquet")
+    if row_group_size < 1:
+        raise ValueError(
+            "row_group_size requires a positive number but %s is given" % row_group_size
+        )
+    count = 0
+    data = iter(data)
+    with pq.ParquetWriter(
+        filename_or_file, arrow_schema(), compression=compression
+    ) as writer:
+        while True:
+            chunk = list(islice(data, row_group_size))
+            if not chunk:
+                break
+            writer.write_table(binary_decode_arrow(chunk, is_base64), row_group_size)
+            count += len(chunk)
+    return count
+
+
+def iter_parquet(filename_or_file, is_base64=True, batch_size=DEFAULT_ROW_GROUP_SIZE):
+    """Streams the rows of a Parquet file as binary location references
+
+    Parameters
+    -------
+    filename_or_file : str, os.PathLike, file object
+        Parquet file written by :func:`write_parquet` or with the columns of
+        :func:`arrow_schema`
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+    batch_size : int
+        Number of rows read and encoded at once
+
+    Yields
+    ------
+    data : str, bytes
+        Binary data of the rows in order
+    """
+    _require_pyarrow("iter_parquet")
+    parquet_file = pq.ParquetFile(filename_or_file)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield from binary_encode_arrow(batch, is_base64)
+
+
+def _require_pyarrow(name):
+    if pa is None:
+        raise ImportError("%s requires pyarrow and numpy" % name)
+
+
+class _ArrowColumns:
+    """NumPy buffers and validity masks of the columns of a table being built"""
+
+    def __init__(self, n):
+        self.n = n
+        self.point_counts = np.zeros(n, dtype=np.int64)
+        self.has_points = np.zeros(n, dtype=bool)
+        self.points = None
+        self.poffs = self._values(np.float64)
+        self.noffs = self._values(np.float64)
+        self.orientation = self._values(np.uint8)
+        self.sideOfRoad = self._values(np.uint8)
+        self.point = self._values(np.float64, 2)
+        self.radius = self._values(np.uint32)
+        self.lowerLeft = self._values(np.float64, 2)
+        self.upperRight = self._values(np.float64, 2)
+        self.n_cols = self._values(np.uint16)
+        self.n_rows = self._values(np.uint16)
+        self.corner_counts = np.zeros(n, dtype=np.int64)
+        self.has_corners = np.zeros(n, dtype=bool)
+        self.corners = []
+        self.lastLine = self._values(np.uint16, 3)
+
+    def _values(self, dtype, width=None):
+        shape = self.n if width is None else (self.n, width)
+        return np.zeros(shape, dtype=dtype), np.zeros(self.n, dtype=bool)
+
+    def set_points(self, rows, lrp):
+        """copies the per location arrays of a ColumnarLocations"""
+        self.point_counts[rows] = np.diff(lrp.offsets)
+        self.has_points[rows] = True
+        self.points = lrp
+        kind = lrp.location_type
+        is_line = kind == LocationTypeCode.LineLocation
+        is_point = (kind == LocationTypeCode.PointAlongLineLocation) | (
+            kind == LocationTypeCode.PoiWithAccessPointLocation
+        )
+        is_poi = kind == LocationTypeCode.PoiWithAccessPointLocation
+        is_closed = kind == LocationTypeCode.ClosedLineLocation
+        self._set(self.poffs, rows, lrp.poffs, is_line | is_point)
+        self._set(self.noffs, rows, lrp.noffs, is_line)
+        self._set(self.orientation, rows, lrp.orientation, is_point)
+        self._set(self.sideOfRoad, rows, lrp.sideOfRoad, is_point)
+        self._set(
+            self.point, rows, np.stack([lrp.poi_lon, lrp.poi_lat], axis=1), is_poi
+        )
+        last_line = np.stack([lrp.last_frc, lrp.last_fow, lrp.last_bear], axis=1)
+        self._set(self.lastLine, rows, last_line, is_closed)
+
+    @staticmethod
+    def _set(column, rows, values, mask):
+        column[0][rows[mask]] = values[mask]
+        column[1][rows[mask]] = True
+
+    @staticmethod
+    def _set_one(column, row, value):
+        column[0][row] = value
+        column[1][row] = True
+
+    def set_area(self, row, location):
+        """copies the fields of a location without location reference points"""
+        if isinstance(
+            location, (GeoCoordinateLocationReference, CircleLocationReference)
+        ):
+            self._set_one(self.point, row, location.point)
+        if isinstance(location, CircleLocationReference):
+            self._set_one(self.radius, row, location.radius)
+        if isinstance(location, (RectangleLocationReference, GridLocationReference)):
+            self._set_one(self.lowerLeft, row, location.lowerLeft)
+            self._set_one(self.upperRight, row, location.upperRight)
+        if isinstance(location, GridLocationReference):
+            self._set_one(self.n_cols, row, location.n_cols)
+            self._set_one(self.n_rows, row, location.n_rows)
+        if isinstance(location, PolygonLocationReference):
+            self.corner_counts[row] = len(location.corners)
+            self.has_corners[row] = True
+            self.corners.extend(location.corners)
+
+    def table(self, codes):
+        schema = arrow_schema()
+        point_type = schema.field("points").type.value_type
+        coordinates_type = schema.field("point").type
+        point_values = [getattr(self.points, name) for name in _POINT_FIELDS]
+        points = _list_array(
+            self.point_counts,
+            self.has_points,
+            pa.StructArray.from_arrays(point_values, fields=list(point_type)),
+        )
+        corners = np.array(self.corners, dtype=np.float64).reshape(-1, 2)
+        corners = _list_array(
+            self.corner_counts,
+            self.has_corners,
+            pa.StructArray.from_arrays(
+                [corners[:, 0].copy(), corners[:, 1].copy()],
+                fields=list(coordinates_type),
+            ),
+        )
+        last_line_type = schema.field("lastLine").type
+        arrays = [
+            pa.array(codes, pa.uint8()),
+            points,
+            _array(self.poffs),
+            _array(self.noffs),
+            _array(self.orientation),
+            _array(self.sideOfRoad),
+            _struct_array(self.point, coordinates_type),
+            _array(self.radius),
+            _struct_array(self.lowerLeft, coordinates_type),
+            _struct_array(self.upperRight, coordinates_type),
+            _array(self.n_cols),
+            _array(self.n_rows),
+            corners,
+            _struct_array(self.lastLine, last_line_type),
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _array(column):
+    values, valid = column
+    return pa.array(values, mask=~valid)
+
+
+def _struct_array(column, struct_type):
+    values, valid = column
+    children = [
+        pa.array(values[:, i].astype(field.type.to_pandas_dtype()))
+        for i, field in enumerate(struct_type)
+    ]
+    return pa.StructArray.from_arrays(
+        children, fields=list(struct_type), mask=pa.array(~valid)
+    )
+
+
+def _list_array(counts, valid, values):
+    offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    return pa.ListArray.from_arrays(pa.array(offsets), values, mask=pa.array(~valid))
+
+
+def _column(table, name):
+    """column as one Array"""
+    column = table.column(name)
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    return column
+
+
+def _numpy(column, default=0):
+    return column.fill_null(default).to_numpy(zero_copy_only=False)
+
+
+def _columnar(columns, rows):
+    """ColumnarLocations of the location reference point based rows"""
+    indices = pa.array(rows)
+    points = columns["points"].take(indices)
+    values = points.flatten()
+    offsets = points.offsets.to_numpy()
+    per_location = {}
+    for name in ("poffs", "noffs", "orientation", "sideOfRoad"):
+        if name in columns:
+            per_location[name] = _numpy(columns[name].take(indices))
+    point = columns.get("point")
+    if point is not None:
+        point = point.take(indices)
+        per_location["poi_lon"] = _numpy(point.field("lon"))
+        per_location["poi_lat"] = _numpy(point.field("lat"))
+    last_line = columns.get("lastLine")
+    if last_line is not None:
+        last_line = last_line.take(indices)
+        for name in ("frc", "fow", "bear"):
+            per_location["last_" + name] = _numpy(last_line.field(name))
+    return ColumnarLocations(
+        location_type=columns["location_type"].take(indices).to_numpy(),
+        offsets=offsets - offsets[0],
+        poffs=per_location.get("poffs"),
+        noffs=per_location.get("noffs"),
+        orientation=per_location.get("orientation"),
+        sideOfRoad=per_location.get("sideOfRoad"),
+        poi_lon=per_location.get("poi_lon"),
+        poi_lat=per_location.get("poi_lat"),
+        last_frc=per_location.get("last_frc"),
+        last_fow=per_location.get("last_fow"),
+        last_bear=per_location.get("last_bear"),
+        **{name: _numpy(values.field(name)) for name in _POINT_FIELDS}
+    )
+
+
+def _coordinates(columns, name, row):
+    value = columns[name][row].as_py() if name in columns else None
+    if value is None:
+        raise ValueError("Row %s has no %s" % (row, name))
+    return Coordinates(value["lon"], value["lat"])
+
+
+def _area_location(columns, code, row):
+    """location object of a row without location reference points"""
+    if code == LocationTypeCode.GeoCoordinateLocation:
+        return GeoCoordinateLocationReference(_coordinates(columns, "point", row))
+    if code == LocationTypeCode.CircleLocation:
+        return CircleLocationReference(
+            _coordinates(columns, "point", row), columns["radius"][row].as_py()
+        )
+    if code == LocationTypeCode.RectangleLocation:
+        return RectangleLocationReference(
+            _coordinates(columns, "lowerLeft", row),
+            _coordinates(columns, "upperRight", row),
+        )
+    if code == LocationTypeCode.GridLocation:
+        return GridLocationReference(
+            _coordinates(columns, "lowerLeft", row),
+            _coordinates(columns, "upperRight", row),
+            columns["n_cols"][row].as_py(),
+            columns["n_rows"][row].as_py(),
+        )
+    if code == LocationTypeCode.PolygonLocation:
+        corners = columns["corners"][row].as_py()
+        return PolygonLocationReference(
+            [Coordinates(c["lon"], c["lat"]) for c in corners]
+        )
+    raise ValueError("Row %s has the unknown location type code %s" % (row, code))
@@ -0,0 +1,321 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Benchmark suite of the binary and XML encoders and decoders.
+
+Every location type is measured at realistic sizes and the results are
+emitted as JSON, so runs of different versions or machines can be compared::
+
+  python -m openlr bench --output before.json
+  python -m openlr bench --compare before.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import NamedTuple
+
+from openlr._version import __version__
+from openlr.binary_format import binary_decode, binary_encode
+from openlr.testing import GeneratorConfig, generate_locations
+from openlr.xml_format import xml_decode_string, xml_encode_to_string
+
+FORMATS = ("binary", "xml")
+OPERATIONS = ("encode", "decode")
+PERCENTILES = (50, 90, 99)
+# sizes per location type: location reference points or polygon corners
+LINE_SIZES = (2, 5, 10, 20)
+CLOSED_LINE_SIZES = (2, 5, 10, 20)
+POLYGON_SIZES = (3, 10, 30, 100)
+# (location type, size name, GeneratorConfig field of the size, sizes)
+_CASE_TYPES = (
+    ("LineLocationReference", "lrps", "lrps", LINE_SIZES),
+    ("GeoCoordinateLocationReference", "", None, (0,)),
+    ("PointAlongLineLocationReference", "", None, (0,)),
+    ("PoiWithAccessPointLocationReference", "", None, (0,)),
+    ("CircleLocationReference", "", None, (0,)),
+    ("RectangleLocationReference", "", None, (0,)),
+    ("GridLocationReference", "", None, (0,)),
+    ("PolygonLocationReference", "corners", "polygon_corners", POLYGON_SIZES),
+    ("ClosedLineLocationReference", "lrps", "closed_line_lrps", CLOSED_LINE_SIZES),
+)
+
+
+class BenchmarkCase(NamedTuple):
+    """Locations of one type and size measured by the suite"""
+
+    location_type: str
+    size_name: str
+    size: int
+    locations: list
+
+    @property
+    def name(self):
+        if self.size_name:
+            return "%s/%s=%d" % (self.location_type, self.size_name, self.size)
+        return self.location_type
+
+
+def build_cases(n=200, seed=0):
+    """Builds the cases of all location types and sizes
+
+    The locations are generated by :func:`openlr.testing.generate_locations`
+    with the default distributions, restricted to the type and size of the
+    case.
+
+    Parameters
+    -------
+    n : int
+        Number of locations per case
+    seed : int
+        Seed of the generation, equal seeds give equal cases
+
+    Returns
+    -------
+    cases : list of BenchmarkCase
+        One case per location type and size
+    """
+    cases = []
+    for location_type, size_name, size_field, sizes in _CASE_TYPES:
+        for size in sizes:
+            config = GeneratorConfig(type_weights={location_type: 1})
+            if size_field is not None:
+                config = config._replace(**{size_field: (size, size)})
+            locations = list(generate_locations(n, seed, config))
+            cases.append(BenchmarkCase(location_type, size_name, size, locations))
+    return cases
+
+
+def run(
+    cases,
+    formats=FORMATS,
+    operations=OPERATIONS,
+    repeat=5,
+    allocations=True,
+    pattern=None,
+):
+    """Measures the encoders and decoders on the cases
+
+    Parameters
+    -------
+    cases : list of BenchmarkCase
+        Cases from `build_cases`
+    formats : tuple of str
+        "binary" and/or "xml"
+    operations : tuple of str
+        "encode" and/or "decode"
+    repeat : int
+        Number of timed passes over the locations of a case
+    allocations : bool
+        Measures the peak of the memory allocated per operation with
+        `tracemalloc`, in a separate untimed pass
+    pattern : str
+        Only runs the benchmarks with this substring in their name
+
+    Returns
+    -------
+    results : list of dict
+        One result per format, operation and case, see `main` for the fields
+    """
+    results = []
+    for format in formats:
+        encode, decode = _CODECS[format]
+        for case in cases:
+            encoded = [encode(location) for location in case.locations]
+            for operation in operations:
+                name = "%s/%s/%s" % (format, operation, case.name)
+                if pattern and pattern not in name:
+                    continue
+                if operation == "encode":
+                    func, args = encode, case.locations
+                else:
+                    func, args = decode, encoded
+                result = _measure(name, func, args, repeat, allocations)
+                result.update(
+                    format=format,
+                    operation=operation,
+                    location_type=case.location_type,
+                    size=case.size or None,
+                )
+                results.append(result)
+    return results
+
+
+def compare(baseline, results):
+    """Returns the ratio of the throughput to the baseline per benchmark
+
+    Parameters
+    -------
+    baseline : dict or list of dict
+        Report of a previous run, or its results
+    results : dict or list of dict
+        Report of the current run, or its results
+
+    Returns
+    -------
+    ratios : dict
+        Benchmark name to current / baseline operations per second, for the
+        benchmarks in both
+    """
+    if isinstance(baseline, dict):
+        baseline = baseline["results"]
+    if isinstance(results, dict):
+        results = results["results"]
+    before = {r["name"]: r["ops_per_sec"] for r in baseline}
+    return {
+        r["name"]: r["ops_per_sec"] / before[r["name"]]
+        for r in results
+        if before.get(r["name"])
+    }
+
+
+def main(argv=None):
+    """Runs the suite and writes the JSON report
+
+    The report holds the environment and one result per benchmark with
+    `name`, `format`, `operation`, `location_type`, `size`, `n` (timed
+    operations), `ops_per_sec`, `latency_us` (percentiles per operation and
+    the mean) and `alloc_peak_bytes` (mean peak of the allocated memory per
+    operation, None without allocation tracking).
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m openlr bench",
+        description="Benchmark the OpenLR encoders and decoders",
+    )
+    parser.add_argument("--output", "-o", help="JSON report file, stdout if omitted")
+    parser.add_argument(
+        "--number", "-n", type=int, default=200, help="locations per case"
+    )
+    parser.add_argument(
+        "--repeat", "-r", type=int, default=5, help="timed passes per case"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the locations")
+    parser.add_argument(
+        "--format", choices=FORMATS, action="append", help="format to measure"
+    )
+    parser.add_argument(
+        "--operation", choices=OPERATIONS, action="append", help="operation to measure"
+    )
+    parser.add_argument("--filter", "-k", help="substring of the benchmark names")
+    parser.add_argument(
+        "--no-allocations",
+        dest="allocations",
+        action="store_false",
+        help="skip the tracemalloc pass",
+    )
+    parser.add_argument("--compare", help="JSON report of a previous run")
+    args = parser.parse_args(argv)
+
+    results = run(
+        build_cases(args.number, args.seed),
+        tuple(args.format or FORMATS),
+        tuple(args.operation or OPERATIONS),
+        args.repeat,
+        args.allocations,
+        args.filter,
+    )
+    report = {
+        "openlr_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    for r in results:
+        print(
+            "%-60s %10.0f ops/s  p50 %8.1f us  p99 %8.1f us"
+            % (
+                r["name"],
+                r["ops_per_sec"],
+                r["latency_us"]["p50"],
+                r["latency_us"]["p99"],
+            ),
+            file=sys.stderr,
+        )
+    if args.compare:
+        with open(args.compare) as f:
+            ratios = compare(json.load(f), report)
+        for name, ratio in ratios.items():
+            print("%-60s %6.2fx" % (name, ratio), file=sys.stderr)
+    return 0
+
+
+def _measure(name, func, args, repeat, allocations):
+    latencies = []
+    clock = time.perf_counter_ns
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for arg in args:
+                start = clock()
+                func(arg)
+                latencies.append(clock() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    latencies.sort()
+    total = sum(latencies)
+    latency_us = {
+        "p%d" % p: latencies[min(len(latencies) - 1, len(latencies) * p // 100)] / 1e3
+        for p in PERCENTILES
+    }
+    latency_us["mean"] = total / len(latencies) / 1e3
+    return {
+        "name": name,
+        "n": len(latencies),
+        "ops_per_sec": len(latencies) / (total / 1e9) if total else float("inf"),
+        "latency_us": latency_us,
+        "alloc_peak_bytes": _allocations(func, args) if allocations else None,
+    }
+
+
+def _allocations(func, args):
+    """mean peak of the memory allocated by one call"""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        peaks = 0
+        for arg in args:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            func(arg)
+            peaks += tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return peaks / len(args)
+
+
+def _xml_encode(location):
+    return xml_encode_to_string(location, is_pretty=False)
+
+
+_CODECS = {
+    "binary": (binary_encode, binary_decode),
+    "xml": (_xml_encode, xml_decode_string),
+}
@@ -12,10 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import base64
-from enum import Enum
-
-
-from openlr.openlr_bytes_io import OpenLRBytesIO
+import binascii
+import struct
+from enum import Enum, IntEnum
+from typing import NamedTuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from openlr.openlr_bytes_io import (
+    OpenLRBytesIO,
+    int_to_deg,
+    OFFSET_VALUES,
+    DNP_VALUES,
+    BEAR_VALUES,
+    DECA_MICRO_DEG_FACTOR,
+    DISTANCE_PER_INTERVAL,
+    BEAR_SECTOR,
+)
 from openlr.locations import (
     FRC,
     FOW,
@@ -53,6 +69,85 @@ class LocationTypes(Enum):
     ClosedLineLocation = 11
 
 
+class LocationTypeCode(IntEnum):
+    """Compact integer codes of the location types, where the location types
+    sharing the same flags in the status byte are told apart by data size.
+    """
+
+    LineLocation = 0
+    GeoCoordinateLocation = 1
+    PointAlongLineLocation = 2
+    PoiWithAccessPointLocation = 3
+    CircleLocation = 4
+    RectangleLocation = 5
+    GridLocation = 6
+    PolygonLocation = 7
+    ClosedLineLocation = 8
+
+
+ColumnarLocations = NamedTuple(
+    "ColumnarLocations",
+    [
+        # per location
+        ("location_type", "np.ndarray"),
+        ("offsets", "np.ndarray"),
+        ("poffs", "np.ndarray"),
+        ("noffs", "np.ndarray"),
+        ("orientation", "np.ndarray"),
+        ("sideOfRoad", "np.ndarray"),
+        ("poi_lon", "np.ndarray"),
+        ("poi_lat", "np.ndarray"),
+        ("last_frc", "np.ndarray"),
+        ("last_fow", "np.ndarray"),
+        ("last_bear", "np.ndarray"),
+        # per location reference point
+        ("lon", "np.ndarray"),
+        ("lat", "np.ndarray"),
+        ("frc", "np.ndarray"),
+        ("fow", "np.ndarray"),
+        ("bear", "np.ndarray"),
+        ("lfrcnp", "np.ndarray"),
+        ("dnp", "np.ndarray"),
+    ],
+)
+"""Struct of NumPy arrays holding a batch of location reference point based
+locations (line, point along line, POI with access point and closed line).
+
+The location reference points of the i-th location are the rows
+``offsets[i]:offsets[i + 1]`` of the point arrays `lon`, `lat`, `frc`, `fow`,
+`bear`, `lfrcnp` and `dnp`. The remaining arrays hold one value per location:
+`location_type` is a `LocationTypeCode`, `poi_lon` and `poi_lat` are NaN
+for everything except POIs and `last_frc`, `last_fow` and `last_bear` hold
+the last line attributes of closed lines."""
+
+DecodeError = NamedTuple(
+    "DecodeError",
+    [("index", int), ("data", Union[str, bytes]), ("error", Exception)],
+)
+"""Error record returned in place of a location by the bulk decoders when
+the "record" error policy is selected.
+
+`index` is the position of the failed item in the input, `data` is the
+item itself and `error` is the exception raised while decoding it."""
+
+FilterCounts = NamedTuple(
+    "FilterCounts",
+    [
+        ("matched", int),
+        ("rejected_type", int),
+        ("rejected_bbox", int),
+        ("errors", int),
+    ],
+)
+"""Numbers of references decoded, rejected by location type, rejected by
+bounding box and failed to decode by :func:`binary_decode_filtered`."""
+
+DECODE_ERROR_POLICIES = ("raise", "skip", "record")
+
+# exceptions raised on malformed input by the decoding functions
+_DECODE_EXCEPTIONS = (ValueError, NotImplementedError, IndexError)
+
+
 def binary_decode(data, is_base64=True):
     """Decodes binary data into Location
 
@@ -71,9 +166,260 @@ def binary_decode(data, is_base64=True):
     if is_base64:
         data = base64.b64decode(data)
 
-    data_bytes_size = len(data)
-    data_bytes = OpenLRBytesIO(data)
+    return _decode_planned(data, 0, len(data))
+
+
+def binary_decode_many(data, is_base64=True, errors="raise"):
+    """Decodes many binary location references in one pass
+
+    The items are decoded in order without the per call overhead of
+    :func:`binary_decode`.
+
+    Parameters
+    -------
+    data : iterable of str, bytearray, bytes
+        Bytes-like objects that contain the binary data
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+    errors : str
+        Policy for items that cannot be decoded: "raise" propagates the
+        exception, "skip" leaves the item out of the result and "record"
+        puts a `DecodeError` in its place
+
+    Returns
+    -------
+    locations : list
+        Location objects (and `DecodeError` records) in input order
+    """
+    if errors not in DECODE_ERROR_POLICIES:
+        raise ValueError(
+            "errors requires one of %s but %r is given"
+            % (", ".join(DECODE_ERROR_POLICIES), errors)
+        )
+    locations = []
+    append = locations.append
+    a2b_base64 = binascii.a2b_base64
+    for index, item in enumerate(data):
+        try:
+            raw = a2b_base64(item) if is_base64 else item
+            append(_decode_planned(raw, 0, len(raw)))
+        except _DECODE_EXCEPTIONS as error:
+            if errors == "raise":
+                raise
+            if errors == "record":
+                append(DecodeError(index, item, error))
+    return locations
+
+
+def binary_decode_from(buffer, offset=0, length=None):
+    """Decodes the binary data of a location in place from a larger buffer
+
+    The data is parsed directly from the buffer without intermediate copies.
+    The view of the buffer is released before returning, so an `mmap` can be
+    closed right after the call.
+
+    Parameters
+    -------
+    buffer : bytes, bytearray, memoryview, mmap.mmap
+        Any object supporting the buffer protocol
+    offset : int
+        Position of the first byte of the location in the buffer
+    length : int
+        Byte size of the location, by default up to the end of the buffer
+
+    Returns
+    -------
+    location : NamedTuple
+        Location object
+    """
+    with memoryview(buffer) as base, base.cast("B") as view:
+        if length is None:
+            length = len(view) - offset
+        if offset < 0 or length < 0 or offset + length > len(view):
+            raise ValueError(
+                "Location of %s bytes at offset %s exceeds the buffer of %s bytes"
+                % (length, offset, len(view))
+            )
+        return _decode_planned(view, offset, length)
+
+
+def binary_decode_framed(buffer, length_format=">H", errors="raise"):
+    """Iterates over the locations in a buffer of length-prefixed binary data
+
+    Each location is preceded by its byte size packed with `length_format`
+    and is decoded in place like :func:`binary_decode_from`. The generator
+    holds a view of the buffer until it is exhausted or closed: after a
+    partial iteration, call its `close()` (or use `contextlib.closing`)
+    before closing an `mmap`, which raises `BufferError` otherwise.
+
+    Parameters
+    -------
+    buffer : bytes, bytearray, memoryview, mmap.mmap
+        Any object supporting the buffer protocol
+    length_format : str
+        `struct` format of the length prefix, 2 bytes big endian by default
+    errors : str
+        Policy for records that cannot be decoded: "raise", "skip" or "record",
+        see :func:`binary_decode_many`
+
+    Yields
+    -------
+    location : NamedTuple
+        Location object (or `DecodeError` record)
+    """
+    if errors not in DECODE_ERROR_POLICIES:
+        raise ValueError(
+            "errors requires one of %s but %r is given"
+            % (", ".join(DECODE_ERROR_POLICIES), errors)
+        )
+    prefix = struct.Struct(length_format)
+    with memoryview(buffer) as base, base.cast("B") as view:
+        end = len(view)
+        offset = 0
+        index = 0
+        while offset < end:
+            if offset + prefix.size > end:
+                raise ValueError("Truncated length prefix at offset %s" % offset)
+            (length,) = prefix.unpack_from(view, offset)
+            offset += prefix.size
+            if offset + length > end:
+                raise ValueError(
+                    "Truncated record of %s bytes at offset %s" % (length, offset)
+                )
+            try:
+                location = _decode_planned(view, offset, length)
+            except _DECODE_EXCEPTIONS as error:
+                if errors == "raise":
+                    raise
+                location = None
+                if errors == "record":
+                    data = bytes(view[offset : offset + length])
+                    location = DecodeError(index, data, error)
+            if location is not None:
+                yield location
+            offset += length
+            index += 1
+
+
+def binary_decode_filtered(data, types=None, bbox=None, is_base64=True, errors="raise"):
+    """Decodes the binary location references matching a type and region
+
+    References are rejected after reading only the status byte and the first
+    absolute coordinates, so rejected references cost a fraction of a full
+    decode. The region test uses the first coordinates only: the first
+    location reference point, the center or the lower left corner.
+
+    Parameters
+    -------
+    data : iterable of str, bytearray, bytes
+        Bytes-like objects that contain the binary data
+    types : iterable of LocationTypes, LocationTypeCode
+        Allowed location types, None for all. A `LocationTypes` member allows
+        all location types sharing its status byte flags, e.g. point along
+        line and POI with access point; a `LocationTypeCode` member allows
+        only the single location type.
+    bbox : tuple of float
+        Bounding box (min_lon, min_lat, max_lon, max_lat) containing the first
+        coordinates of the matching references, None for no region filter
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+    errors : str
+        Policy for matching references that cannot be decoded, see
+        :func:`binary_decode_many`
+
+    Returns
+    -------
+    locations : list
+        Matching location objects (and `DecodeError` records) in input order
+    counts : FilterCounts
+        Numbers of matched, rejected and failed references
+    """
+    if errors not in DECODE_ERROR_POLICIES:
+        raise ValueError(
+            "errors requires one of %s but %r is given"
+            % (", ".join(DECODE_ERROR_POLICIES), errors)
+        )
+    allowed = None if types is None else _allowed_type_codes(types)
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        if min_lon > max_lon or min_lat > max_lat:
+            raise ValueError("Invalid bounding box: %s" % (bbox,))
+    locations = []
+    append = locations.append
+    a2b_base64 = binascii.a2b_base64
+    unpack_first = _FIRST_COORDINATES.unpack_from
+    rejected_type = rejected_bbox = n_errors = 0
+    for index, item in enumerate(data):
+        try:
+            raw = a2b_base64(item) if is_base64 else item
+            size = len(raw)
+            key = (raw[0], size)
+            code = _HEADER_TYPE_CODES.get(key)
+            if code is None:
+                code = _header_type_code(*key)
+            if allowed is not None and code not in allowed:
+                rejected_type += 1
+                continue
+            if bbox is not None:
+                if size < 7:
+                    raise ValueError("Location data of %s bytes is too short" % size)
+                lon_hi, lon_lo, lat_hi, lat_lo = unpack_first(raw, 1)
+                lon = int_to_deg(lon_hi * 65536 + lon_lo)
+                lat = int_to_deg(lat_hi * 65536 + lat_lo)
+                if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+                    rejected_bbox += 1
+                    continue
+            append(_decode_planned(raw, 0, size))
+        except _DECODE_EXCEPTIONS as error:
+            if errors == "raise":
+                raise
+            n_errors += 1
+            if errors == "record":
+                append(DecodeError(index, item, error))
+    counts = FilterCounts(
+        len(locations) - (n_errors if errors == "record" else 0),
+        rejected_type,
+        rejected_bbox,
+        n_errors,
+    )
+    return locations, counts
+
+
+def _allowed_type_codes(types):
+    """set of LocationTypeCode values allowed by LocationTypes/LocationTypeCode"""
+    allowed = set()
+    for location_type in types:
+        if isinstance(location_type, LocationTypes):
+            allowed.update(
+                code
+                for code in LocationTypeCode
+                if _LOCATION_TYPE_FLAGS[code] == location_type.value
+            )
+        elif isinstance(location_type, LocationTypeCode):
+            allowed.add(location_type)
+        else:
+            raise ValueError(
+                "types requires LocationTypes or LocationTypeCode members but "
+                "%r is given" % (location_type,)
+            )
+    return frozenset(allowed)
+
+
+def _header_type_code(status, size):
+    """identifies the location type of the status byte and size, caching it"""
+    version = status & 7
+    if version != 3:
+        raise NotImplementedError(
+            "Only version 3 is supported, detected version %s" % version
+        )
+    code = _location_type_code((status >> 3) & 0b1111, size)
+    if len(_HEADER_TYPE_CODES) < _MAX_DECODE_PLANS:
+        _HEADER_TYPE_CODES[(status, size)] = code
+    return code
 
+
+def _decode(data_bytes, data_bytes_size):
+    """decodes a location with the OpenLRBytesIO reader, the reference path"""
     version, location_type = data_bytes.read_status()
     if version != 3:
         raise NotImplementedError(
@@ -104,6 +450,522 @@ def binary_decode(data, is_base64=True):
         raise ValueError("Location type cannot be identified.")
 
 
+def _decode_planned(buffer, offset, size):
+    """decodes the location at buffer[offset:offset + size] with a cached plan"""
+    key = (buffer[offset], size)
+    plan = _DECODE_PLANS.get(key)
+    if plan is None:
+        plan = _build_decode_plan(*key)
+        if len(_DECODE_PLANS) < _MAX_DECODE_PLANS:
+            _DECODE_PLANS[key] = plan
+    return plan(buffer, offset)
+
+
+def _location_type_code(location_type, size):
+    """identifies the location type by the status byte flags and data size"""
+    if location_type == LocationTypes.LineLocation.value:
+        return LocationTypeCode.LineLocation
+    elif location_type == LocationTypes.GeoCoordinateLocation.value:
+        return LocationTypeCode.GeoCoordinateLocation
+    elif location_type == LocationTypes.PointAlongLineLocation.value:
+        if size > 17:
+            return LocationTypeCode.PoiWithAccessPointLocation
+        return LocationTypeCode.PointAlongLineLocation
+    elif location_type == LocationTypes.CircleLocation.value:
+        return LocationTypeCode.CircleLocation
+    elif location_type == LocationTypes.RectangleLocation.value:
+        if size > 13:
+            return LocationTypeCode.GridLocation
+        return LocationTypeCode.RectangleLocation
+    elif location_type == LocationTypes.PolygonLocation.value:
+        return LocationTypeCode.PolygonLocation
+    elif location_type == LocationTypes.ClosedLineLocation.value:
+        return LocationTypeCode.ClosedLineLocation
+    raise ValueError("Location type cannot be identified.")
+
+
+def _build_decode_plan(status, size):
+    """builds a function decoding locations with the given status byte and size
+
+    The layout of a location is fully determined by its type and size, so all
+    fixed-width fields are unpacked with a single precompiled `struct.Struct`.
+    Data not matching a regular layout falls back to the `OpenLRBytesIO` reader.
+    """
+    version = status & 7
+    if version != 3:
+        raise NotImplementedError(
+            "Only version 3 is supported, detected version %s" % version
+        )
+    code = _location_type_code((status >> 3) & 0b1111, size)
+
+    def read_reference(buffer, offset):
+        data = bytes(buffer[offset : offset + size])
+        return _decode(OpenLRBytesIO(data), size)
+
+    layout = _DECODE_LAYOUTS[code](size)
+    if layout is None:
+        return read_reference
+
+    fmt, build = layout
+    unpack_from = struct.Struct(">B" + fmt).unpack_from
+
+    def plan(buffer, offset):
+        location = build(unpack_from(buffer, offset))
+        if location is None:  # irregular data, only known after unpacking
+            return read_reference(buffer, offset)
+        return location
+
+    return plan
+
+
+def _lrp(lon, lat, first_b, second_b, dnp):
+    return LocationReferencePoint(
+        lon,
+        lat,
+        _FRC_VALUES[(first_b >> 3) & 0b111],
+        _FOW_VALUES[first_b & 0b111],
+        BEAR_VALUES[second_b & 0b11111],
+        _FRC_VALUES[(second_b >> 5) & 0b111],
+        dnp,
+    )
+
+
+def _last_lrp(lon, lat, first_b, second_b):
+    return LocationReferencePoint(
+        lon,
+        lat,
+        _FRC_VALUES[(first_b >> 3) & 0b111],
+        _FOW_VALUES[first_b & 0b111],
+        BEAR_VALUES[second_b & 0b11111],
+        FRC.FRC7,
+        0,
+    )
+
+
+def _read_offsets(offset_flags, buckets, read_noffs=True):
+    """offset rates from the trailing bytes following the offset flags"""
+    poffs = noffs = 0
+    buckets = iter(buckets)
+    try:
+        if offset_flags & 0b10:
+            poffs = OFFSET_VALUES[next(buckets)]
+        if read_noffs and offset_flags & 0b01:
+            noffs = OFFSET_VALUES[next(buckets)]
+    except StopIteration:
+        raise ValueError("Offset flags are set but the offset data is missing")
+    return poffs, noffs
+
+
+def _line_layout(size):
+    if size < 9:
+        return None
+    n_relative = (size - 9) // 7
+    n_trailing = size - 9 - 7 * n_relative
+
+    def build(v):
+        lon = int_to_deg(v[1] * 65536 + v[2])
+        lat = int_to_deg(v[3] * 65536 + v[4])
+        first_b, second_b = v[5], v[6]
+        points = []
+        i = 7
+        for _ in range(n_relative):
+            points.append(_lrp(lon, lat, first_b, second_b, DNP_VALUES[v[i]]))
+            lon = lon + v[i + 1] / DECA_MICRO_DEG_FACTOR
+            lat = lat + v[i + 2] / DECA_MICRO_DEG_FACTOR
+            first_b, second_b = v[i + 3], v[i + 4]
+            i += 5
+        points.append(_last_lrp(lon, lat, first_b, second_b))
+        poffs, noffs = _read_offsets(second_b >> 5, v[i:])
+        return LineLocationReference(points, poffs, noffs)
+
+    return "bHbHBB" + "BhhBB" * n_relative + "B" * n_trailing, build
+
+
+def _geo_coordinate_layout(size):
+    if size < 7:
+        return None
+
+    def build(v):
+        point = Coordinates(
+            int_to_deg(v[1] * 65536 + v[2]), int_to_deg(v[3] * 65536 + v[4])
+        )
+        return GeoCoordinateLocationReference(point)
+
+    return "bHbH", build
+
+
+def _point_along_line_points(v):
+    lon = int_to_deg(v[1] * 65536 + v[2])
+    lat = int_to_deg(v[3] * 65536 + v[4])
+    first = _lrp(lon, lat, v[5], v[6], DNP_VALUES[v[7]])
+    lon = lon + v[8] / DECA_MICRO_DEG_FACTOR
+    lat = lat + v[9] / DECA_MICRO_DEG_FACTOR
+    return [first, _last_lrp(lon, lat, v[10], v[11])]
+
+
+def _point_along_line_layout(size):
+    if size < 16:
+        return None
+
+    def build(v):
+        points = _point_along_line_points(v)
+        poffs, _ = _read_offsets(v[11] >> 5, v[12:], read_noffs=False)
+        return PointAlongLineLocationReference(
+            points,
+            poffs,
+            _ORIENTATION_VALUES[v[5] >> 6],
+            _SIDE_OF_ROAD_VALUES[v[10] >> 6],
+        )
+
+    return "bHbHBBBhhBB" + "B" * (size - 16), build
+
+
+def _poi_layout(size):
+    n_trailing = size - 16
+
+    def build(v):
+        points = _point_along_line_points(v)
+        offset_flags = v[11] >> 5
+        poffs, _ = _read_offsets(offset_flags, v[12:], read_noffs=False)
+        i = 12 + (1 if offset_flags & 0b10 else 0)
+        if i + 4 > len(v):
+            return None
+        rel_lon = (v[i] << 8 | v[i + 1]) - ((v[i] >> 7) << 16)
+        rel_lat = (v[i + 2] << 8 | v[i + 3]) - ((v[i + 2] >> 7) << 16)
+        lon = points[0].lon + rel_lon / DECA_MICRO_DEG_FACTOR
+        lat = points[0].lat + rel_lat / DECA_MICRO_DEG_FACTOR
+        return PoiWithAccessPointLocationReference(
+            points,
+            poffs,
+            lon,
+            lat,
+            _ORIENTATION_VALUES[v[5] >> 6],
+            _SIDE_OF_ROAD_VALUES[v[10] >> 6],
+        )
+
+    return "bHbHBBBhhBB" + "B" * n_trailing, build
+
+
+def _circle_layout(size):
+    if size < 8:
+        return None
+
+    def build(v):
+        point = Coordinates(
+            int_to_deg(v[1] * 65536 + v[2]), int_to_deg(v[3] * 65536 + v[4])
+        )
+        radius = 0
+        for b in v[5:]:
+            radius = radius << 8 | b
+        return CircleLocationReference(point, radius)
+
+    return "bHbH" + "B" * (size - 7), build
+
+
+def _rectangle_corners(v, is_absolute):
+    lon = int_to_deg(v[1] * 65536 + v[2])
+    lat = int_to_deg(v[3] * 65536 + v[4])
+    lowerLeft = Coordinates(lon, lat)
+    if is_absolute:
+        upperRight = Coordinates(
+            int_to_deg(v[5] * 65536 + v[6]), int_to_deg(v[7] * 65536 + v[8])
+        )
+    else:
+        upperRight = Coordinates(
+            lon + v[5] / DECA_MICRO_DEG_FACTOR, lat + v[6] / DECA_MICRO_DEG_FACTOR
+        )
+    return lowerLeft, upperRight
+
+
+def _rectangle_layout(size):
+    if size not in (11, 13):
+        return None
+    is_absolute = size > 11
+
+    def build(v):
+        return RectangleLocationReference(*_rectangle_corners(v, is_absolute))
+
+    return "bHbHbHbH" if is_absolute else "bHbHhh", build
+
+
+def _grid_layout(size):
+    if size not in (15, 17):
+        return None
+    is_absolute = size > 15
+
+    def build(v):
+        lowerLeft, upperRight = _rectangle_corners(v, is_absolute)
+        return GridLocationReference(lowerLeft, upperRight, v[-2], v[-1])
+
+    return ("bHbHbHbH" if is_absolute else "bHbHhh") + "HH", build
+
+
+def _polygon_layout(size):
+    if size < 7:
+        return None
+    n_relative = (size - 7) // 4
+
+    def build(v):
+        lon = int_to_deg(v[1] * 65536 + v[2])
+        lat = int_to_deg(v[3] * 65536 + v[4])
+        corners = [Coordinates(lon, lat)]
+        for i in range(5, 5 + 2 * n_relative, 2):
+            lon = lon + v[i] / DECA_MICRO_DEG_FACTOR
+            lat = lat + v[i + 1] / DECA_MICRO_DEG_FACTOR
+            corners.append(Coordinates(lon, lat))
+        return PolygonLocationReference(corners)
+
+    return "bHbH" + "hh" * n_relative, build
+
+
+def _closed_line_layout(size):
+    if size < 12:
+        return None
+    n_relative = (size - 12) // 7
+
+    def build(v):
+        lon = int_to_deg(v[1] * 65536 + v[2])
+        lat = int_to_deg(v[3] * 65536 + v[4])
+        points = [_lrp(lon, lat, v[5], v[6], DNP_VALUES[v[7]])]
+        for i in range(8, 8 + 5 * n_relative, 5):
+            lon = lon + v[i] / DECA_MICRO_DEG_FACTOR
+            lat = lat + v[i + 1] / DECA_MICRO_DEG_FACTOR
+            points.append(_lrp(lon, lat, v[i + 2], v[i + 3], DNP_VALUES[v[i + 4]]))
+        first_b, second_b = v[-2], v[-1]
+        lastLine = LineAttributes(
+            _FRC_VALUES[(first_b >> 3) & 0b111],
+            _FOW_VALUES[first_b & 0b111],
+            BEAR_VALUES[second_b & 0b11111],
+        )
+        return ClosedLineLocationReference(points, lastLine)
+
+    return "bHbHBBB" + "hhBBB" * n_relative + "BB", build
+
+
+def binary_decode_columnar(data, is_base64=True):
+    """Decodes location reference point based locations into NumPy arrays
+
+    The fixed-width fields are unpacked with vectorized operations over the
+    concatenated binary data of all locations sharing the same type and size.
+    Requires NumPy.
+
+    Parameters
+    -------
+    data : iterable of str, bytearray, bytes
+        Bytes-like objects that contain the binary data of line,
+        point along line, POI with access point or closed line locations
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+
+    Returns
+    -------
+    columns : ColumnarLocations
+        Struct of arrays holding the decoded fields
+    """
+    if np is None:
+        raise ImportError("binary_decode_columnar requires numpy")
+    if is_base64:
+        raws = [binascii.a2b_base64(item) for item in data]
+    else:
+        raws = [bytes(item) for item in data]
+    n = len(raws)
+    sizes = np.fromiter(map(len, raws), dtype=np.int64, count=n)
+    if n and sizes.min() == 0:
+        raise ValueError("Empty data at index %s" % np.argmin(sizes))
+    starts = np.zeros(n, dtype=np.int64)
+    np.cumsum(sizes[:-1], out=starts[1:])
+    buffer = np.frombuffer(b"".join(raws), dtype=np.uint8)
+
+    status = buffer[starts]
+    version = status & 7
+    if np.any(version != 3):
+        raise NotImplementedError(
+            "Only version 3 is supported, detected version %s"
+            % version[version != 3][0]
+        )
+    flags = (status >> 3) & 0b1111
+    kind = np.full(n, -1, dtype=np.int8)
+    kind[flags == LocationTypes.LineLocation.value] = LocationTypeCode.LineLocation
+    is_point = flags == LocationTypes.PointAlongLineLocation.value
+    kind[is_point & (sizes <= 17)] = LocationTypeCode.PointAlongLineLocation
+    kind[is_point & (sizes > 17)] = LocationTypeCode.PoiWithAccessPointLocation
+    kind[flags == LocationTypes.ClosedLineLocation.value] = (
+        LocationTypeCode.ClosedLineLocation
+    )
+    if np.any(kind < 0):
+        raise ValueError(
+            "Location at index %s is not a location reference point based "
+            "location" % np.argmax(kind < 0)
+        )
+    min_sizes = np.zeros(len(LocationTypeCode), dtype=np.int64)
+    for code, min_size in _COLUMNAR_MIN_SIZES.items():
+        min_sizes[code] = min_size
+    too_short = sizes < min_sizes[kind]
+    if np.any(too_short):
+        index = np.argmax(too_short)
+        raise ValueError(
+            "Truncated data of %s bytes at index %s for its location type"
+            % (sizes[index], index)
+        )
+
+    n_points = np.full(n, 2, dtype=np.int64)
+    is_line = kind == LocationTypeCode.LineLocation
+    n_points[is_line] = (sizes[is_line] - 9) // 7 + 1
+    is_closed = kind == LocationTypeCode.ClosedLineLocation
+    n_points[is_closed] = (sizes[is_closed] - 12) // 7 + 1
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(n_points, out=offsets[1:])
+    n_total = int(offsets[-1])
+
+    columns = ColumnarLocations(
+        location_type=kind.astype(np.uint8),
+        offsets=offsets,
+        poffs=np.zeros(n, dtype=np.float64),
+        noffs=np.zeros(n, dtype=np.float64),
+        orientation=np.zeros(n, dtype=np.uint8),
+        sideOfRoad=np.zeros(n, dtype=np.uint8),
+        poi_lon=np.full(n, np.nan, dtype=np.float64),
+        poi_lat=np.full(n, np.nan, dtype=np.float64),
+        last_frc=np.zeros(n, dtype=np.uint8),
+        last_fow=np.zeros(n, dtype=np.uint8),
+        last_bear=np.zeros(n, dtype=np.uint16),
+        lon=np.empty(n_total, dtype=np.float64),
+        lat=np.empty(n_total, dtype=np.float64),
+        frc=np.empty(n_total, dtype=np.uint8),
+        fow=np.empty(n_total, dtype=np.uint8),
+        bear=np.empty(n_total, dtype=np.uint16),
+        lfrcnp=np.empty(n_total, dtype=np.uint8),
+        dnp=np.empty(n_total, dtype=np.int32),
+    )
+    tables = (
+        np.array(DNP_VALUES, dtype=np.int32),
+        np.array(BEAR_VALUES, dtype=np.uint16),
+    )
+    group_keys = kind.astype(np.int64) << 32 | sizes
+    for group_key in np.unique(group_keys):
+        rows = np.flatnonzero(group_keys == group_key)
+        size = int(group_key & 0xFFFFFFFF)
+        records = buffer[starts[rows, None] + np.arange(size)]
+        _np_decode_group(columns, tables, int(group_key >> 32), rows, records)
+    return columns
+
+
+# smallest size in bytes by location type code: the first and last points of
+# lines, point along line and POI locations with the 4 bytes of the POI, and
+# the first point and last line attributes of closed lines
+_COLUMNAR_MIN_SIZES = {
+    LocationTypeCode.LineLocation: 16,
+    LocationTypeCode.PointAlongLineLocation: 16,
+    LocationTypeCode.PoiWithAccessPointLocation: 20,
+    LocationTypeCode.ClosedLineLocation: 12,
+}
+
+
+def _np_decode_group(columns, tables, kind, rows, records):
+    """decodes records of the same location type and size into the columns"""
+    size = records.shape[1]
+    first = columns.offsets[rows]
+    lon, lat = _np_read_coords(records, 1)
+    _np_set_point(columns, tables, first, records, 7, lon, lat)
+
+    if kind == LocationTypeCode.ClosedLineLocation:
+        n_relative = (size - 12) // 7
+        columns.dnp[first] = tables[0][records[:, 9]]
+        for i in range(n_relative):
+            col = 10 + 7 * i
+            lon, lat = _np_read_coords_relative(records, col, lon, lat)
+            _np_set_point(columns, tables, first + i + 1, records, col + 4, lon, lat)
+            columns.dnp[first + i + 1] = tables[0][records[:, col + 6]]
+        col = 10 + 7 * n_relative
+        columns.last_fow[rows] = records[:, col] & 0b111
+        columns.last_frc[rows] = (records[:, col] >> 3) & 0b111
+        columns.last_bear[rows] = tables[1][records[:, col + 1] & 0b11111]
+        return
+
+    n_relative = (size - 9) // 7 if kind == LocationTypeCode.LineLocation else 1
+    for i in range(n_relative):
+        col = 9 + 7 * i
+        columns.dnp[first + i] = tables[0][records[:, col]]
+        lon, lat = _np_read_coords_relative(records, col + 1, lon, lat)
+        _np_set_point(columns, tables, first + i + 1, records, col + 5, lon, lat)
+    last = first + n_relative
+    offset_flags = columns.lfrcnp[last]
+    columns.lfrcnp[last] = FRC.FRC7
+    columns.dnp[last] = 0
+
+    col = 9 + 7 * n_relative
+    has_poffs = (offset_flags & 0b10) > 0
+    has_noffs = (offset_flags & 0b01) > 0
+    if kind == LocationTypeCode.LineLocation:
+        n_offsets = has_poffs.astype(np.int64) + has_noffs
+    else:
+        n_offsets = has_poffs.astype(np.int64)
+        has_noffs[:] = False
+    extra = 4 if kind == LocationTypeCode.PoiWithAccessPointLocation else 0
+    too_short = col + n_offsets + extra > size
+    if np.any(too_short):
+        raise ValueError(
+            "Truncated data of %s bytes at index %s for its offsets"
+            % (size, rows[np.argmax(too_short)])
+        )
+    # pad a zero column so that missing offsets can be gathered safely
+    padded = np.pad(records, ((0, 0), (0, 1)))
+    index = np.arange(len(rows))
+    poffs_bucket = padded[index, np.where(has_poffs, col, size)]
+    noffs_bucket = padded[index, np.where(has_noffs, col + has_poffs, size)]
+    columns.poffs[rows] = np.where(has_poffs, (poffs_bucket + 0.5) / 256, 0.0)
+    columns.noffs[rows] = np.where(has_noffs, (noffs_bucket + 0.5) / 256, 0.0)
+
+    if kind != LocationTypeCode.LineLocation:
+        columns.orientation[rows] = records[:, 7] >> 6
+        columns.sideOfRoad[rows] = records[:, 14] >> 6
+    if kind == LocationTypeCode.PoiWithAccessPointLocation:
+        # the relative coordinates of the POI follow the optional offset
+        rel = np.stack([padded[index, col + n_offsets + i] for i in range(4)], axis=1)
+        poi_lon, poi_lat = _np_read_coords_relative(
+            rel, 0, columns.lon[first], columns.lat[first]
+        )
+        columns.poi_lon[rows] = poi_lon
+        columns.poi_lat[rows] = poi_lat
+
+
+def _np_set_point(columns, tables, index, records, col, lon, lat):
+    """sets coordinates and the point attributes at records[:, col:col+2]"""
+    first_b = records[:, col]
+    second_b = records[:, col + 1]
+    columns.lon[index] = lon
+    columns.lat[index] = lat
+    columns.fow[index] = first_b & 0b111
+    columns.frc[index] = (first_b >> 3) & 0b111
+    columns.bear[index] = tables[1][second_b & 0b11111]
+    columns.lfrcnp[index] = (second_b >> 5) & 0b111
+
+
+def _np_read_coords(records, col):
+    """vectorized counterpart of OpenLRBytesIO.read_coords"""
+    result = []
+    for c in (col, col + 3):
+        val = (
+            records[:, c].astype(np.int64) << 16
+            | records[:, c + 1].astype(np.int64) << 8
+            | records[:, c + 2]
+        )
+        val = np.where(val >> 23, val - (1 << 24), val)
+        sign = np.where(val < 0, -1.0, 1.0)
+        result.append(((val - sign * 0.5) * 360) / (1 << 24))
+    return result
+
+
+def _np_read_coords_relative(records, col, prev_lon, prev_lat):
+    """vectorized counterpart of OpenLRBytesIO.read_coords_relative"""
+    result = []
+    for c, prev in ((col, prev_lon), (col + 2, prev_lat)):
+        val = records[:, c].astype(np.int64) << 8 | records[:, c + 1]
+        val = np.where(val >> 15, val - (1 << 16), val)
+        result.append(prev + val / DECA_MICRO_DEG_FACTOR)
+    return result
+
+
 def binary_encode(location, is_base64=True):
     """Encodes Location object into binary data
 
@@ -156,6 +1018,296 @@ def binary_encode(location, is_base64=True):
         return data_bytes.getvalue()
 
 
+def binary_encode_columnar(columns, is_base64=True):
+    """Encodes location reference point based locations from NumPy arrays
+
+    This is the vectorized counterpart of :func:`binary_encode` for the
+    struct of arrays layout returned by :func:`binary_decode_columnar`, the
+    output is byte-identical. The per location arrays other than `offsets`
+    are optional and default to zero (`location_type` defaults to line
+    locations). Lines need at least two points, point along line and POI
+    locations exactly two and closed lines at least one. Requires NumPy.
+
+    Parameters
+    -------
+    columns : ColumnarLocations
+        Struct of arrays holding the fields of the locations
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+
+    Returns
+    -------
+    data : list of str or (bytes, np.ndarray)
+        Base64 strings of the locations, or the concatenated binary data
+        of all locations along with their row offsets into it
+    """
+    if np is None:
+        raise ImportError("binary_encode_columnar requires numpy")
+    offsets = np.asarray(columns.offsets, dtype=np.int64)
+    n = len(offsets) - 1
+    n_points = np.diff(offsets)
+
+    def per_location(name, dtype=np.int64):
+        values = getattr(columns, name, None)
+        if values is None:
+            return np.zeros(n, dtype=dtype)
+        return np.asarray(values, dtype=dtype)
+
+    kind = per_location("location_type")
+    poffs = per_location("poffs", np.float64)
+    noffs = per_location("noffs", np.float64)
+    is_line = kind == LocationTypeCode.LineLocation
+    is_pal = kind == LocationTypeCode.PointAlongLineLocation
+    is_poi = kind == LocationTypeCode.PoiWithAccessPointLocation
+    is_closed = kind == LocationTypeCode.ClosedLineLocation
+    invalid = ~(is_line | is_pal | is_poi | is_closed)
+    invalid |= n_points < np.where(is_closed, 1, 2)
+    invalid |= (is_pal | is_poi) & (n_points != 2)
+    if np.any(invalid):
+        raise ValueError(
+            "Location at index %s is not a valid location reference point based "
+            "location" % np.argmax(invalid)
+        )
+    has_noffs = is_line & (noffs > 0)
+    n_offsets = (poffs > 0).astype(np.int64) + has_noffs
+    sizes = np.where(
+        is_closed, 12 + 7 * (n_points - 1), 2 + 7 * n_points + n_offsets
+    ) + np.where(is_poi, 4, 0)
+    data_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(sizes, out=data_offsets[1:])
+    data = np.zeros(int(data_offsets[-1]), dtype=np.uint8)
+
+    fields = (
+        np.asarray(columns.lon, dtype=np.float64),
+        np.asarray(columns.lat, dtype=np.float64),
+        np.asarray(columns.frc, dtype=np.int64),
+        np.asarray(columns.fow, dtype=np.int64),
+        np.asarray(columns.bear, dtype=np.float64),
+        np.asarray(columns.lfrcnp, dtype=np.int64),
+        np.asarray(columns.dnp, dtype=np.float64),
+    )
+    group_keys = (kind << 48) | (n_points << 8) | ((poffs > 0) << 1) | has_noffs
+    for group_key in np.unique(group_keys):
+        rows = np.flatnonzero(group_keys == group_key)
+        size = int(sizes[rows[0]])
+        records = np.zeros((len(rows), size), dtype=np.uint8)
+        group_kind = int(group_key >> 48)
+        records[:, 0] = 3 + (_LOCATION_TYPE_FLAGS[group_kind] << 3)
+        _np_encode_group(columns, fields, group_kind, rows, records, per_location)
+        data[data_offsets[rows, None] + np.arange(size)] = records
+
+    if not is_base64:
+        return data.tobytes(), data_offsets
+    data = data.tobytes()
+    return [
+        binascii.b2a_base64(data[start:end], newline=False).decode()
+        for start, end in zip(data_offsets[:-1].tolist(), data_offsets[1:].tolist())
+    ]
+
+
+def _np_encode_group(columns, fields, kind, rows, records, per_location):
+    """encodes locations of the same layout into the records array"""
+    lon, lat, frc, fow, bear, lfrcnp, dnp = fields
+    first = np.asarray(columns.offsets, dtype=np.int64)[rows]
+    n_points = int(np.asarray(columns.offsets)[rows[0] + 1] - first[0])
+    reserved = np.zeros(len(rows), dtype=np.int64)
+    if kind in (
+        LocationTypeCode.PointAlongLineLocation,
+        LocationTypeCode.PoiWithAccessPointLocation,
+    ):
+        reserved = per_location("orientation")[rows]
+    _np_write_coords(records, 1, lon[first], lat[first], rows)
+
+    if kind == LocationTypeCode.ClosedLineLocation:
+        for i in range(n_points):
+            index = first + i
+            col = 1 if i == 0 else 3 + 7 * i
+            if i > 0:
+                _np_write_coords_relative(
+                    records,
+                    col,
+                    lon[index],
+                    lat[index],
+                    lon[index - 1],
+                    lat[index - 1],
+                    rows,
+                )
+            col = 7 + 7 * i
+            _np_write_attributes(
+                records,
+                col,
+                fow[index],
+                frc[index],
+                bear[index],
+                lfrcnp[index],
+                0,
+                rows,
+            )
+            _np_write_dnp(records, col + 2, dnp[index], rows)
+        _np_write_attributes(
+            records,
+            7 * n_points + 3,
+            per_location("last_fow")[rows],
+            per_location("last_frc")[rows],
+            per_location("last_bear", np.float64)[rows],
+            0,
+            0,
+            rows,
+        )
+        return
+
+    for i in range(n_points - 1):
+        index = first + i
+        _np_write_attributes(
+            records,
+            7 + 7 * i,
+            fow[index],
+            frc[index],
+            bear[index],
+            lfrcnp[index],
+            reserved if i == 0 else 0,
+            rows,
+        )
+        _np_write_dnp(records, 9 + 7 * i, dnp[index], rows)
+        _np_write_coords_relative(
+            records,
+            10 + 7 * i,
+            lon[index + 1],
+            lat[index + 1],
+            lon[index],
+            lat[index],
+            rows,
+        )
+
+    poffs = per_location("poffs", np.float64)[rows]
+    noffs = per_location("noffs", np.float64)[rows]
+    has_poffs = poffs[0] > 0
+    has_noffs = kind == LocationTypeCode.LineLocation and noffs[0] > 0
+    if kind != LocationTypeCode.LineLocation:
+        reserved = per_location("sideOfRoad")[rows]
+    index = first + n_points - 1
+    offset_flags = (has_poffs << 1) + has_noffs
+    _np_write_attributes(
+        records,
+        7 * n_points,
+        fow[index],
+        frc[index],
+        bear[index],
+        offset_flags,
+        reserved,
+        rows,
+    )
+    col = 7 * n_points + 2
+    if has_poffs:
+        records[:, col] = _np_offset_bucket(poffs, rows)
+        col += 1
+    if has_noffs:
+        records[:, col] = _np_offset_bucket(noffs, rows)
+        col += 1
+    if kind == LocationTypeCode.PoiWithAccessPointLocation:
+        _np_write_coords_relative(
+            records,
+            col,
+            per_location("poi_lon", np.float64)[rows],
+            per_location("poi_lat", np.float64)[rows],
+            lon[first],
+            lat[first],
+            rows,
+        )
+
+
+def _np_j_round(values, rows):
+    """vectorized java like rounding (half away from zero) into int64"""
+    if not np.all(np.isfinite(values)):
+        raise ValueError(
+            "Non-finite value at location %s" % rows[np.argmin(np.isfinite(values))]
+        )
+    truncated = np.trunc(values)
+    half = np.abs(values - truncated) >= 0.5
+    return (truncated + np.where(half, np.sign(values), 0)).astype(np.int64)
+
+
+def _np_check_range(values, low, high, rows, what):
+    invalid = (values < low) | (values > high)
+    if np.any(invalid):
+        index = np.argmax(invalid)
+        raise ValueError(
+            "%s requires %s <= x <= %s but %s is given at location %s"
+            % (what, low, high, values[index], rows[index])
+        )
+
+
+def _np_write_bytes(records, col, values, size):
+    for i in range(size):
+        records[:, col + i] = (values >> (8 * (size - 1 - i))) & 0xFF
+
+
+def _np_write_coords(records, col, lon, lat, rows):
+    """vectorized counterpart of OpenLRBytesIO.write_coords"""
+    for c, deg in ((col, lon), (col + 3, lat)):
+        val = _np_j_round(np.copysign(1.0, deg) * 0.5 + (deg * (1 << 24)) / 360.0, rows)
+        _np_check_range(val, -(1 << 23), (1 << 23) - 1, rows, "coordinate integer")
+        _np_write_bytes(records, c, val, 3)
+
+
+def _np_write_coords_relative(records, col, lon, lat, prev_lon, prev_lat, rows):
+    """vectorized counterpart of OpenLRBytesIO.write_coords_relative"""
+    for c, deg, prev in ((col, lon, prev_lon), (col + 2, lat, prev_lat)):
+        val = _np_j_round(DECA_MICRO_DEG_FACTOR * (deg - prev), rows)
+        _np_check_range(val, -(1 << 15), (1 << 15) - 1, rows, "relative coordinate")
+        _np_write_bytes(records, c, val, 2)
+
+
+def _np_write_attributes(records, col, fow, frc, bear, lfrcnp, reserved, rows):
+    """vectorized counterpart of OpenLRBytesIO.write_point_attributes"""
+    _np_check_range(bear, 0, np.nextafter(360, 0), rows, "Bearing angle")
+    bear = _np_j_round((bear - BEAR_SECTOR / 2) / BEAR_SECTOR, rows) & 0b11111
+    records[:, col] = (fow & 0b111) + ((frc & 0b111) << 3) + ((reserved & 0b11) << 6)
+    records[:, col + 1] = bear + ((lfrcnp & 0b111) << 5)
+
+
+def _np_write_dnp(records, col, dnp, rows):
+    """vectorized counterpart of OpenLRBytesIO.write_dnp"""
+    interval = _np_j_round(dnp / DISTANCE_PER_INTERVAL - 0.5, rows)
+    _np_check_range(interval, 0, 255, rows, "distance to next point interval")
+    records[:, col] = interval
+
+
+def _np_offset_bucket(offsets, rows):
+    """vectorized counterpart of the bucket index in OpenLRBytesIO.write_offset"""
+    _np_check_range(offsets, 0, np.nextafter(1, 0), rows, "offset")
+    bucket = _np_j_round(offsets * 256 - 0.5, rows)
+    bucket[offsets == 0] = 0
+    _np_check_range(bucket, 0, 255, rows, "offset bucket")
+    return bucket
+
+
+_FRC_VALUES = tuple(FRC)
+_FOW_VALUES = tuple(FOW)
+_ORIENTATION_VALUES = tuple(Orientation)
+_SIDE_OF_ROAD_VALUES = tuple(SideOfRoad)
+# decoding plans by (status byte, data size)
+_DECODE_PLANS = {}
+_HEADER_TYPE_CODES = {}
+_FIRST_COORDINATES = struct.Struct(">bHbH")
+_MAX_DECODE_PLANS = 4096
+_DECODE_LAYOUTS = {
+    LocationTypeCode.LineLocation: _line_layout,
+    LocationTypeCode.GeoCoordinateLocation: _geo_coordinate_layout,
+    LocationTypeCode.PointAlongLineLocation: _point_along_line_layout,
+    LocationTypeCode.PoiWithAccessPointLocation: _poi_layout,
+    LocationTypeCode.CircleLocation: _circle_layout,
+    LocationTypeCode.RectangleLocation: _rectangle_layout,
+    LocationTypeCode.GridLocation: _grid_layout,
+    LocationTypeCode.PolygonLocation: _polygon_layout,
+    LocationTypeCode.ClosedLineLocation: _closed_line_layout,
+}
+# location type flags of the status byte by LocationTypeCode
+_LOCATION_TYPE_FLAGS = [
+    LocationTypes[code.name].value for code in sorted(LocationTypeCode)
+]
+
+
 def _parse_line(data_buffer, size):
     points = []
     n_relative_points = (size - 9) // 7
@@ -0,0 +1,308 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Bounded caches for feeds repeating the same location references.
+"""
+
+import base64
+import os
+import sys
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import NamedTuple
+
+from openlr.binary_format import binary_decode, binary_encode, _DECODE_EXCEPTIONS
+from openlr.streaming import iter_reference_file
+from openlr.utils import freeze
+from openlr.xml_format import xml_encode_to_string
+
+CacheStats = NamedTuple(
+    "CacheStats",
+    [
+        ("hits", int),
+        ("misses", int),
+        ("evictions", int),
+        ("entries", int),
+        ("size", int),
+    ],
+)
+"""Counters of a cache: `size` is the number of bytes accounted against the
+byte budget."""
+
+
+class _LRUCache:
+    """thread safe least recently used mapping with entry and byte budgets"""
+
+    def __init__(self, max_entries, max_bytes):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries requires a positive number")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes requires a positive number")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        """Returns the `CacheStats` counters of the cache"""
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self._size,
+            )
+
+    def reset_stats(self):
+        """Sets the hit, miss and eviction counters back to zero"""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def clear(self):
+        """Removes all cached entries, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _lookup(self, key):
+        """returns the cached value or None, counting hits and misses"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def _insert(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (value, size)
+            self._size += size
+            while (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ) or (self.max_bytes is not None and self._size > self.max_bytes):
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._size -= old_size
+                self._evictions += 1
+
+
+def _object_size(obj):
+    """memory of the objects an object is made of, without the shared enum
+    members"""
+    if isinstance(obj, Enum):
+        return 0
+    if isinstance(obj, (tuple, list)):
+        return sys.getsizeof(obj) + sum(_object_size(value) for value in obj)
+    return sys.getsizeof(obj)
+
+
+# measured location sizes by type and number of points or corners
+_LOCATION_SIZES = {}
+
+
+def _entry_size(key, location):
+    """estimated memory of a cached key and its decoded location
+
+    Locations of the same type and number of points differ by a few bytes at
+    most, so their size is measured once per shape.
+    """
+    items = getattr(location, "points", None) or getattr(location, "corners", ())
+    shape = (type(location), len(items))
+    size = _LOCATION_SIZES.get(shape)
+    if size is None:
+        size = _LOCATION_SIZES[shape] = _object_size(location)
+    return sys.getsizeof(key) + size
+
+
+class DecodeCache(_LRUCache):
+    """Least recently used cache of decoded binary location references
+
+    The cache is keyed by the data given to :meth:`decode`, base64 strings or
+    raw bytes depending on `is_base64`. The locations are cached frozen (see
+    :func:`openlr.freeze`), so the location shared by all repeats of a
+    reference cannot be changed by one of the callers. Decoding errors are
+    not cached. All methods are thread safe.
+
+    Parameters
+    -------
+    max_entries : int
+        Maximum number of cached locations, None for no limit
+    max_bytes : int
+        Maximum estimated memory of the cached keys and locations in bytes,
+        None for no limit. Every entry is charged the size of the key and of
+        the tuples, floats and ints of the location, as measured by
+        `sys.getsizeof`.
+    is_base64 : bool
+        Boolean flag for base64 encoded keys
+    """
+
+    def __init__(self, max_entries=65536, max_bytes=None, is_base64=True):
+        super().__init__(max_entries, max_bytes)
+        self.is_base64 = is_base64
+
+    def decode(self, data):
+        """Decodes a location reference, reusing the cached location on repeats
+
+        Parameters
+        -------
+        data : str, bytes
+            Binary data of the location, base64 encoded if `is_base64` is set
+
+        Returns
+        -------
+        location : NamedTuple
+            Frozen location object, shared by all repeats of the reference
+        """
+        if not isinstance(data, (str, bytes)):
+            data = bytes(data)
+        location = self._lookup(data)
+        if location is None:
+            location = freeze(binary_decode(data, self.is_base64))
+            self._insert(data, location, _entry_size(data, location))
+        return location
+
+    __call__ = decode
+
+    def save(self, filename):
+        """Writes the cached references to a file, one base64 reference per line
+
+        The references are written from the least to the most recently used.
+        The file is replaced atomically and can be read back with :meth:`load`
+        or :func:`openlr.iter_reference_file`.
+
+        Parameters
+        -------
+        filename : str, os.PathLike
+            Name of the snapshot file
+        """
+        with self._lock:
+            keys = list(self._entries)
+        tmp_filename = "%s.%s.tmp" % (os.fspath(filename), os.getpid())
+        with open(tmp_filename, "wb") as f:
+            for key in keys:
+                f.write(self._to_line(key) + b"\n")
+        os.replace(tmp_filename, filename)
+
+    def load(self, filename):
+        """Decodes the references of a snapshot file into the cache
+
+        Lines that cannot be decoded are skipped. Loading does not change the
+        hit and miss counters. Base64 references are cached as `str` keys.
+
+        Parameters
+        -------
+        filename : str, os.PathLike, file object
+            Snapshot file written by :meth:`save`, possibly compressed
+
+        Returns
+        -------
+        count : int
+            Number of loaded locations
+        """
+        count = 0
+        for _, line in iter_reference_file(filename, decode=False):
+            try:
+                raw = base64.b64decode(line)
+                location = freeze(binary_decode(raw, False))
+            except _DECODE_EXCEPTIONS:
+                continue
+            key = line.decode("ascii") if self.is_base64 else raw
+            self._insert(key, location, _entry_size(key, location))
+            count += 1
+        return count
+
+    def _to_line(self, key):
+        if not self.is_base64:
+            return base64.b64encode(key)
+        return key.encode("ascii") if isinstance(key, str) else key
+
+
+class EncodeCache(_LRUCache):
+    """Least recently used cache of encoded location objects
+
+    The cache is keyed by the frozen location objects, see
+    :func:`openlr.freeze`. Frozen locations are used as keys directly, other
+    locations are frozen on every call, which is still cheaper than encoding.
+    All methods are thread safe.
+
+    Parameters
+    -------
+    max_entries : int
+        Maximum number of cached encodings, None for no limit
+    max_bytes : int
+        Maximum total size of the cached encodings in bytes or characters,
+        None for no limit
+    format : str
+        "binary" or "xml"
+    is_base64 : bool
+        Boolean flag for base64 encoded binary data
+    is_pretty : bool
+        Boolean flag for pretty printed XML data
+    """
+
+    def __init__(
+        self,
+        max_entries=65536,
+        max_bytes=None,
+        format="binary",
+        is_base64=True,
+        is_pretty=True,
+    ):
+        if format not in ("binary", "xml"):
+            raise ValueError("format requires binary or xml but %r is given" % format)
+        super().__init__(max_entries, max_bytes)
+        self.format = format
+        self.is_base64 = is_base64
+        self.is_pretty = is_pretty
+
+    def encode(self, location):
+        """Encodes a location object, reusing the cached data of equal locations
+
+        Parameters
+        -------
+        location : NamedTuple
+            Location object, frozen or not
+
+        Returns
+        -------
+        data : str, bytes
+            Binary or XML data of the location
+        """
+        key = freeze(location)
+        data = self._lookup(key)
+        if data is None:
+            if self.format == "binary":
+                data = binary_encode(key, self.is_base64)
+            else:
+                data = xml_encode_to_string(key, self.is_pretty)
+            self._insert(key, data, len(data))
+        return data
+
+    __call__ = encode
@@ -0,0 +1,333 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Streaming conversion of location reference files between formats.
+
+This is the engine of ``python -m openlr``: records are read, converted and
+written one chunk at a time, so files of any size can be piped through.
+"""
+
+import binascii
+import struct
+import sys
+import time
+from collections import Counter
+
+from openlr.aio import _length_splitter
+from openlr.binary_format import (
+    DecodeError,
+    binary_decode,
+    binary_encode,
+    _DECODE_EXCEPTIONS,
+)
+from openlr.geojson_format import geojson_encode_to_string
+from openlr.parallel import _map_chunks
+from openlr.streaming import DEFAULT_BLOCK_SIZE, iter_lines, open_reference_file
+from openlr.utils import from_json, to_json
+from openlr.xml_format import (
+    XMLParseError,
+    xml_decode_stream,
+    xml_decode_string,
+    xml_encode_to_string,
+)
+
+INPUT_FORMATS = ("base64", "hex", "framed", "xml", "ndjson")
+OUTPUT_FORMATS = ("base64", "hex", "framed", "xml", "ndjson", "geojson")
+ERROR_POLICIES = ("skip", "fail", "report")
+# framed records are preceded by their size as 2 bytes big endian, like the
+# "length" framing of openlr.aiter_references
+FRAME_PREFIX = struct.Struct(">H")
+# exceptions raised by the readers on invalid records, other exceptions of
+# the conversion are errors of the code and not caught
+_CONVERT_EXCEPTIONS = _DECODE_EXCEPTIONS + (XMLParseError, binascii.Error)
+
+
+class ConvertStats:
+    """Counters of a conversion
+
+    Attributes
+    -------
+    converted : int
+        Number of converted records
+    failed : int
+        Number of records that could not be converted
+    types : collections.Counter
+        Number of converted locations per location type name
+    elapsed : float
+        Seconds from the start to the end of the conversion
+    """
+
+    def __init__(self):
+        self.converted = 0
+        self.failed = 0
+        self.types = Counter()
+        self.elapsed = 0.0
+
+    @property
+    def throughput(self):
+        """Records per second"""
+        total = self.converted + self.failed
+        return total / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """Returns a human readable report of the counters"""
+        lines = [
+            "converted %d records, %d failed, in %.3f s (%.0f records/s)"
+            % (self.converted, self.failed, self.elapsed, self.throughput)
+        ]
+        for name, count in sorted(self.types.items()):
+            lines.append("  %-40s %d" % (name, count))
+        return "\n".join(lines)
+
+
+def convert(
+    inputs,
+    output,
+    from_format="base64",
+    to_format="xml",
+    workers=1,
+    errors="report",
+    error_file=None,
+    block_size=DEFAULT_BLOCK_SIZE,
+):
+    """Converts the location references of files into another format
+
+    Text formats hold one reference per line: base64 or hex encoded binary,
+    one compact XML document, a `get_dict` JSON object (NDJSON) or, as
+    output only, a GeoJSON Feature. Framed records are raw binary references
+    preceded by their size. XML input that is not one document per line is
+    parsed as one document with any number of OpenLR elements.
+
+    Parameters
+    -------
+    inputs : iterable of str, os.PathLike, file object
+        File names or binary file objects, plain or gzip, bz2 or xz
+        compressed
+    output : file object
+        Text file object, or binary for the framed output format
+    from_format : str
+        One of `INPUT_FORMATS`
+    to_format : str
+        One of `OUTPUT_FORMATS`
+    workers : int
+        Number of processes converting the records, None for the number of
+        CPUs. The output order is the input order.
+    errors : str
+        "skip" drops invalid records, "report" writes their line or record
+        number and the error to `error_file` and "fail" stops at the first
+        invalid record with a ValueError
+    error_file : file object
+        Text file for the reports, stderr if None
+
+    Returns
+    -------
+    stats : ConvertStats
+        Counters of the conversion
+    """
+    if from_format not in INPUT_FORMATS:
+        raise ValueError(
+            "from_format requires one of %s but %r is given"
+            % (INPUT_FORMATS, from_format)
+        )
+    if to_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            "to_format requires one of %s but %r is given" % (OUTPUT_FORMATS, to_format)
+        )
+    if errors not in ERROR_POLICIES:
+        raise ValueError(
+            "errors requires one of %s but %r is given" % (ERROR_POLICIES, errors)
+        )
+    if error_file is None:
+        error_file = sys.stderr
+
+    stats = ConvertStats()
+    start = time.perf_counter()
+    try:
+        for source in inputs:
+            records = _iter_records(source, from_format, block_size)
+            if workers == 1:
+                results = (_convert_record(r, from_format, to_format) for r in records)
+            else:
+                results = _map_chunks(
+                    _convert_chunk, records, workers, None, (from_format, to_format)
+                )
+            for number, type_name, result in results:
+                if type_name is None:
+                    stats.failed += 1
+                    if errors == "fail":
+                        raise ValueError("%s: %s" % (number, result))
+                    if errors == "report":
+                        print("%s: %s" % (number, result), file=error_file)
+                    continue
+                stats.converted += 1
+                stats.types[type_name] += 1
+                output.write(result)
+    finally:
+        stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def location_to_text(location, to_format):
+    """Serializes a location object as one record of an output format
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+    to_format : str
+        One of `OUTPUT_FORMATS`
+
+    Returns
+    -------
+    record : str, bytes
+        Line with a trailing newline, bytes with the size prefix for framed
+    """
+    return _WRITERS[to_format](location)
+
+
+def _iter_records(source, from_format, block_size):
+    """yields (position, record) with the raw record or a decoded location
+
+    The position is "line N" for line based input and "record N" otherwise.
+    """
+    fileobj = open_reference_file(source)
+    try:
+        if from_format == "framed":
+            yield from _iter_frames(fileobj, block_size)
+        elif from_format == "xml":
+            yield from _iter_xml(fileobj, block_size)
+        else:
+            yield from _numbered_lines(fileobj, block_size)
+    finally:
+        if fileobj is not source:
+            fileobj.close()
+
+
+def _numbered_lines(fileobj, block_size):
+    for line_number, line in iter_lines(fileobj, block_size):
+        yield "line %d" % line_number, line
+
+
+def _iter_frames(fileobj, block_size):
+    split = _length_splitter(FRAME_PREFIX)
+    buffer = bytearray()
+    number = 0
+    while True:
+        data = fileobj.read(block_size)
+        buffer += data
+        for frame in split(buffer, not data):
+            number += 1
+            yield "record %d" % number, frame
+        if not data:
+            break
+    if buffer:
+        yield "record %d" % (number + 1), DecodeError(
+            number, bytes(buffer), ValueError("Truncated record at end of file")
+        )
+
+
+def _iter_xml(fileobj, block_size):
+    lines = _numbered_lines(fileobj, block_size)
+    first = next(lines, None)
+    if first is None:
+        return
+    line = first[1]
+    if line.endswith(b"</OpenLR>") and line.startswith(b"<"):
+        # one document per line as written by the xml output format
+        yield first
+        yield from lines
+        return
+    reader = _LinesReader(first, lines)
+    for index, location in enumerate(xml_decode_stream(reader, errors="record")):
+        yield "record %d" % (index + 1), location
+
+
+class _LinesReader:
+    """binary file interface over numbered lines, for the XML parser"""
+
+    def __init__(self, first, lines):
+        self._lines = lines
+        self._buffer = first[1] + b"\n"
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line[1] + b"\n"
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _convert_chunk(start, records, from_format, to_format):
+    return [_convert_record(record, from_format, to_format) for record in records]
+
+
+def _convert_record(record, from_format, to_format):
+    """returns (position, location type name, output) or (position, None, error)"""
+    number, data = record
+    if isinstance(data, DecodeError):
+        return number, None, _describe(data.error)
+    try:
+        if isinstance(data, bytes):
+            location = _READERS[from_format](data)
+        else:
+            location = data
+        return number, type(location).__name__, _WRITERS[to_format](location)
+    except _CONVERT_EXCEPTIONS as error:
+        return number, None, _describe(error)
+
+
+def _describe(error):
+    return "%s: %s" % (type(error).__name__, error)
+
+
+def _read_xml(data):
+    try:
+        return xml_decode_string(data)
+    except KeyError as error:
+        # unknown enum names
+        raise ValueError("Invalid value %s" % error) from error
+
+
+def _read_json(data):
+    try:
+        return from_json(data)
+    except (KeyError, TypeError) as error:
+        # missing fields or values of the wrong JSON type
+        raise ValueError("Invalid location object: %s" % error) from error
+
+
+def _write_framed(location):
+    data = binary_encode(location, is_base64=False)
+    return FRAME_PREFIX.pack(len(data)) + data
+
+
+_READERS = {
+    "base64": binary_decode,
+    "hex": lambda data: binary_decode(binascii.unhexlify(data), is_base64=False),
+    "framed": lambda data: binary_decode(data, is_base64=False),
+    "xml": _read_xml,
+    "ndjson": _read_json,
+}
+_WRITERS = {
+    "base64": lambda location: binary_encode(location) + "\n",
+    "hex": lambda location: binary_encode(location, is_base64=False).hex() + "\n",
+    "framed": _write_framed,
+    "xml": lambda location: xml_encode_to_string(location, is_pretty=False) + "\n",
+    "ndjson": lambda location: to_json(location) + "\n",
+    "geojson": lambda location: geojson_encode_to_string(location) + "\n",
+}
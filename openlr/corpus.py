@@ -0,0 +1,461 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compact in-memory storage of many decoded locations in typed arrays.
+"""
+
+import binascii
+import struct
+from array import array
+from collections.abc import Sequence
+
+from openlr.binary_format import (
+    LocationTypeCode,
+    _DECODE_EXCEPTIONS,
+    _decode_planned,
+)
+from openlr.locations import (
+    FRC,
+    FOW,
+    SideOfRoad,
+    Orientation,
+    Coordinates,
+    LineAttributes,
+    LocationReferencePoint,
+    LineLocationReference,
+    GeoCoordinateLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    PolygonLocationReference,
+    ClosedLineLocationReference,
+)
+
+COORDINATE_TYPES = ("float64", "int32")
+# int32 coordinates are stored in units of 1e-7 degrees
+INT32_COORDINATE_SCALE = 10_000_000
+# the per location fields with the ranges of their arrays
+_ROW = struct.Struct("=bqqddBBqHHBBH")
+
+
+class LocationCorpus:
+    """Array-backed container of decoded locations
+
+    The fields of all location reference points and coordinates are stored
+    in typed arrays of the `array` module, one array per field, instead of a
+    NamedTuple with boxed values per point. Items are `LocationView` objects
+    reading the arrays on attribute access.
+
+    Parameters
+    -------
+    locations : iterable of NamedTuple
+        Location objects to add
+    coordinates : str
+        "float64" stores the coordinates exactly, "int32" rounds them to
+        1e-7 degrees (about 1 cm) to use half of the memory
+    """
+
+    def __init__(self, locations=(), coordinates="float64"):
+        if coordinates not in COORDINATE_TYPES:
+            raise ValueError(
+                "coordinates requires one of %s but %r is given"
+                % (COORDINATE_TYPES, coordinates)
+            )
+        self.coordinates = coordinates
+        coordinate_code = "d" if coordinates == "float64" else "i"
+        # per location
+        self._kind = array("b")
+        self._point_start = array("q", [0])
+        self._coord_start = array("q", [0])
+        self._poffs = array("d")
+        self._noffs = array("d")
+        self._orientation = array("B")
+        self._side_of_road = array("B")
+        self._radius = array("q")
+        self._n_cols = array("H")
+        self._n_rows = array("H")
+        self._last_frc = array("B")
+        self._last_fow = array("B")
+        self._last_bear = array("H")
+        # per location reference point
+        self._lon = array(coordinate_code)
+        self._lat = array(coordinate_code)
+        self._frc = array("B")
+        self._fow = array("B")
+        self._bear = array("H")
+        self._lfrcnp = array("B")
+        self._dnp = array("i")
+        # per coordinate pair of the other fields
+        self._coord_lon = array(coordinate_code)
+        self._coord_lat = array(coordinate_code)
+        # per location arrays in the order of the _ROW fields
+        self._row_columns = (
+            self._kind,
+            self._point_start,
+            self._coord_start,
+            self._poffs,
+            self._noffs,
+            self._orientation,
+            self._side_of_road,
+            self._radius,
+            self._n_cols,
+            self._n_rows,
+            self._last_frc,
+            self._last_fow,
+            self._last_bear,
+        )
+        self.extend(locations)
+
+    @classmethod
+    def from_binary(cls, data, is_base64=True, errors="raise", coordinates="float64"):
+        """Decodes binary location references into a new corpus
+
+        The references are decoded and added one at a time, so no list of
+        location objects is built on the way.
+
+        Parameters
+        -------
+        data : iterable of str, bytearray, bytes
+            Binary data of the locations
+        is_base64 : bool
+            Boolean flag for base64 encoded data
+        errors : str
+            "raise" or "skip" for references that cannot be decoded
+        coordinates : str
+            "float64" or "int32", see `LocationCorpus`
+
+        Returns
+        -------
+        corpus : LocationCorpus
+            Corpus of the decoded locations
+        """
+        if errors not in ("raise", "skip"):
+            raise ValueError("errors requires raise or skip but %r is given" % errors)
+        corpus = cls(coordinates=coordinates)
+        corpus.extend(_decode_each(data, is_base64, errors == "raise"))
+        return corpus
+
+    def __len__(self):
+        return len(self._kind)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [LocationView(self, i) for i in range(*index.indices(len(self)))]
+        n = len(self._kind)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("location index out of range")
+        return LocationView(self, index)
+
+    def __iter__(self):
+        return (LocationView(self, i) for i in range(len(self._kind)))
+
+    @property
+    def nbytes(self):
+        """Number of bytes of the array buffers"""
+        return sum(
+            a.itemsize * len(a) for a in vars(self).values() if isinstance(a, array)
+        )
+
+    def append(self, location):
+        """Adds a location object to the corpus
+
+        A location with values that do not fit into their arrays raises
+        OverflowError, TypeError or ValueError and leaves the corpus
+        unchanged.
+        """
+        code = _location_type_code(location)
+        points = location.points if code in _POINT_LOCATIONS else ()
+        if code == LocationTypeCode.PoiWithAccessPointLocation:
+            coords = [(location.lon, location.lat)]
+        elif code in (
+            LocationTypeCode.GeoCoordinateLocation,
+            LocationTypeCode.CircleLocation,
+        ):
+            coords = [location.point]
+        elif code in (
+            LocationTypeCode.RectangleLocation,
+            LocationTypeCode.GridLocation,
+        ):
+            coords = [location.lowerLeft, location.upperRight]
+        elif code == LocationTypeCode.PolygonLocation:
+            coords = location.corners
+        else:
+            coords = ()
+
+        store = self._store
+        last_line = getattr(location, "lastLine", None) or (0, 0, 0)
+        row = (
+            code,
+            len(self._lon) + len(points),
+            len(self._coord_lon) + len(coords),
+            getattr(location, "poffs", 0),
+            getattr(location, "noffs", 0),
+            getattr(location, "orientation", 0),
+            getattr(location, "sideOfRoad", 0),
+            getattr(location, "radius", 0),
+            getattr(location, "n_cols", 0),
+            getattr(location, "n_rows", 0),
+            last_line[0],
+            last_line[1],
+            last_line[2],
+        )
+        # everything is converted before the first array is extended, so the
+        # arrays stay aligned when a value does not fit its array
+        columns = []
+        if points:
+            columns += [
+                (self._lon, [store(p.lon) for p in points]),
+                (self._lat, [store(p.lat) for p in points]),
+                (self._frc, [p.frc for p in points]),
+                (self._fow, [p.fow for p in points]),
+                (self._bear, [p.bear for p in points]),
+                (self._lfrcnp, [p.lfrcnp for p in points]),
+                (self._dnp, [p.dnp for p in points]),
+            ]
+        if coords:
+            columns += [
+                (self._coord_lon, [store(lon) for lon, _ in coords]),
+                (self._coord_lat, [store(lat) for _, lat in coords]),
+            ]
+        columns = [(c, array(c.typecode, values)) for c, values in columns]
+        try:
+            _ROW.pack(*row)
+        except struct.error as error:
+            raise ValueError("Invalid location fields %s: %s" % (row, error)) from None
+        for column, values in columns:
+            column.extend(values)
+        for column, value in zip(self._row_columns, row):
+            column.append(value)
+
+    def extend(self, locations):
+        """Adds location objects to the corpus"""
+        for location in locations:
+            self.append(location)
+
+    def location(self, index):
+        """Returns the location object at `index` built from the arrays"""
+        return self[index].to_location()
+
+    def _store(self, value):
+        if self.coordinates == "float64":
+            return value
+        return round(value * INT32_COORDINATE_SCALE)
+
+    def _load(self, value):
+        if self.coordinates == "float64":
+            return value
+        return value / INT32_COORDINATE_SCALE
+
+    def _point(self, j):
+        load = self._load
+        return LocationReferencePoint(
+            load(self._lon[j]),
+            load(self._lat[j]),
+            _FRC_VALUES[self._frc[j]],
+            _FOW_VALUES[self._fow[j]],
+            self._bear[j],
+            _FRC_VALUES[self._lfrcnp[j]],
+            self._dnp[j],
+        )
+
+    def _coordinates(self, j):
+        return Coordinates(
+            self._load(self._coord_lon[j]), self._load(self._coord_lat[j])
+        )
+
+    def _field(self, i, name):
+        """returns a field of the i-th location, lists as lazy sequences"""
+        if name == "points":
+            return _RowsView(
+                self._point, self._point_start[i], self._point_start[i + 1]
+            )
+        if name == "corners":
+            return _RowsView(
+                self._coordinates, self._coord_start[i], self._coord_start[i + 1]
+            )
+        if name in ("point", "lowerLeft"):
+            return self._coordinates(self._coord_start[i])
+        if name == "upperRight":
+            return self._coordinates(self._coord_start[i] + 1)
+        if name == "lon":
+            return self._load(self._coord_lon[self._coord_start[i]])
+        if name == "lat":
+            return self._load(self._coord_lat[self._coord_start[i]])
+        if name == "orientation":
+            return _ORIENTATION_VALUES[self._orientation[i]]
+        if name == "sideOfRoad":
+            return _SIDE_OF_ROAD_VALUES[self._side_of_road[i]]
+        if name == "lastLine":
+            return LineAttributes(
+                _FRC_VALUES[self._last_frc[i]],
+                _FOW_VALUES[self._last_fow[i]],
+                self._last_bear[i],
+            )
+        return getattr(self, _SCALAR_ARRAYS[name])[i]
+
+
+class LocationView:
+    """Read-only view of a location stored in a `LocationCorpus`
+
+    Fields are read like the attributes of the location NamedTuple,
+    `points` and `corners` are sequences building each point on access.
+    Views iterate, index and compare like the location objects.
+    """
+
+    __slots__ = ("_corpus", "_index")
+
+    def __init__(self, corpus, index):
+        self._corpus = corpus
+        self._index = index
+
+    @property
+    def location_type(self):
+        """`LocationTypeCode` of the location"""
+        return LocationTypeCode(self._corpus._kind[self._index])
+
+    @property
+    def _fields(self):
+        return _LOCATION_TYPES[self._corpus._kind[self._index]]._fields
+
+    def __getattr__(self, name):
+        if name in _LOCATION_TYPES[self._corpus._kind[self._index]]._fields:
+            return self._corpus._field(self._index, name)
+        raise AttributeError(
+            "%r object has no attribute %r" % (type(self).__name__, name)
+        )
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __iter__(self):
+        corpus, index = self._corpus, self._index
+        return (corpus._field(index, name) for name in self._fields)
+
+    def __getitem__(self, key):
+        return tuple(self)[key]
+
+    def __eq__(self, other):
+        if isinstance(other, LocationView):
+            other = other.to_location()
+        return self.to_location() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_location())
+
+    def to_location(self):
+        """Returns the location object of the view"""
+        location_type = _LOCATION_TYPES[self._corpus._kind[self._index]]
+        return location_type._make(list(v) if type(v) is _RowsView else v for v in self)
+
+
+class _RowsView(Sequence):
+    """sequence of the rows start:stop built with make(j)"""
+
+    __slots__ = ("_make", "_start", "_stop")
+
+    def __init__(self, make, start, stop):
+        self._make = make
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self._make(self._start + j) for j in range(*index.indices(len(self)))
+            ]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("point index out of range")
+        return self._make(self._start + index)
+
+    def __iter__(self):
+        return map(self._make, range(self._start, self._stop))
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, _RowsView)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _location_type_code(location):
+    code = _TYPE_CODES.get(type(location))
+    if code is None:
+        for location_type, code in _TYPE_CODES.items():
+            if isinstance(location, location_type):
+                return code
+        raise ValueError("Unknown location type: %s" % type(location).__name__)
+    return code
+
+
+_LOCATION_TYPES = (
+    LineLocationReference,
+    GeoCoordinateLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    PolygonLocationReference,
+    ClosedLineLocationReference,
+)
+_TYPE_CODES = {
+    location_type: LocationTypeCode(code)
+    for code, location_type in enumerate(_LOCATION_TYPES)
+}
+_POINT_LOCATIONS = (
+    LocationTypeCode.LineLocation,
+    LocationTypeCode.PointAlongLineLocation,
+    LocationTypeCode.PoiWithAccessPointLocation,
+    LocationTypeCode.ClosedLineLocation,
+)
+_SCALAR_ARRAYS = {
+    "poffs": "_poffs",
+    "noffs": "_noffs",
+    "radius": "_radius",
+    "n_cols": "_n_cols",
+    "n_rows": "_n_rows",
+}
+_FRC_VALUES = tuple(FRC)
+_FOW_VALUES = tuple(FOW)
+_ORIENTATION_VALUES = tuple(Orientation)
+_SIDE_OF_ROAD_VALUES = tuple(SideOfRoad)
+
+
+def _decode_each(data, is_base64, raise_errors):
+    """yields the decoded locations, leaving out failures unless raised"""
+    a2b_base64 = binascii.a2b_base64
+    for item in data:
+        try:
+            raw = a2b_base64(item) if is_base64 else item
+            location = _decode_planned(raw, 0, len(raw))
+        except _DECODE_EXCEPTIONS:
+            if raise_errors:
+                raise
+            continue
+        yield location
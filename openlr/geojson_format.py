@@ -0,0 +1,408 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+GeoJSON export of location objects.
+
+Lines are written as LineString, the point locations as Point and the area
+locations as Polygon, circles approximated by a regular polygon.
+"""
+
+import json
+import math
+import os
+
+from openlr.locations import (
+    LineLocationReference,
+    GeoCoordinateLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    PolygonLocationReference,
+    ClosedLineLocationReference,
+)
+from openlr.utils import METERS_PER_DEGREE
+
+CIRCLE_VERTICES = 32
+
+_SEPARATORS = (",", ":")
+
+
+def geojson_encode_geometry(location, circle_vertices=CIRCLE_VERTICES):
+    """Returns the GeoJSON geometry of a location object
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle,
+        whose ring is counterclockwise
+
+    Returns
+    -------
+    geometry : dict
+        GeoJSON geometry object with [lon, lat] positions
+    """
+    return _location_writer(location)[1](location, circle_vertices)
+
+
+def geojson_encode_feature(location, circle_vertices=CIRCLE_VERTICES):
+    """Returns the GeoJSON feature of a location object
+
+    The properties hold the location type name and the attributes of the
+    location: the FRC, FOW, bearing, lowest FRC to next point and distance to
+    next point of every location reference point, the offsets, orientation,
+    side of road, radius, grid size and last line, where present. Enum
+    values are given by name.
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+
+    Returns
+    -------
+    feature : dict
+        GeoJSON feature object
+    """
+    type_name, geometry, properties = _location_writer(location)
+    feature_properties = {"type": type_name}
+    feature_properties.update(properties(location))
+    return {
+        "type": "Feature",
+        "geometry": geometry(location, circle_vertices),
+        "properties": feature_properties,
+    }
+
+
+def geojson_encode_to_string(location, circle_vertices=CIRCLE_VERTICES):
+    """Encodes a location object into a compact GeoJSON feature string
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+
+    Returns
+    -------
+    geojson : str
+        GeoJSON feature without line breaks
+    """
+    return json.dumps(
+        geojson_encode_feature(location, circle_vertices), separators=_SEPARATORS
+    )
+
+
+def geojson_encode_to_file(
+    locations, filename_or_file, circle_vertices=CIRCLE_VERTICES
+):
+    """Writes location objects into one GeoJSON FeatureCollection file
+
+    Parameters
+    -------
+    locations : iterable of NamedTuple
+        Location objects
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in text mode
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+
+    Returns
+    -------
+    count : int
+        Number of written features
+    """
+    with GeoJSONWriter(filename_or_file, circle_vertices) as writer:
+        for location in locations:
+            writer.write(location)
+    return writer.count
+
+
+class GeoJSONWriter:
+    """Streams location objects as features into a GeoJSON FeatureCollection
+
+    Every feature is serialized and written as soon as it is given, one per
+    line, so the memory usage does not depend on the number of features.
+
+    Parameters
+    -------
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in text mode, file objects are
+        left open
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+    """
+
+    def __init__(self, filename_or_file, circle_vertices=CIRCLE_VERTICES):
+        if circle_vertices < 3:
+            raise ValueError(
+                "circle_vertices requires at least 3 but %s is given" % circle_vertices
+            )
+        self.circle_vertices = circle_vertices
+        self.count = 0
+        self._is_filename = isinstance(filename_or_file, (str, bytes, os.PathLike))
+        if self._is_filename:
+            self._file = open(filename_or_file, "w", encoding="utf-8")
+        else:
+            self._file = filename_or_file
+        self._file.write('{"type":"FeatureCollection","features":[')
+
+    def write(self, location):
+        """Writes the feature of a location object"""
+        feature = geojson_encode_to_string(location, self.circle_vertices)
+        self._file.write(("\n" if self.count == 0 else ",\n") + feature)
+        self.count += 1
+
+    def close(self):
+        """Closes the collection and the file if opened by the writer"""
+        if self._file is None:
+            return
+        self._file.write("\n]}\n")
+        if self._is_filename:
+            self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _position(coordinates):
+    return [coordinates.lon, coordinates.lat]
+
+
+def _positions(coordinates):
+    return [[c.lon, c.lat] for c in coordinates]
+
+
+def _ring(positions):
+    return positions + positions[:1]
+
+
+def _box(min_lon, min_lat, max_lon, max_lat):
+    return [
+        [min_lon, min_lat],
+        [max_lon, min_lat],
+        [max_lon, max_lat],
+        [min_lon, max_lat],
+        [min_lon, min_lat],
+    ]
+
+
+def _along(location):
+    """position at the positive offset on the straight first line segment"""
+    start, end = location.points[0], location.points[-1]
+    return [
+        start.lon + (end.lon - start.lon) * location.poffs,
+        start.lat + (end.lat - start.lat) * location.poffs,
+    ]
+
+
+def _circle(center, radius, vertices):
+    d_lat = radius / METERS_PER_DEGREE
+    d_lon = d_lat / max(math.cos(math.radians(center.lat)), 0.01)
+    ring = []
+    # counterclockwise from the east, as RFC 7946 requires of exterior rings
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        ring.append(
+            [center.lon + d_lon * math.cos(angle), center.lat + d_lat * math.sin(angle)]
+        )
+    return _ring(ring)
+
+
+def _line_geometry(location, circle_vertices):
+    return {"type": "LineString", "coordinates": _positions(location.points)}
+
+
+def _geo_coordinate_geometry(location, circle_vertices):
+    return {"type": "Point", "coordinates": _position(location.point)}
+
+
+def _point_along_line_geometry(location, circle_vertices):
+    return {"type": "Point", "coordinates": _along(location)}
+
+
+def _poi_geometry(location, circle_vertices):
+    return {"type": "Point", "coordinates": [location.lon, location.lat]}
+
+
+def _circle_geometry(location, circle_vertices):
+    return {
+        "type": "Polygon",
+        "coordinates": [_circle(location.point, location.radius, circle_vertices)],
+    }
+
+
+def _rectangle_geometry(location, circle_vertices):
+    lower_left, upper_right = location.lowerLeft, location.upperRight
+    return {
+        "type": "Polygon",
+        "coordinates": [
+            _box(lower_left.lon, lower_left.lat, upper_right.lon, upper_right.lat)
+        ],
+    }
+
+
+def _grid_geometry(location, circle_vertices):
+    # the rectangle is the lower left cell of the grid
+    lower_left, upper_right = location.lowerLeft, location.upperRight
+    max_lon = lower_left.lon + (upper_right.lon - lower_left.lon) * location.n_cols
+    max_lat = lower_left.lat + (upper_right.lat - lower_left.lat) * location.n_rows
+    return {
+        "type": "Polygon",
+        "coordinates": [_box(lower_left.lon, lower_left.lat, max_lon, max_lat)],
+    }
+
+
+def _polygon_geometry(location, circle_vertices):
+    return {"type": "Polygon", "coordinates": [_ring(_positions(location.corners))]}
+
+
+def _closed_line_geometry(location, circle_vertices):
+    return {"type": "Polygon", "coordinates": [_ring(_positions(location.points))]}
+
+
+def _points_properties(points):
+    return [
+        {
+            "frc": p.frc.name,
+            "fow": p.fow.name,
+            "bear": p.bear,
+            "lfrcnp": p.lfrcnp.name,
+            "dnp": p.dnp,
+        }
+        for p in points
+    ]
+
+
+def _line_properties(location):
+    return {
+        "points": _points_properties(location.points),
+        "poffs": location.poffs,
+        "noffs": location.noffs,
+    }
+
+
+def _no_properties(location):
+    return {}
+
+
+def _point_along_line_properties(location):
+    return {
+        "points": _points_properties(location.points),
+        "poffs": location.poffs,
+        "orientation": location.orientation.name,
+        "sideOfRoad": location.sideOfRoad.name,
+    }
+
+
+def _poi_properties(location):
+    properties = _point_along_line_properties(location)
+    properties["accessPoint"] = _along(location)
+    return properties
+
+
+def _circle_properties(location):
+    return {"center": _position(location.point), "radius": location.radius}
+
+
+def _grid_properties(location):
+    return {"n_cols": location.n_cols, "n_rows": location.n_rows}
+
+
+def _closed_line_properties(location):
+    last_line = location.lastLine
+    return {
+        "points": _points_properties(location.points),
+        "lastLine": {
+            "frc": last_line.frc.name,
+            "fow": last_line.fow.name,
+            "bear": last_line.bear,
+        },
+    }
+
+
+# location type, type name, geometry and properties writers
+_LOCATION_WRITERS = (
+    (
+        LineLocationReference,
+        "LineLocationReference",
+        _line_geometry,
+        _line_properties,
+    ),
+    (
+        GeoCoordinateLocationReference,
+        "GeoCoordinateLocationReference",
+        _geo_coordinate_geometry,
+        _no_properties,
+    ),
+    (
+        PointAlongLineLocationReference,
+        "PointAlongLineLocationReference",
+        _point_along_line_geometry,
+        _point_along_line_properties,
+    ),
+    (
+        PoiWithAccessPointLocationReference,
+        "PoiWithAccessPointLocationReference",
+        _poi_geometry,
+        _poi_properties,
+    ),
+    (
+        CircleLocationReference,
+        "CircleLocationReference",
+        _circle_geometry,
+        _circle_properties,
+    ),
+    (
+        RectangleLocationReference,
+        "RectangleLocationReference",
+        _rectangle_geometry,
+        _no_properties,
+    ),
+    (
+        GridLocationReference,
+        "GridLocationReference",
+        _grid_geometry,
+        _grid_properties,
+    ),
+    (
+        PolygonLocationReference,
+        "PolygonLocationReference",
+        _polygon_geometry,
+        _no_properties,
+    ),
+    (
+        ClosedLineLocationReference,
+        "ClosedLineLocationReference",
+        _closed_line_geometry,
+        _closed_line_properties,
+    ),
+)
+
+
+def _location_writer(location):
+    for location_type, type_name, geometry, properties in _LOCATION_WRITERS:
+        if isinstance(location, location_type):
+            return type_name, geometry, properties
+    raise ValueError("object %r is not a Location type" % (location,))
@@ -0,0 +1,159 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Lazy decoding of binary locations, parsing the full location only on demand.
+"""
+
+import binascii
+
+from openlr.binary_format import (
+    LocationTypeCode,
+    _decode_planned,
+    _header_type_code,
+    _FIRST_COORDINATES,
+    _HEADER_TYPE_CODES,
+)
+from openlr.locations import Coordinates
+from openlr.openlr_bytes_io import int_to_deg
+
+
+def binary_decode_lazy(data, is_base64=True):
+    """Decodes the header of a binary location, deferring everything else
+
+    Only the status byte and the first coordinates are read. The remaining
+    fields are decoded on the first access and cached.
+
+    Parameters
+    -------
+    data : str, bytearray, bytes
+        Bytes-like object that contains the binary data of a location
+    is_base64 : bool
+        Boolean flag for base64 encoded string data
+
+    Returns
+    -------
+    location : LazyLocation
+        Lazy view of the location
+    """
+    if is_base64:
+        data = binascii.a2b_base64(data)
+    return LazyLocation(bytes(data))
+
+
+class LazyLocation:
+    """Lazy view of a binary location
+
+    `location_type`, `first_point` and `lrp_count` are read from the status
+    byte, the first bytes and the size of the data.
+    Accessing any field of the location type, like `points`, `corners` or
+    `poffs`, decodes the full location once; :meth:`to_location` returns it.
+
+    Parameters
+    -------
+    data : bytes
+        Raw binary data of the location
+    """
+
+    __slots__ = ("data", "location_type", "_location")
+
+    def __init__(self, data):
+        size = len(data)
+        if size < 7:
+            raise ValueError("Location data of %s bytes is too short" % size)
+        key = (data[0], size)
+        location_type = _HEADER_TYPE_CODES.get(key)
+        if location_type is None:
+            location_type = _header_type_code(*key)
+        self.data = data
+        self.location_type = location_type
+        self._location = None
+
+    @property
+    def first_point(self):
+        """`Coordinates` of the first location reference point or corner,
+        read from the data without decoding the location"""
+        lon_hi, lon_lo, lat_hi, lat_lo = _FIRST_COORDINATES.unpack_from(self.data, 1)
+        return Coordinates(
+            int_to_deg(lon_hi * 65536 + lon_lo), int_to_deg(lat_hi * 65536 + lat_lo)
+        )
+
+    @property
+    def lrp_count(self):
+        """Number of location reference points as implied by the data size,
+        0 for locations without points"""
+        return _LRP_COUNTS[self.location_type](len(self.data))
+
+    @property
+    def is_materialized(self):
+        """True once the full location is decoded"""
+        return self._location is not None
+
+    @property
+    def _fields(self):
+        return self.to_location()._fields
+
+    def to_location(self):
+        """Returns the location object, decoding it on the first call"""
+        location = self._location
+        if location is None:
+            location = self._location = _decode_planned(self.data, 0, len(self.data))
+        return location
+
+    def __getattr__(self, name):
+        if name.startswith("__") or name in LazyLocation.__slots__:
+            raise AttributeError(name)
+        try:
+            return getattr(self.to_location(), name)
+        except AttributeError:
+            raise AttributeError(
+                "%r object has no attribute %r" % (type(self).__name__, name)
+            ) from None
+
+    def __len__(self):
+        return len(self.to_location())
+
+    def __iter__(self):
+        return iter(self.to_location())
+
+    def __getitem__(self, key):
+        return self.to_location()[key]
+
+    def __eq__(self, other):
+        if isinstance(other, LazyLocation):
+            other = other.to_location()
+        return self.to_location() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self._location is None:
+            return "LazyLocation(%s, first_point=%r, lrp_count=%s)" % (
+                self.location_type.name,
+                self.first_point,
+                self.lrp_count,
+            )
+        return repr(self._location)
+
+
+_LRP_COUNTS = {
+    LocationTypeCode.LineLocation: lambda size: (size - 9) // 7 + 1,
+    LocationTypeCode.GeoCoordinateLocation: lambda size: 0,
+    LocationTypeCode.PointAlongLineLocation: lambda size: 2,
+    LocationTypeCode.PoiWithAccessPointLocation: lambda size: 2,
+    LocationTypeCode.CircleLocation: lambda size: 0,
+    LocationTypeCode.RectangleLocation: lambda size: 0,
+    LocationTypeCode.GridLocation: lambda size: 0,
+    LocationTypeCode.PolygonLocation: lambda size: 0,
+    LocationTypeCode.ClosedLineLocation: lambda size: (size - 12) // 7 + 1,
+}
@@ -193,3 +193,40 @@ ClosedLineLocationReference = NamedTuple(
 )
 """A ClosedLineLocationReference is defined by an ordered sequence of
 location reference points and a terminating last location reference point."""
+# the type name differs from the module attribute, let pickle find the class
+ClosedLineLocationReference.__qualname__ = "ClosedLineLocationReference"
+
+
+class FrozenLineLocationReference(LineLocationReference):
+    """Immutable and hashable `LineLocationReference` holding its points in a
+    tuple, see :func:`openlr.freeze`."""
+
+    __slots__ = ()
+
+
+class FrozenPointAlongLineLocationReference(PointAlongLineLocationReference):
+    """Immutable and hashable `PointAlongLineLocationReference` holding its
+    points in a tuple."""
+
+    __slots__ = ()
+
+
+class FrozenPoiWithAccessPointLocationReference(PoiWithAccessPointLocationReference):
+    """Immutable and hashable `PoiWithAccessPointLocationReference` holding its
+    points in a tuple."""
+
+    __slots__ = ()
+
+
+class FrozenPolygonLocationReference(PolygonLocationReference):
+    """Immutable and hashable `PolygonLocationReference` holding its corners in
+    a tuple."""
+
+    __slots__ = ()
+
+
+class FrozenClosedLineLocationReference(ClosedLineLocationReference):
+    """Immutable and hashable `ClosedLineLocationReference` holding its points
+    in a tuple."""
+
+    __slots__ = ()
@@ -15,6 +15,7 @@
 Internal API for binary format conversion.
 It provides an extended io.BytesIO stream class to read/write OpenLR binary data.
 """
+
 import sys
 from io import BytesIO
 import binascii
@@ -89,7 +90,7 @@ def bytes_to_int(b, signed=True):
 
 def int_to_bytes(val, size=3, signed=True):
     """positive/negative int values to big endian"""
-    if not isinstance(val, numbers.Integral):
+    if type(val) is not int and not isinstance(val, numbers.Integral):
         raise ValueError("%s is not integer" % val)
     max_range = 1 << 8 * size
     if signed:
@@ -104,13 +105,15 @@ def int_to_bytes(val, size=3, signed=True):
                 "%s byte(s) unsigned int requires 0 <= number <= %s but number = %s"
                 % (size, max_range - 1, val)
             )
-    if val < 0:
-        val += max_range
-    arr = []
-    for i in range(size):
-        val, reminder = divmod(val, 256)
-        arr.append(reminder)
-    return bytearray(reversed(arr))
+    return bytearray(int(val).to_bytes(size, "big", signed=signed))
+
+
+# decoded values of every possible bucket index, interval and bearing sector
+OFFSET_VALUES = tuple((float(i) + 0.5) / 256 for i in range(256))
+DNP_VALUES = tuple(
+    j_round((float(i) + 0.5) * DISTANCE_PER_INTERVAL) for i in range(256)
+)
+BEAR_VALUES = tuple(j_round(i * BEAR_SECTOR + BEAR_SECTOR / 2) for i in range(32))
 
 
 class OpenLRBytesIO(BytesIO):
@@ -139,9 +142,8 @@ class OpenLRBytesIO(BytesIO):
         offset : float
             offset rate in [0,1] range
         """
-        bucket_index = bytes_to_int(self.read(1), signed=False)
-        offset = (float(bucket_index) + 0.5) / 256
-        return offset
+        (bucket_index,) = self.read(1)
+        return OFFSET_VALUES[bucket_index]
 
     def read_dnp(self):
         """Reads distance to next point from the buffer, 1 byte
@@ -151,10 +153,8 @@ class OpenLRBytesIO(BytesIO):
         dnp : int
             Distance to next point
         """
-        interval = bytes_to_int(self.read(1), signed=False)
-        dnp = (float(interval) + 0.5) * DISTANCE_PER_INTERVAL
-        dnp = j_round(dnp)
-        return dnp
+        (interval,) = self.read(1)
+        return DNP_VALUES[interval]
 
     def read_point_attributes(self):
         """Reads point attributes from the buffer, 2 bytes
@@ -176,8 +176,7 @@ class OpenLRBytesIO(BytesIO):
         fow = first_b & 0b111
         frc = (first_b >> 3) & 0b111
         reserved = (first_b >> 6) & 0b11
-        bear = (second_b & 0b11111) * BEAR_SECTOR + BEAR_SECTOR / 2
-        bear = j_round(bear)
+        bear = BEAR_VALUES[second_b & 0b11111]
         lfrcnp = (second_b >> 5) & 0b111
         return fow, frc, bear, lfrcnp, reserved
 
@@ -0,0 +1,201 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Parallel encoding and decoding of many locations with a process pool.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from openlr.binary_format import (
+    binary_decode_many,
+    binary_encode,
+    DecodeError,
+    DECODE_ERROR_POLICIES,
+)
+from openlr.xml_format import (
+    xml_decode_string,
+    xml_encode_to_string,
+    _XML_DECODE_EXCEPTIONS,
+)
+
+FORMATS = ("binary", "xml")
+MIN_CHUNKSIZE = 64
+MAX_CHUNKSIZE = 4096
+# chunks per worker for sized inputs, the rest of the work balancing
+CHUNKS_PER_WORKER = 4
+# chunks in flight per worker, bounding the memory for unsized inputs
+PENDING_PER_WORKER = 2
+
+
+def decode_many(
+    items, workers=None, chunksize=None, format="binary", is_base64=True, errors="raise"
+):
+    """Decodes many locations in parallel, keeping the input order
+
+    Parameters
+    ----------
+    items : iterable of str, bytes
+        Binary (base64 or raw) or XML data of the locations
+    workers : int
+        Number of worker processes, by default the number of CPUs.
+        With 1 worker the items are decoded in the calling process.
+    chunksize : int
+        Number of items sent to a worker at once, by default chosen from the
+        number of items and workers to keep the pickling overhead low
+    format : str
+        "binary" or "xml"
+    is_base64 : bool
+        Boolean flag for base64 encoded binary data
+    errors : str
+        Policy for items that cannot be decoded, see
+        :func:`openlr.binary_decode_many`
+
+    Yields
+    ------
+    location : NamedTuple
+        Location object (or `DecodeError` record) in input order
+    """
+    if format not in FORMATS:
+        raise ValueError(
+            "format requires one of %s but %r is given" % (FORMATS, format)
+        )
+    if errors not in DECODE_ERROR_POLICIES:
+        raise ValueError(
+            "errors requires one of %s but %r is given"
+            % (", ".join(DECODE_ERROR_POLICIES), errors)
+        )
+    return _map_chunks(
+        _decode_chunk, items, workers, chunksize, (format, is_base64, errors)
+    )
+
+
+def encode_many(
+    locations,
+    workers=None,
+    chunksize=None,
+    format="binary",
+    is_base64=True,
+    is_pretty=True,
+):
+    """Encodes many locations in parallel, keeping the input order
+
+    Parameters
+    ----------
+    locations : iterable of NamedTuple
+        Location objects
+    workers : int
+        Number of worker processes, by default the number of CPUs.
+        With 1 worker the locations are encoded in the calling process.
+    chunksize : int
+        Number of locations sent to a worker at once, chosen automatically
+        by default
+    format : str
+        "binary" or "xml"
+    is_base64 : bool
+        Boolean flag for base64 encoded binary data
+    is_pretty : bool
+        Boolean flag for pretty printed XML data
+
+    Yields
+    ------
+    data : str, bytes
+        Binary or XML data in input order
+    """
+    if format not in FORMATS:
+        raise ValueError(
+            "format requires one of %s but %r is given" % (FORMATS, format)
+        )
+    return _map_chunks(
+        _encode_chunk, locations, workers, chunksize, (format, is_base64, is_pretty)
+    )
+
+
+def _decode_chunk(start, chunk, format, is_base64, errors):
+    if format == "binary":
+        results = binary_decode_many(chunk, is_base64, errors)
+    else:
+        results = []
+        for index, item in enumerate(chunk):
+            try:
+                results.append(xml_decode_string(item))
+            except _XML_DECODE_EXCEPTIONS as error:
+                if errors == "raise":
+                    raise
+                if errors == "record":
+                    results.append(DecodeError(index, item, error))
+    if start:
+        results = [
+            (
+                DecodeError(start + r.index, r.data, r.error)
+                if isinstance(r, DecodeError)
+                else r
+            )
+            for r in results
+        ]
+    return results
+
+
+def _encode_chunk(start, chunk, format, is_base64, is_pretty):
+    if format == "binary":
+        return [binary_encode(location, is_base64) for location in chunk]
+    return [xml_encode_to_string(location, is_pretty) for location in chunk]
+
+
+def _default_chunksize(items, workers):
+    try:
+        n_items = len(items)
+    except TypeError:
+        return MAX_CHUNKSIZE // 4
+    chunksize = -(-n_items // (workers * CHUNKS_PER_WORKER))
+    return max(MIN_CHUNKSIZE, min(MAX_CHUNKSIZE, chunksize))
+
+
+def _map_chunks(function, items, workers, chunksize, args):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers requires a positive number but %s is given" % workers)
+    if chunksize is None:
+        chunksize = _default_chunksize(items, workers)
+    return _iter_map_chunks(function, iter(items), workers, chunksize, args)
+
+
+def _iter_map_chunks(function, items, workers, chunksize, args):
+    start = 0
+    if workers == 1:
+        while True:
+            chunk = list(islice(items, chunksize))
+            if not chunk:
+                return
+            yield from function(start, chunk, *args)
+            start += len(chunk)
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < workers * PENDING_PER_WORKER:
+                chunk = list(islice(items, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(function, start, chunk, *args))
+                start += len(chunk)
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
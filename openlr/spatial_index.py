@@ -0,0 +1,297 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+In-memory spatial index of location objects by their bounding boxes.
+"""
+
+import heapq
+import math
+
+from openlr.utils import METERS_PER_DEGREE, get_bbox
+
+DEFAULT_CELL_SIZE = 0.05
+# boxes covering more cells are kept in a list checked by every query
+MAX_CELLS_PER_ITEM = 64
+
+
+class LocationIndex:
+    """Uniform grid of the bounding boxes of location objects
+
+    Every location is registered in the grid cells its bounding box (see
+    :func:`openlr.get_bbox`) overlaps, so queries only test the locations
+    of the cells they touch. Distances are in meters on a local
+    equirectangular projection at the query point. Longitudes do not wrap
+    around the antimeridian.
+
+    Parameters
+    -------
+    items : mapping or iterable of (key, location)
+        Locations to load, by a hashable key such as an id or the reference
+    cell_size : float
+        Edge length of the grid cells in degrees, in the order of the query
+        sizes
+    """
+
+    def __init__(self, items=(), cell_size=DEFAULT_CELL_SIZE):
+        if not cell_size > 0:
+            raise ValueError(
+                "cell_size requires a positive number but %s is given" % cell_size
+            )
+        self.cell_size = cell_size
+        self._locations = {}
+        self._bboxes = {}
+        self._cells = {}
+        self._large = set()
+        # (min_x, min_y, max_x, max_y) of the occupied cells, None if stale
+        self._cell_bounds = None
+        self.update(items)
+
+    def __len__(self):
+        return len(self._locations)
+
+    def __contains__(self, key):
+        return key in self._locations
+
+    def __getitem__(self, key):
+        return self._locations[key]
+
+    def __iter__(self):
+        return iter(self._locations)
+
+    def bbox(self, key):
+        """Returns the bounding box (min_lon, min_lat, max_lon, max_lat) of a key"""
+        return self._bboxes[key]
+
+    def insert(self, key, location):
+        """Adds a location, replacing the location of an existing key"""
+        bbox = get_bbox(location)
+        if key in self._locations:
+            self.delete(key)
+        self._locations[key] = location
+        self._bboxes[key] = bbox
+        cells = self._cell_range(bbox)
+        if cells is None:
+            self._large.add(key)
+            return
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                self._cells[cell] = {key}
+            else:
+                bucket.add(key)
+        bounds = self._cell_bounds
+        if bounds is not None or len(self._cells) == len(cells):
+            # cells are listed from the lower left to the upper right one
+            (min_x, min_y), (max_x, max_y) = cells[0], cells[-1]
+            if bounds is not None:
+                min_x, min_y = min(min_x, bounds[0]), min(min_y, bounds[1])
+                max_x, max_y = max(max_x, bounds[2]), max(max_y, bounds[3])
+            self._cell_bounds = (min_x, min_y, max_x, max_y)
+
+    def update(self, items):
+        """Adds the locations of a mapping or an iterable of (key, location)"""
+        if hasattr(items, "items"):
+            items = items.items()
+        for key, location in items:
+            self.insert(key, location)
+
+    def delete(self, key):
+        """Removes a location, raising KeyError for an unknown key"""
+        del self._locations[key]
+        bbox = self._bboxes.pop(key)
+        cells = self._cell_range(bbox)
+        if cells is None:
+            self._large.discard(key)
+            return
+        bounds = self._cell_bounds
+        for cell in cells:
+            bucket = self._cells[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+                if bounds is not None and (
+                    cell[0] in (bounds[0], bounds[2])
+                    or cell[1] in (bounds[1], bounds[3])
+                ):
+                    # recomputed by the next nearest neighbor query
+                    self._cell_bounds = bounds = None
+
+    def query_bbox(self, min_lon, min_lat, max_lon, max_lat):
+        """Keys of the locations whose bounding box intersects a box
+
+        Returns
+        -------
+        keys : list
+            Keys in no particular order
+        """
+        if min_lon > max_lon or min_lat > max_lat:
+            raise ValueError(
+                "Invalid bounding box: %s" % ((min_lon, min_lat, max_lon, max_lat),)
+            )
+        bboxes = self._bboxes
+        return [
+            key
+            for key in self._candidates(min_lon, min_lat, max_lon, max_lat)
+            if _intersects(bboxes[key], min_lon, min_lat, max_lon, max_lat)
+        ]
+
+    def query_radius(self, lon, lat, radius):
+        """Keys of the locations whose bounding box is within a distance
+
+        Parameters
+        -------
+        lon, lat : float
+            Coordinates of the center
+        radius : float
+            Distance in meters
+
+        Returns
+        -------
+        keys : list
+            Keys in no particular order
+        """
+        d_lat = radius / METERS_PER_DEGREE
+        d_lon = d_lat / _cos_lat(lat)
+        distance = _distance_function(lon, lat)
+        bboxes = self._bboxes
+        return [
+            key
+            for key in self._candidates(
+                lon - d_lon, lat - d_lat, lon + d_lon, lat + d_lat
+            )
+            if distance(bboxes[key]) <= radius
+        ]
+
+    def nearest(self, lon, lat, k=1):
+        """The k locations with the nearest bounding boxes
+
+        The grid is searched in growing rings of cells around the point until
+        no unvisited cell can hold a nearer location.
+
+        Returns
+        -------
+        neighbors : list of (float, key)
+            Distances in meters and keys, nearest first
+        """
+        if k < 1 or not self._locations:
+            return []
+        distance = _distance_function(lon, lat)
+        bboxes = self._bboxes
+        meters_per_cell = self.cell_size * METERS_PER_DEGREE * _cos_lat(lat)
+        seen = set(self._large)
+        found = [(distance(bboxes[key]), key) for key in self._large]
+        cx, cy = self._cell(lon, lat)
+        bounds = self._occupied_bounds()
+        if bounds is None:
+            max_ring = -1
+        else:
+            min_x, min_y, max_x, max_y = bounds
+            max_ring = max(
+                abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y)
+            )
+        ring = 0
+        while ring <= max_ring:
+            for cell in _ring_cells(cx, cy, ring):
+                for key in self._cells.get(cell, ()):
+                    if key not in seen:
+                        seen.add(key)
+                        found.append((distance(bboxes[key]), key))
+            if len(found) >= k:
+                # cells beyond the ring are at least ring cell sizes away
+                kth = heapq.nsmallest(k, found, key=_first)[-1][0]
+                if kth <= ring * meters_per_cell:
+                    break
+            ring += 1
+        return heapq.nsmallest(k, found, key=_first)
+
+    def _occupied_bounds(self):
+        """bounds of the occupied cells, None if there are none"""
+        if self._cell_bounds is None and self._cells:
+            xs = [x for x, _ in self._cells]
+            ys = [y for _, y in self._cells]
+            self._cell_bounds = (min(xs), min(ys), max(xs), max(ys))
+        return self._cell_bounds
+
+    def _cell(self, lon, lat):
+        return math.floor(lon / self.cell_size), math.floor(lat / self.cell_size)
+
+    def _cell_range(self, bbox):
+        """cells overlapped by a box, None if there are too many"""
+        min_x, min_y = self._cell(bbox[0], bbox[1])
+        max_x, max_y = self._cell(bbox[2], bbox[3])
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > MAX_CELLS_PER_ITEM:
+            return None
+        return [
+            (x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)
+        ]
+
+    def _candidates(self, min_lon, min_lat, max_lon, max_lat):
+        """keys registered in the cells overlapped by a box, and the large ones"""
+        min_x, min_y = self._cell(min_lon, min_lat)
+        max_x, max_y = self._cell(max_lon, max_lat)
+        candidates = set(self._large)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self._cells):
+            # fewer occupied cells than cells in the box
+            for (x, y), bucket in self._cells.items():
+                if min_x <= x <= max_x and min_y <= y <= max_y:
+                    candidates.update(bucket)
+            return candidates
+        cells = self._cells
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                bucket = cells.get((x, y))
+                if bucket is not None:
+                    candidates.update(bucket)
+        return candidates
+
+
+def _cos_lat(lat):
+    """scale of the longitudes, bounded like in :func:`openlr.get_bbox`"""
+    return max(math.cos(math.radians(lat)), 0.01)
+
+
+def _first(item):
+    return item[0]
+
+
+def _intersects(bbox, min_lon, min_lat, max_lon, max_lat):
+    return (
+        bbox[0] <= max_lon
+        and min_lon <= bbox[2]
+        and bbox[1] <= max_lat
+        and min_lat <= bbox[3]
+    )
+
+
+def _distance_function(lon, lat):
+    """distance in meters from the point to a box, 0 inside"""
+    lon_factor = METERS_PER_DEGREE * _cos_lat(lat)
+
+    def distance(bbox):
+        d_lon = max(bbox[0] - lon, 0.0, lon - bbox[2]) * lon_factor
+        d_lat = max(bbox[1] - lat, 0.0, lat - bbox[3]) * METERS_PER_DEGREE
+        return math.hypot(d_lon, d_lat)
+
+    return distance
+
+
+def _ring_cells(cx, cy, ring):
+    """cells at Chebyshev distance ring from the cell (cx, cy)"""
+    if ring == 0:
+        return [(cx, cy)]
+    cells = [(x, cy - ring) for x in range(cx - ring, cx + ring + 1)]
+    cells += [(x, cy + ring) for x in range(cx - ring, cx + ring + 1)]
+    cells += [(cx - ring, y) for y in range(cy - ring + 1, cy + ring)]
+    cells += [(cx + ring, y) for y in range(cy - ring + 1, cy + ring)]
+    return cells
@@ -0,0 +1,213 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Streaming readers for large files of base64 location references, one per line.
+"""
+
+import binascii
+import bz2
+import gzip
+import io
+import lzma
+import os
+
+from openlr.binary_format import (
+    DecodeError,
+    DECODE_ERROR_POLICIES,
+    _DECODE_EXCEPTIONS,
+    _decode_planned,
+)
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+_MAGIC_NUMBERS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+
+
+def open_reference_file(filename_or_file):
+    """Opens a file for binary reading, decompressing gzip, bz2 and xz data
+
+    The compression is detected from the first bytes of the data, not from
+    the file name.
+
+    Parameters
+    ----------
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in binary mode. Closing the
+        returned file object never closes a file object given by the caller.
+
+    Returns
+    -------
+    file : file object
+        Binary file object yielding the uncompressed data
+    """
+    is_filename = isinstance(filename_or_file, (str, bytes, os.PathLike))
+    if is_filename:
+        fileobj = open(filename_or_file, "rb")
+        magic = fileobj.peek(6)[:6]
+    else:
+        fileobj = filename_or_file
+        if hasattr(fileobj, "peek"):
+            magic = fileobj.peek(6)[:6]
+        elif fileobj.seekable():
+            position = fileobj.tell()
+            magic = _read_exactly(fileobj, 6)
+            fileobj.seek(position)
+        else:
+            magic = _read_exactly(fileobj, 6)
+            fileobj = _PrefixedReader(magic, fileobj)
+    for magic_number, opener in _MAGIC_NUMBERS:
+        if magic.startswith(magic_number):
+            if is_filename:
+                fileobj.close()
+                return opener(filename_or_file, "rb")
+            return opener(fileobj, "rb")
+    return fileobj
+
+
+class _PrefixedReader(io.RawIOBase):
+    """reads bytes already taken from a stream, then the rest of the stream
+
+    The stream is not owned: closing the reader leaves it open.
+    """
+
+    def __init__(self, prefix, fileobj):
+        super().__init__()
+        self._prefix = prefix
+        self._fileobj = fileobj
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._prefix:
+            data = self._prefix[: len(buffer)]
+            self._prefix = self._prefix[len(data) :]
+        else:
+            data = self._fileobj.read(len(buffer)) or b""
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _read_exactly(fileobj, size):
+    """reads size bytes, fewer only at the end of the stream"""
+    chunks = []
+    while size > 0:
+        chunk = fileobj.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def iter_lines(fileobj, block_size=DEFAULT_BLOCK_SIZE):
+    """Iterates over the stripped, non-empty lines of a binary file object
+
+    The data is read in blocks of `block_size` bytes, so the memory usage is
+    independent of the file size.
+
+    Yields
+    ------
+    line_number : int
+        1-based number of the line in the file
+    line : bytes
+        Content of the line without surrounding whitespace
+    """
+    line_number = 0
+    # pieces of the unfinished last line, joined once its newline arrives
+    partial = []
+    while True:
+        block = fileobj.read(block_size)
+        if not block:
+            break
+        lines = block.split(b"\n")
+        if len(lines) == 1:
+            partial.append(block)
+            continue
+        if partial:
+            partial.append(lines[0])
+            lines[0] = b"".join(partial)
+            partial = []
+        last = lines.pop()
+        if last:
+            partial.append(last)
+        for line in lines:
+            line_number += 1
+            line = line.strip()
+            if line:
+                yield line_number, line
+    rest = b"".join(partial).strip()
+    if rest:
+        yield line_number + 1, rest
+
+
+def iter_reference_file(
+    filename_or_file, decode=True, errors="record", block_size=DEFAULT_BLOCK_SIZE
+):
+    """Streams the base64 location references of a file, one per line
+
+    Plain text, gzip, bz2 and xz compressed files are supported. Empty lines
+    are skipped but still counted.
+
+    Parameters
+    ----------
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in binary mode
+    decode : bool
+        If False, the stripped lines are yielded as raw bytes without decoding
+    errors : str
+        Policy for lines that cannot be decoded: "raise" propagates the
+        exception, "skip" leaves the line out and "record" yields a
+        `DecodeError` with the line number as index
+    block_size : int
+        Number of bytes read from the file at once
+
+    Yields
+    ------
+    line_number : int
+        1-based number of the line in the file
+    location : NamedTuple, DecodeError, bytes
+        Location object, error record or raw line
+    """
+    if errors not in DECODE_ERROR_POLICIES:
+        raise ValueError(
+            "errors requires one of %s but %r is given"
+            % (", ".join(DECODE_ERROR_POLICIES), errors)
+        )
+    fileobj = open_reference_file(filename_or_file)
+    try:
+        lines = iter_lines(fileobj, block_size)
+        if not decode:
+            yield from lines
+            return
+        a2b_base64 = binascii.a2b_base64
+        for line_number, line in lines:
+            try:
+                raw = a2b_base64(line)
+                location = _decode_planned(raw, 0, len(raw))
+            except _DECODE_EXCEPTIONS as error:
+                if errors == "raise":
+                    raise
+                if errors == "record":
+                    yield line_number, DecodeError(line_number, line, error)
+                continue
+            yield line_number, location
+    finally:
+        # file objects given by the caller are left open
+        if fileobj is not filename_or_file:
+            fileobj.close()
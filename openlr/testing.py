@@ -0,0 +1,547 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Seeded generator of synthetic locations and references for load testing.
+
+The generated locations follow configurable distributions and always stay
+within the ranges of the binary format, so every location can be encoded.
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import math
+import os
+import random
+import sys
+from collections.abc import Mapping
+from itertools import accumulate
+from typing import NamedTuple
+
+from openlr.binary_format import binary_encode
+from openlr.locations import (
+    FRC,
+    FOW,
+    SideOfRoad,
+    Orientation,
+    Coordinates,
+    LineAttributes,
+    LocationReferencePoint,
+    LineLocationReference,
+    GeoCoordinateLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    PolygonLocationReference,
+    ClosedLineLocationReference,
+)
+from openlr.parallel import _map_chunks
+from openlr.xml_format import xml_encode_to_string
+from openlr.xml_writer import xml_encode_to_file
+
+FORMATS = ("binary", "xml")
+# locations generated from one random generator, whose seed is derived from
+# the seed and the chunk index, so parallel generation gives the same output
+CHUNK_SIZE = 10000
+# largest distance between neighbouring coordinates in degrees, relative
+# coordinates are written as 2 bytes in units of 1e-5 degrees
+MAX_DELTA = 0.3
+# largest distance to the next point that fits into the DNP byte
+MAX_DNP = 14900
+METERS_PER_DEGREE = 111320.0
+
+DEFAULT_TYPE_WEIGHTS = {
+    "LineLocationReference": 60,
+    "GeoCoordinateLocationReference": 4,
+    "PointAlongLineLocationReference": 12,
+    "PoiWithAccessPointLocationReference": 4,
+    "CircleLocationReference": 4,
+    "RectangleLocationReference": 4,
+    "GridLocationReference": 4,
+    "PolygonLocationReference": 4,
+    "ClosedLineLocationReference": 4,
+}
+# weights per FRC0 ... FRC7 and per FOW value, minor roads are most common
+DEFAULT_FRC_WEIGHTS = (2, 3, 5, 8, 12, 18, 24, 28)
+DEFAULT_FOW_WEIGHTS = (1, 6, 12, 55, 4, 2, 5, 15)
+
+
+class GeneratorConfig(NamedTuple):
+    """Distributions of the generated locations
+
+    Integer distributions are given as an inclusive ``(min, max)`` range
+    sampled uniformly or as a mapping of values to weights, e.g.
+    ``{2: 50, 3: 30, 10: 20}``. Configurations read from JSON work the same,
+    with lists for ranges and string keys for mappings.
+
+    Attributes
+    -------
+    type_weights : dict
+        Weights per location type name, `DEFAULT_TYPE_WEIGHTS` if None
+    lrps : tuple or dict
+        Number of location reference points of line locations
+    closed_line_lrps : tuple or dict
+        Number of location reference points of closed line locations
+    polygon_corners : tuple or dict
+        Number of corners of polygon locations
+    frc_weights : tuple
+        Weights of FRC0 to FRC7
+    fow_weights : tuple
+        Weights of the FOW values in the order of `openlr.FOW`
+    dnp : tuple or dict
+        Distance to the next point in meters, at most `MAX_DNP`. Points
+        follow each other at this distance in the direction of the bearing.
+    bearings : tuple or dict
+        Bearing in degrees, 0 to 359
+    offset_probability : float
+        Probability of a non-zero positive or negative offset
+    extent : tuple
+        (min_lon, min_lat, max_lon, max_lat) containing all coordinates
+    radius : tuple or dict
+        Radius of circle locations in meters
+    grid_size : tuple or dict
+        Number of columns and of rows of grid locations
+    rectangle_size : tuple
+        (min, max) width and height of rectangles and grids in degrees
+    """
+
+    type_weights: dict = None
+    lrps: tuple = (2, 10)
+    closed_line_lrps: tuple = (2, 8)
+    polygon_corners: tuple = (3, 20)
+    frc_weights: tuple = DEFAULT_FRC_WEIGHTS
+    fow_weights: tuple = DEFAULT_FOW_WEIGHTS
+    dnp: tuple = (50, 5000)
+    bearings: tuple = (0, 359)
+    offset_probability: float = 0.3
+    extent: tuple = (-179.5, -89.5, 179.5, 89.5)
+    radius: tuple = (10, 100000)
+    grid_size: tuple = (1, 100)
+    rectangle_size: tuple = (0.001, 0.5)
+
+
+def generate_locations(n, seed=0, config=None):
+    """Generates random location objects
+
+    Parameters
+    -------
+    n : int
+        Number of locations
+    seed : int
+        Seed of the generation, equal seeds and configurations give equal
+        locations and the locations of a smaller `n` are a prefix
+    config : GeneratorConfig
+        Distributions of the locations, the defaults if None
+
+    Yields
+    ------
+    location : NamedTuple
+        Location object
+    """
+    generator = _Generator(config or GeneratorConfig())
+    for chunk in range(-(-n // CHUNK_SIZE)):
+        size = min(CHUNK_SIZE, n - chunk * CHUNK_SIZE)
+        yield from generator.locations(_chunk_random(seed, chunk), size)
+
+
+def generate_references(
+    n,
+    seed=0,
+    config=None,
+    format="binary",
+    is_base64=True,
+    is_pretty=False,
+    workers=1,
+):
+    """Generates the encoded references of random locations
+
+    The references are the encodings of the locations of
+    :func:`generate_locations` with the same arguments.
+
+    Parameters
+    -------
+    n : int
+        Number of references
+    seed : int
+        Seed of the generation
+    config : GeneratorConfig
+        Distributions of the locations, the defaults if None
+    format : str
+        "binary" or "xml"
+    is_base64 : bool
+        Boolean flag for base64 encoded binary references
+    is_pretty : bool
+        Boolean flag for pretty printed XML references
+    workers : int
+        Number of processes, None for the number of CPUs. The output does
+        not depend on it.
+
+    Yields
+    ------
+    reference : str, bytes
+        Encoded location reference
+    """
+    if format not in FORMATS:
+        raise ValueError(
+            "format requires one of %s but %r is given" % (FORMATS, format)
+        )
+    config = config or GeneratorConfig()
+    _Generator(config)  # validates the configuration before starting workers
+    sizes = [
+        min(CHUNK_SIZE, n - chunk * CHUNK_SIZE) for chunk in range(-(-n // CHUNK_SIZE))
+    ]
+    return _map_chunks(
+        _generate_chunk,
+        sizes,
+        workers,
+        1,
+        (seed, config, format, is_base64, is_pretty),
+    )
+
+
+def write_references(
+    filename_or_file, n, seed=0, config=None, format="binary", workers=1
+):
+    """Writes the references of random locations to a file
+
+    Binary references are written as one base64 string per line, XML
+    references as one file with an OpenLR element per location, see
+    :func:`openlr.xml_encode_to_file`. File names ending with .gz, .bz2 or
+    .xz are compressed.
+
+    Parameters
+    -------
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in text mode
+    n : int
+        Number of references
+    seed : int
+        Seed of the generation
+    config : GeneratorConfig
+        Distributions of the locations, the defaults if None
+    format : str
+        "binary" or "xml"
+    workers : int
+        Number of processes for binary references, None for the number of
+        CPUs. XML files are written by one process.
+
+    Returns
+    -------
+    count : int
+        Number of written references
+    """
+    if isinstance(filename_or_file, (str, bytes, os.PathLike)):
+        with _open_text(filename_or_file) as f:
+            return write_references(f, n, seed, config, format, workers)
+    if format == "xml":
+        return xml_encode_to_file(
+            generate_locations(n, seed, config), filename_or_file, is_pretty=False
+        )
+    count = 0
+    for reference in generate_references(n, seed, config, format, workers=workers):
+        filename_or_file.write(reference + "\n")
+        count += 1
+    return count
+
+
+def main(argv=None):
+    """Writes the references of random locations, see `write_references`"""
+    parser = argparse.ArgumentParser(
+        prog="python -m openlr generate",
+        description="Generate random OpenLR location references",
+    )
+    parser.add_argument("n", type=int, help="number of references")
+    parser.add_argument(
+        "--output",
+        "-o",
+        default="-",
+        help="output file, compressed for .gz, .bz2 or .xz; '-' writes to stdout",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generation")
+    parser.add_argument("--format", choices=FORMATS, default="binary")
+    parser.add_argument("--config", help="JSON file with the fields of GeneratorConfig")
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="number of processes for binary references",
+    )
+    args = parser.parse_args(argv)
+
+    config = None
+    if args.config:
+        with open(args.config) as f:
+            config = GeneratorConfig(**json.load(f))
+    output = sys.stdout if args.output == "-" else args.output
+    write_references(output, args.n, args.seed, config, args.format, args.workers)
+    return 0
+
+
+def _open_text(filename):
+    name = os.fsdecode(filename)
+    for suffix, opener in ((".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)):
+        if name.endswith(suffix):
+            return opener(filename, "wt", encoding="utf-8")
+    return open(filename, "w", encoding="utf-8")
+
+
+def _chunk_random(seed, chunk):
+    return random.Random("%d:%d" % (seed, chunk))
+
+
+def _generate_chunk(start, sizes, seed, config, format, is_base64, is_pretty):
+    generator = _Generator(config)
+    chunk = start
+    references = []
+    for size in sizes:
+        locations = generator.locations(_chunk_random(seed, chunk), size)
+        if format == "binary":
+            references.extend(binary_encode(loc, is_base64) for loc in locations)
+        else:
+            references.extend(xml_encode_to_string(loc, is_pretty) for loc in locations)
+        chunk += 1
+    return references
+
+
+class _Generator:
+    """location factories of a validated configuration"""
+
+    def __init__(self, config):
+        type_weights = config.type_weights or DEFAULT_TYPE_WEIGHTS
+        unknown = set(type_weights) - set(_FACTORIES)
+        if unknown:
+            raise ValueError("Unknown location types: %s" % ", ".join(sorted(unknown)))
+        self.types = [_FACTORIES[name] for name in type_weights]
+        self.type_cum_weights = _cum_weights(type_weights.values(), "type_weights")
+        self.frc_cum_weights = _cum_weights(config.frc_weights, "frc_weights", 8)
+        self.fow_cum_weights = _cum_weights(config.fow_weights, "fow_weights", 8)
+        self.lrps = _int_distribution(config.lrps, "lrps", 2)
+        self.closed_line_lrps = _int_distribution(
+            config.closed_line_lrps, "closed_line_lrps", 2
+        )
+        self.polygon_corners = _int_distribution(
+            config.polygon_corners, "polygon_corners", 3
+        )
+        self.dnp = _int_distribution(config.dnp, "dnp", 1, MAX_DNP)
+        self.bearings = _int_distribution(config.bearings, "bearings", 0, 359)
+        self.radius = _int_distribution(config.radius, "radius", 0, (1 << 32) - 1)
+        self.grid_size = _int_distribution(config.grid_size, "grid_size", 1, 65535)
+        if not 0 <= config.offset_probability <= 1:
+            raise ValueError(
+                "offset_probability requires 0 <= x <= 1 but %s is given"
+                % config.offset_probability
+            )
+        self.offset_probability = config.offset_probability
+        min_lon, min_lat, max_lon, max_lat = config.extent
+        if not (-180 <= min_lon < max_lon < 180 and -90 <= min_lat < max_lat < 90):
+            raise ValueError("Invalid extent: %s" % (config.extent,))
+        self.extent = (min_lon, min_lat, max_lon, max_lat)
+        min_size, max_size = config.rectangle_size
+        if not 0 < min_size <= max_size < min(max_lon - min_lon, max_lat - min_lat):
+            raise ValueError(
+                "Invalid rectangle_size for the extent: %s" % (config.rectangle_size,)
+            )
+        self.rectangle_size = (min_size, max_size)
+
+    def locations(self, rng, n):
+        """generates n locations with the random generator rng"""
+        choices, types, cum_weights = rng.choices, self.types, self.type_cum_weights
+        return [choices(types, cum_weights=cum_weights)[0](self, rng) for _ in range(n)]
+
+    def coordinates(self, rng):
+        min_lon, min_lat, max_lon, max_lat = self.extent
+        return Coordinates(rng.uniform(min_lon, max_lon), rng.uniform(min_lat, max_lat))
+
+    def near(self, rng, coord, max_delta=0.01):
+        return self.clamp(
+            coord.lon + rng.uniform(-max_delta, max_delta),
+            coord.lat + rng.uniform(-max_delta, max_delta),
+        )
+
+    def clamp(self, lon, lat):
+        min_lon, min_lat, max_lon, max_lat = self.extent
+        return Coordinates(
+            min(max(lon, min_lon), max_lon), min(max(lat, min_lat), max_lat)
+        )
+
+    def points(self, rng, n_points, has_last=True):
+        """points following each other at dnp meters in bearing direction"""
+        frcs = rng.choices(
+            _FRC_VALUES, cum_weights=self.frc_cum_weights, k=2 * n_points
+        )
+        fows = rng.choices(_FOW_VALUES, cum_weights=self.fow_cum_weights, k=n_points)
+        lon, lat = self.coordinates(rng)
+        min_lon, min_lat, max_lon, max_lat = self.extent
+        points = []
+        for i in range(n_points):
+            frc = frcs[2 * i]
+            bear = self.bearings(rng)
+            if has_last and i == n_points - 1:
+                lfrcnp, dnp = FRC.FRC7, 0
+            else:
+                lfrcnp, dnp = max(frc, frcs[2 * i + 1]), self.dnp(rng)
+            points.append(
+                LocationReferencePoint(lon, lat, frc, fows[i], bear, lfrcnp, dnp)
+            )
+            angle = math.radians(bear)
+            d_lat = dnp * math.cos(angle) / METERS_PER_DEGREE
+            d_lon = dnp * math.sin(angle) / METERS_PER_DEGREE
+            d_lon /= max(math.cos(math.radians(lat)), 0.01)
+            d_lat = min(max(d_lat, -MAX_DELTA), MAX_DELTA)
+            d_lon = min(max(d_lon, -MAX_DELTA), MAX_DELTA)
+            # turns back at the border of the extent
+            lon = lon + d_lon if min_lon <= lon + d_lon <= max_lon else lon - d_lon
+            lat = lat + d_lat if min_lat <= lat + d_lat <= max_lat else lat - d_lat
+        return points
+
+    def offset(self, rng):
+        if rng.random() < self.offset_probability:
+            return rng.uniform(0.001, 0.99)
+        return 0.0
+
+    def rectangle_corners(self, rng):
+        min_lon, min_lat, max_lon, max_lat = self.extent
+        width = rng.uniform(*self.rectangle_size)
+        height = rng.uniform(*self.rectangle_size)
+        lon = rng.uniform(min_lon, max_lon - width)
+        lat = rng.uniform(min_lat, max_lat - height)
+        return Coordinates(lon, lat), Coordinates(lon + width, lat + height)
+
+
+def _line(generator, rng):
+    points = generator.points(rng, generator.lrps(rng))
+    return LineLocationReference(points, generator.offset(rng), generator.offset(rng))
+
+
+def _geo_coordinate(generator, rng):
+    return GeoCoordinateLocationReference(generator.coordinates(rng))
+
+
+def _point_along_line(generator, rng):
+    return PointAlongLineLocationReference(
+        generator.points(rng, 2),
+        generator.offset(rng),
+        _ORIENTATION_VALUES[rng.randrange(4)],
+        _SIDE_OF_ROAD_VALUES[rng.randrange(4)],
+    )
+
+
+def _poi(generator, rng):
+    pal = _point_along_line(generator, rng)
+    lon, lat = generator.near(rng, pal.points[0])
+    return PoiWithAccessPointLocationReference(
+        pal.points, pal.poffs, lon, lat, pal.orientation, pal.sideOfRoad
+    )
+
+
+def _circle(generator, rng):
+    return CircleLocationReference(generator.coordinates(rng), generator.radius(rng))
+
+
+def _rectangle(generator, rng):
+    return RectangleLocationReference(*generator.rectangle_corners(rng))
+
+
+def _grid(generator, rng):
+    return GridLocationReference(
+        *generator.rectangle_corners(rng),
+        generator.grid_size(rng),
+        generator.grid_size(rng),
+    )
+
+
+def _polygon(generator, rng):
+    """corners around a center in increasing angles, without crossings"""
+    n_corners = generator.polygon_corners(rng)
+    min_lon, min_lat, max_lon, max_lat = generator.extent
+    max_radius = min(MAX_DELTA / 2, (max_lon - min_lon) / 2, (max_lat - min_lat) / 2)
+    radius = rng.uniform(max_radius / 10, max_radius)
+    center_lon = rng.uniform(min_lon + radius, max_lon - radius)
+    center_lat = rng.uniform(min_lat + radius, max_lat - radius)
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(n_corners))
+    corners = []
+    for angle in angles:
+        r = radius * rng.uniform(0.3, 1.0)
+        corners.append(
+            Coordinates(
+                center_lon + r * math.cos(angle), center_lat + r * math.sin(angle)
+            )
+        )
+    return PolygonLocationReference(corners)
+
+
+def _closed_line(generator, rng):
+    points = generator.points(rng, generator.closed_line_lrps(rng), False)
+    frc = rng.choices(_FRC_VALUES, cum_weights=generator.frc_cum_weights)[0]
+    fow = rng.choices(_FOW_VALUES, cum_weights=generator.fow_cum_weights)[0]
+    return ClosedLineLocationReference(
+        points, LineAttributes(frc, fow, generator.bearings(rng))
+    )
+
+
+def _cum_weights(weights, name, size=None):
+    weights = list(weights)
+    if (size is not None and len(weights) != size) or not weights:
+        raise ValueError("%s requires %s weights" % (name, size or "some"))
+    if min(weights) < 0 or sum(weights) <= 0:
+        raise ValueError("%s requires non-negative weights with a positive sum" % name)
+    return list(accumulate(weights))
+
+
+def _int_distribution(spec, name, minimum, maximum=None):
+    """returns a function sampling an integer of the range or weight mapping"""
+    if isinstance(spec, Mapping):
+        values = [int(value) for value in spec]
+        cum_weights = _cum_weights(spec.values(), name)
+        low, high = min(values), max(values)
+
+        def sample(rng):
+            return rng.choices(values, cum_weights=cum_weights)[0]
+
+    else:
+        low, high = (int(value) for value in spec)
+        span = high - low + 1
+
+        def sample(rng):
+            # faster than randint, one call into the generator
+            return low + int(rng.random() * span)
+
+    if low < minimum or low > high or (maximum is not None and high > maximum):
+        raise ValueError(
+            "%s requires values in [%s, %s] but %r is given"
+            % (name, minimum, maximum if maximum is not None else "inf", spec)
+        )
+    return sample
+
+
+_FACTORIES = {
+    "LineLocationReference": _line,
+    "GeoCoordinateLocationReference": _geo_coordinate,
+    "PointAlongLineLocationReference": _point_along_line,
+    "PoiWithAccessPointLocationReference": _poi,
+    "CircleLocationReference": _circle,
+    "RectangleLocationReference": _rectangle,
+    "GridLocationReference": _grid,
+    "PolygonLocationReference": _polygon,
+    "ClosedLineLocationReference": _closed_line,
+}
+_FRC_VALUES = tuple(FRC)
+_FOW_VALUES = tuple(FOW)
+_ORIENTATION_VALUES = tuple(Orientation)
+_SIDE_OF_ROAD_VALUES = tuple(SideOfRoad)
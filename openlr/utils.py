@@ -11,16 +11,48 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import decimal
+import json
 import math
 
+from openlr.locations import (
+    FRC,
+    FOW,
+    SideOfRoad,
+    Orientation,
+    Coordinates,
+    LineAttributes,
+    LocationReferencePoint,
+    GeoCoordinateLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    LineLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    PolygonLocationReference,
+    ClosedLineLocationReference,
+    FrozenLineLocationReference,
+    FrozenPointAlongLineLocationReference,
+    FrozenPoiWithAccessPointLocationReference,
+    FrozenPolygonLocationReference,
+    FrozenClosedLineLocationReference,
+)
+
 sgn = lambda x: math.copysign(1, x)
 
+# length of a degree of latitude, and of longitude at the equator
+METERS_PER_DEGREE = 111320.0
+
 
 def j_round(float_num):
-    """java like rounding for complying with the OpenLR java: 2.5 -> 3"""
-    num = decimal.Decimal(float_num).to_integral_value(rounding=decimal.ROUND_HALF_UP)
-    return int(num)
+    """java like rounding for complying with the OpenLR java: 2.5 -> 3
+
+    Halves are rounded away from zero. The fractional part is computed
+    exactly, so values just below a half are never rounded up."""
+    num = int(float_num)
+    if abs(float_num - num) >= 0.5:
+        num += 1 if float_num > 0 else -1
+    return num
 
 
 def get_lonlat_list(location):
@@ -40,6 +72,44 @@ def get_lonlat_list(location):
     return lonlat_list
 
 
+def get_bbox(location):
+    """Bounding box of the area covered by a location
+
+    The box holds all coordinates of the location, the whole circle of
+    circle locations and all cells of grid locations, whose rectangle is the
+    lower left cell.
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+
+    Returns
+    -------
+    bbox : tuple of float
+        (min_lon, min_lat, max_lon, max_lat)
+    """
+    if isinstance(location, GridLocationReference):
+        lower_left, upper_right = location.lowerLeft, location.upperRight
+        return (
+            lower_left.lon,
+            lower_left.lat,
+            lower_left.lon + (upper_right.lon - lower_left.lon) * location.n_cols,
+            lower_left.lat + (upper_right.lat - lower_left.lat) * location.n_rows,
+        )
+    if isinstance(location, CircleLocationReference):
+        lon, lat = location.point
+        d_lat = location.radius / METERS_PER_DEGREE
+        d_lon = d_lat / max(math.cos(math.radians(lat)), 0.01)
+        return lon - d_lon, lat - d_lat, lon + d_lon, lat + d_lat
+    lonlat_list = get_lonlat_list(location)
+    if not lonlat_list:
+        raise ValueError("object %r has no coordinates" % (location,))
+    lons = [lon for lon, _ in lonlat_list]
+    lats = [lat for _, lat in lonlat_list]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
 def _namedtuple_to_dict(obj):
     if hasattr(obj, "_fields"):
         dict_obj = {}
@@ -54,6 +124,288 @@ def _namedtuple_to_dict(obj):
 def get_dict(location):
     """Helper to convert location object to dict"""
     return {
-        "type": location.__class__.__name__,
+        "type": _THAWED_TYPES.get(type(location), type(location)).__name__,
         "properties": _namedtuple_to_dict(location),
     }
+
+
+def to_dict(location, enum_names=False):
+    """Converts a location object into plain dicts, lists and numbers
+
+    The result has the structure of :func:`get_dict` and is created by a
+    converter prepared once per location type.
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object, list or frozen based
+    enum_names : bool
+        If True, FRC, FOW, orientation and side of road are given by name,
+        otherwise as int
+
+    Returns
+    -------
+    location_dict : dict
+        Dict with the location type name as "type" and the fields as
+        "properties"
+    """
+    try:
+        encode = _DICT_ENCODERS[enum_names][type(location)]
+    except KeyError:
+        raise ValueError("object %r is not a Location type" % (location,)) from None
+    return encode(location)
+
+
+def from_dict(location_dict):
+    """Creates a location object from the dict of :func:`to_dict` or :func:`get_dict`
+
+    Parameters
+    -------
+    location_dict : dict
+        Dict with the location type name as "type" and the fields as
+        "properties", enum values given by name or as int
+
+    Returns
+    -------
+    location : NamedTuple
+        Location object
+    """
+    try:
+        decode = _DICT_DECODERS[location_dict["type"]]
+    except KeyError:
+        raise ValueError(
+            "%r is not a Location type name" % location_dict.get("type")
+        ) from None
+    return decode(location_dict["properties"])
+
+
+def to_json(location, enum_names=False):
+    """Converts a location object into a compact JSON string of :func:`to_dict`"""
+    return _JSON_ENCODER.encode(to_dict(location, enum_names))
+
+
+def from_json(data):
+    """Creates a location object from a JSON string of :func:`to_json`"""
+    return from_dict(json.loads(data))
+
+
+def freeze(location):
+    """Converts a location object into its immutable and hashable variant
+
+    The lists of points or corners are copied into tuples. Locations without
+    lists (geo-coordinate, circle, rectangle and grid) are immutable already
+    and returned unchanged, as are frozen locations.
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+
+    Returns
+    -------
+    location : NamedTuple
+        Hashable location object, an instance of the original location type
+    """
+    frozen_type = _FROZEN_TYPES.get(type(location))
+    if frozen_type is None:
+        return location
+    return frozen_type._make([tuple(v) if type(v) is list else v for v in location])
+
+
+def thaw(location):
+    """Converts a frozen location object back into the list based type
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object created by :func:`freeze`
+
+    Returns
+    -------
+    location : NamedTuple
+        Location object holding its points or corners in a list, other
+        locations are returned unchanged
+    """
+    thawed_type = _THAWED_TYPES.get(type(location))
+    if thawed_type is None:
+        return location
+    return thawed_type._make([list(v) if type(v) is tuple else v for v in location])
+
+
+_FROZEN_TYPES = {
+    LineLocationReference: FrozenLineLocationReference,
+    PointAlongLineLocationReference: FrozenPointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference: FrozenPoiWithAccessPointLocationReference,
+    PolygonLocationReference: FrozenPolygonLocationReference,
+    ClosedLineLocationReference: FrozenClosedLineLocationReference,
+}
+_THAWED_TYPES = {v: k for k, v in _FROZEN_TYPES.items()}
+
+
+def _enum_encoder(enum_type, enum_names):
+    # members and their int values hash alike, one lookup serves both
+    if enum_names:
+        return {member: member.name for member in enum_type}.__getitem__
+    return {member: member.value for member in enum_type}.__getitem__
+
+
+def _enum_decoder(enum_type):
+    members = {member.name: member for member in enum_type}
+    members.update((member.value, member) for member in enum_type)
+    return members.__getitem__
+
+
+def _points_encoder(enum_names):
+    frc = _enum_encoder(FRC, enum_names)
+    fow = _enum_encoder(FOW, enum_names)
+
+    def encode(points):
+        return [
+            {
+                "lon": lon,
+                "lat": lat,
+                "frc": frc(p_frc),
+                "fow": fow(p_fow),
+                "bear": bear,
+                "lfrcnp": frc(lfrcnp),
+                "dnp": dnp,
+            }
+            for lon, lat, p_frc, p_fow, bear, lfrcnp, dnp in points
+        ]
+
+    return encode
+
+
+def _points_decoder():
+    frc = _enum_decoder(FRC)
+    fow = _enum_decoder(FOW)
+
+    def decode(points):
+        return [
+            LocationReferencePoint(
+                p["lon"],
+                p["lat"],
+                frc(p["frc"]),
+                fow(p["fow"]),
+                p["bear"],
+                frc(p["lfrcnp"]),
+                p["dnp"],
+            )
+            for p in points
+        ]
+
+    return decode
+
+
+def _coordinates_encoder(coordinates):
+    return {"lon": coordinates[0], "lat": coordinates[1]}
+
+
+def _coordinates_decoder(coordinates):
+    return Coordinates(coordinates["lon"], coordinates["lat"])
+
+
+def _line_attributes_encoder(enum_names):
+    frc = _enum_encoder(FRC, enum_names)
+    fow = _enum_encoder(FOW, enum_names)
+
+    def encode(attributes):
+        return {
+            "frc": frc(attributes[0]),
+            "fow": fow(attributes[1]),
+            "bear": attributes[2],
+        }
+
+    return encode
+
+
+def _line_attributes_decoder():
+    frc = _enum_decoder(FRC)
+    fow = _enum_decoder(FOW)
+
+    def decode(attributes):
+        return LineAttributes(
+            frc(attributes["frc"]), fow(attributes["fow"]), attributes["bear"]
+        )
+
+    return decode
+
+
+def _field_codecs(enum_names):
+    """encoders and decoders of the fields holding more than a number"""
+    return {
+        "points": (_points_encoder(enum_names), _points_decoder()),
+        "corners": (
+            lambda corners: [_coordinates_encoder(c) for c in corners],
+            lambda corners: [_coordinates_decoder(c) for c in corners],
+        ),
+        "point": (_coordinates_encoder, _coordinates_decoder),
+        "lowerLeft": (_coordinates_encoder, _coordinates_decoder),
+        "upperRight": (_coordinates_encoder, _coordinates_decoder),
+        "lastLine": (_line_attributes_encoder(enum_names), _line_attributes_decoder()),
+        "orientation": (
+            _enum_encoder(Orientation, enum_names),
+            _enum_decoder(Orientation),
+        ),
+        "sideOfRoad": (
+            _enum_encoder(SideOfRoad, enum_names),
+            _enum_decoder(SideOfRoad),
+        ),
+    }
+
+
+def _dict_encoder(location_type, enum_names):
+    type_name = location_type.__name__
+    fields = location_type._fields
+    codecs = _field_codecs(enum_names)
+    encoders = [codecs[f][0] if f in codecs else None for f in fields]
+
+    def encode(location):
+        return {
+            "type": type_name,
+            "properties": {
+                field: value if encoder is None else encoder(value)
+                for field, encoder, value in zip(fields, encoders, location)
+            },
+        }
+
+    return encode
+
+
+def _dict_decoder(location_type):
+    fields = location_type._fields
+    codecs = _field_codecs(False)
+    decoders = [codecs[f][1] if f in codecs else None for f in fields]
+    make = location_type._make
+
+    def decode(properties):
+        return make(
+            properties[field] if decoder is None else decoder(properties[field])
+            for field, decoder in zip(fields, decoders)
+        )
+
+    return decode
+
+
+_LOCATION_TYPES = (
+    LineLocationReference,
+    GeoCoordinateLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    PolygonLocationReference,
+    ClosedLineLocationReference,
+)
+_DICT_ENCODERS = {
+    enum_names: {
+        location_type: _dict_encoder(
+            _THAWED_TYPES.get(location_type, location_type), enum_names
+        )
+        for location_type in _LOCATION_TYPES + tuple(_THAWED_TYPES)
+    }
+    for enum_names in (False, True)
+}
+_DICT_DECODERS = {t.__name__: _dict_decoder(t) for t in _LOCATION_TYPES}
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
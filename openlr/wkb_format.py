@@ -0,0 +1,353 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+WKB and WKT geometries of location objects and PostgreSQL binary COPY files.
+
+The geometries are those of :func:`openlr.geojson_encode_geometry`: line
+strings for lines, points for the point locations and polygons for the area
+locations.
+"""
+
+import os
+import struct
+from itertools import chain
+from operator import itemgetter
+
+from openlr.geojson_format import (
+    CIRCLE_VERTICES,
+    geojson_encode_geometry,
+    _along,
+)
+from openlr.locations import (
+    LineLocationReference,
+    GeoCoordinateLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    PolygonLocationReference,
+    ClosedLineLocationReference,
+)
+from openlr.utils import get_bbox
+
+WGS84_SRID = 4326
+
+_POINT, _LINE_STRING, _POLYGON = 1, 2, 3
+_EWKB_SRID_FLAG = 0x20000000
+# struct of a whole geometry by (geometry type, number of positions, is EWKB),
+# bounded as the sizes of lines and polygons vary
+_STRUCTS = {}
+_MAX_STRUCTS = 1024
+_lon_lat = itemgetter(0, 1)
+
+_PGCOPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_PGCOPY_HEADER = _PGCOPY_SIGNATURE + struct.pack(">ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack(">h", -1)
+_PGCOPY_TUPLE = struct.Struct(">hi")
+_PGCOPY_FIELD = struct.Struct(">i")
+_PGCOPY_BATCH_SIZE = 1024
+
+
+def wkb_encode(location, srid=None, circle_vertices=CIRCLE_VERTICES):
+    """Encodes the geometry of a location object into little endian WKB
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+    srid : int
+        If given, extended WKB (EWKB) of PostGIS with this spatial reference
+        system identifier, otherwise ISO WKB
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+
+    Returns
+    -------
+    wkb : bytes
+        Point, LineString or Polygon geometry, an empty polygon for a
+        polygon location without corners
+    """
+    type_name, geometry = _wkb_writer(location)
+    geometry_type, n, values = geometry(location, circle_vertices)
+    key = (geometry_type, n, srid is not None)
+    packer = _STRUCTS.get(key)
+    if packer is None:
+        packer = _geometry_struct(*key)
+        if len(_STRUCTS) < _MAX_STRUCTS:
+            _STRUCTS[key] = packer
+    # a polygon has a single ring, none if it has no positions
+    counts = (
+        ()
+        if geometry_type == _POINT
+        else (n,) if geometry_type == _LINE_STRING or not n else (1, n)
+    )
+    if srid is None:
+        return packer.pack(1, geometry_type, *counts, *values)
+    return packer.pack(1, geometry_type | _EWKB_SRID_FLAG, srid, *counts, *values)
+
+
+def wkt_encode(location, circle_vertices=CIRCLE_VERTICES):
+    """Encodes the geometry of a location object into WKT
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+
+    Returns
+    -------
+    wkt : str
+        POINT, LINESTRING or POLYGON geometry with the shortest decimal
+        representation of the coordinates, POLYGON EMPTY for a polygon
+        location without corners
+    """
+    geometry = geojson_encode_geometry(location, circle_vertices)
+    geometry_type = geometry["type"]
+    coordinates = geometry["coordinates"]
+    if geometry_type == "Point":
+        return "POINT (%s)" % _format_positions([coordinates])
+    if geometry_type == "LineString":
+        if not coordinates:
+            return "LINESTRING EMPTY"
+        return "LINESTRING (%s)" % _format_positions(coordinates)
+    rings = [ring for ring in coordinates if ring]
+    if not rings:
+        return "POLYGON EMPTY"
+    return "POLYGON (%s)" % ", ".join(
+        "(%s)" % _format_positions(ring) for ring in rings
+    )
+
+
+def wkb_encode_many(locations, srid=None, circle_vertices=CIRCLE_VERTICES):
+    """Encodes the geometries of many location objects into WKB
+
+    Parameters
+    -------
+    locations : iterable of NamedTuple
+        Location objects
+    srid : int
+        If given, extended WKB (EWKB) with this spatial reference system
+        identifier, otherwise ISO WKB
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+
+    Returns
+    -------
+    wkbs : list of bytes
+        Geometries in input order
+    """
+    return [wkb_encode(location, srid, circle_vertices) for location in locations]
+
+
+def wkt_encode_many(locations, circle_vertices=CIRCLE_VERTICES):
+    """Encodes the geometries of many location objects into WKT
+
+    Parameters
+    -------
+    locations : iterable of NamedTuple
+        Location objects
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+
+    Returns
+    -------
+    wkts : list of str
+        Geometries in input order
+    """
+    return [wkt_encode(location, circle_vertices) for location in locations]
+
+
+def write_pgcopy(
+    locations, filename_or_file, srid=WGS84_SRID, circle_vertices=CIRCLE_VERTICES
+):
+    """Writes location objects as a PostgreSQL binary COPY file
+
+    Every row has two columns, the location type name as text and the
+    geometry as EWKB, and can be loaded into PostGIS with::
+
+        COPY locations (type, geom) FROM STDIN (FORMAT binary)
+
+    where `type` is a text and `geom` a geometry column. The rows are
+    written in batches as they come, so the memory usage does not depend
+    on the number of locations.
+
+    Parameters
+    -------
+    locations : iterable of NamedTuple
+        Location objects
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in binary mode, file objects are
+        left open
+    srid : int
+        Spatial reference system identifier of the geometries
+    circle_vertices : int
+        Number of distinct vertices of the polygon approximating a circle
+
+    Returns
+    -------
+    count : int
+        Number of written rows
+    """
+    is_filename = isinstance(filename_or_file, (str, bytes, os.PathLike))
+    fileobj = open(filename_or_file, "wb") if is_filename else filename_or_file
+    count = 0
+    try:
+        batch = [_PGCOPY_HEADER]
+        for location in locations:
+            type_name = _wkb_writer(location)[0].encode()
+            wkb = wkb_encode(location, srid, circle_vertices)
+            batch.append(_PGCOPY_TUPLE.pack(2, len(type_name)))
+            batch.append(type_name)
+            batch.append(_PGCOPY_FIELD.pack(len(wkb)))
+            batch.append(wkb)
+            count += 1
+            if len(batch) >= 4 * _PGCOPY_BATCH_SIZE:
+                fileobj.write(b"".join(batch))
+                batch = []
+        batch.append(_PGCOPY_TRAILER)
+        fileobj.write(b"".join(batch))
+    finally:
+        if is_filename:
+            fileobj.close()
+    return count
+
+
+def _geometry_struct(geometry_type, n, is_ewkb):
+    header = "<BII" if is_ewkb else "<BI"
+    if geometry_type == _POINT:
+        counts = ""
+    elif geometry_type == _LINE_STRING or not n:
+        counts = "I"
+    else:
+        counts = "II"
+    return struct.Struct("%s%s%dd" % (header, counts, 2 * n))
+
+
+# every geometry writer returns the geometry type, the number of positions
+# and an iterable of their longitudes and latitudes
+
+
+def _line_wkb(location, circle_vertices):
+    points = location.points
+    return _LINE_STRING, len(points), chain.from_iterable(map(_lon_lat, points))
+
+
+def _geo_coordinate_wkb(location, circle_vertices):
+    return _POINT, 1, location.point
+
+
+def _point_along_line_wkb(location, circle_vertices):
+    return _POINT, 1, _along(location)
+
+
+def _poi_wkb(location, circle_vertices):
+    return _POINT, 1, (location.lon, location.lat)
+
+
+def _box_wkb(min_lon, min_lat, max_lon, max_lat):
+    return (
+        _POLYGON,
+        5,
+        (
+            min_lon,
+            min_lat,
+            max_lon,
+            min_lat,
+            max_lon,
+            max_lat,
+            min_lon,
+            max_lat,
+            min_lon,
+            min_lat,
+        ),
+    )
+
+
+def _circle_wkb(location, circle_vertices):
+    ring = geojson_encode_geometry(location, circle_vertices)["coordinates"][0]
+    return _POLYGON, len(ring), chain.from_iterable(ring)
+
+
+def _rectangle_wkb(location, circle_vertices):
+    lower_left, upper_right = location.lowerLeft, location.upperRight
+    return _box_wkb(lower_left.lon, lower_left.lat, upper_right.lon, upper_right.lat)
+
+
+def _grid_wkb(location, circle_vertices):
+    return _box_wkb(*get_bbox(location))
+
+
+def _polygon_wkb(location, circle_vertices):
+    corners = location.corners
+    if not corners:
+        return _POLYGON, 0, ()
+    return (
+        _POLYGON,
+        len(corners) + 1,
+        chain(chain.from_iterable(corners), corners[0]),
+    )
+
+
+def _closed_line_wkb(location, circle_vertices):
+    points = location.points
+    if not points:
+        return _POLYGON, 0, ()
+    return (
+        _POLYGON,
+        len(points) + 1,
+        chain(chain.from_iterable(map(_lon_lat, points)), _lon_lat(points[0])),
+    )
+
+
+# location type, type name and geometry writer
+_WKB_WRITERS = (
+    (LineLocationReference, "LineLocationReference", _line_wkb),
+    (
+        GeoCoordinateLocationReference,
+        "GeoCoordinateLocationReference",
+        _geo_coordinate_wkb,
+    ),
+    (
+        PointAlongLineLocationReference,
+        "PointAlongLineLocationReference",
+        _point_along_line_wkb,
+    ),
+    (
+        PoiWithAccessPointLocationReference,
+        "PoiWithAccessPointLocationReference",
+        _poi_wkb,
+    ),
+    (CircleLocationReference, "CircleLocationReference", _circle_wkb),
+    (RectangleLocationReference, "RectangleLocationReference", _rectangle_wkb),
+    (GridLocationReference, "GridLocationReference", _grid_wkb),
+    (PolygonLocationReference, "PolygonLocationReference", _polygon_wkb),
+    (ClosedLineLocationReference, "ClosedLineLocationReference", _closed_line_wkb),
+)
+
+
+def _wkb_writer(location):
+    for location_type, type_name, geometry in _WKB_WRITERS:
+        if isinstance(location, location_type):
+            return type_name, geometry
+    raise ValueError("object %r is not a Location type" % (location,))
+
+
+def _format_positions(positions):
+    # float also for NumPy scalars, whose repr names their type
+    return ", ".join(
+        "%s %s" % (repr(float(lon)), repr(float(lat))) for lon, lat in positions
+    )
@@ -12,6 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from xml.dom import minidom
+from xml.etree import ElementTree
+from xml.parsers.expat import ExpatError
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover
+    lxml_etree = None
 
 from openlr.locations import (
     FRC,
@@ -32,9 +39,45 @@ from openlr.locations import (
     PolygonLocationReference,
     ClosedLineLocationReference,
 )
-from openlr.utils import j_round
+from openlr.binary_format import DecodeError, DECODE_ERROR_POLICIES
+from openlr.xml_writer import xml_encode_fast, _offsets
 
 NAMESPACE_URI = "http://www.openlr.org/openlr"
+XML_BACKENDS = ("etree", "lxml")
+# exceptions raised on malformed or incomplete documents by the decoders,
+# malformed XML raises XMLParseError, a subclass of SyntaxError
+_XML_DECODE_EXCEPTIONS = (
+    ValueError,
+    KeyError,
+    IndexError,
+    ZeroDivisionError,
+    SyntaxError,
+)
+
+
+class XMLParseError(ExpatError, SyntaxError):
+    """Malformed XML given to the XML decoders
+
+    Raised the same for both XML backends, in place of the parse error of
+    ElementTree or lxml. It is an `xml.parsers.expat.ExpatError`, as raised
+    by the minidom based decoders of earlier versions, and a `SyntaxError`
+    like the parse errors of ElementTree and lxml.
+
+    Attributes
+    -------
+    code : int
+        Error code of the parser, None if unknown
+    lineno : int
+        1-based line number of the error
+    offset : int
+        Column of the error
+    position : tuple
+        (lineno, offset)
+    """
+
+    __str__ = Exception.__str__
+
+
 # hierarchy = {
 #     "XMLLocationReference": {
 #         "LineLocationReference": LineLocation,
@@ -54,33 +97,160 @@ NAMESPACE_URI = "http://www.openlr.org/openlr"
 # }
 
 
+def set_xml_backend(name=None):
+    """Selects the XML parser used by the decoders
+
+    By default lxml is used when it is installed and the ElementTree module
+    of the standard library otherwise. Both give the same locations.
+
+    Parameters
+    -------
+    name : str
+        "etree", "lxml" or None for the default
+
+    Returns
+    -------
+    previous : str
+        Name of the previously selected backend
+    """
+    global _backend
+    if name is None:
+        name = "lxml" if lxml_etree is not None else "etree"
+    if name not in XML_BACKENDS:
+        raise ValueError(
+            "backend requires one of %s but %r is given"
+            % (", ".join(XML_BACKENDS), name)
+        )
+    if name == "lxml" and lxml_etree is None:
+        raise ImportError("the lxml XML backend requires lxml")
+    previous = _backend.name if _backend is not None else None
+    _backend = _LxmlBackend() if name == "lxml" else _ElementTreeBackend()
+    return previous
+
+
 def xml_decode_file(filename_or_file):
-    """Decodes an OpenLR XML from a filename or file object"""
-    doc = minidom.parse(filename_or_file)
-    return xml_decode_document(doc)
+    """Decodes an OpenLR XML from a filename or file object
+
+    Malformed XML raises `XMLParseError`.
+    """
+    return xml_decode_element(_backend.parse(filename_or_file))
 
 
 def xml_decode_string(string):
-    """Decodes an OpenLR XML from string"""
-    doc = minidom.parseString(string)
-    return xml_decode_document(doc)
+    """Decodes an OpenLR XML from string
+
+    Malformed XML raises `XMLParseError`.
+    """
+    return xml_decode_element(_backend.fromstring(string))
 
 
 def xml_decode_document(doc):
-    """Decodes OpenLR xml minidom Document into a location"""
-    el_loc = _get_first_el(_get_first_el(doc, "OpenLR"), "XMLLocationReference")
+    """Decodes OpenLR xml minidom Document or OpenLR Element into a location
+
+    The OpenLR element is copied into an ElementTree element in one pass and
+    decoded by :func:`xml_decode_element`, which is also used for elements
+    of the ElementTree or lxml APIs.
+    """
+    if hasattr(doc, "tag") or hasattr(doc, "getroot"):
+        return xml_decode_element(doc)
+    if getattr(doc, "localName", None) != "OpenLR":
+        res = doc.getElementsByTagNameNS("*", "OpenLR")
+        if not res:
+            raise ValueError("Tag not found: %r in %r" % ("OpenLR", doc))
+        doc = res[0]
+    return xml_decode_element(_minidom_to_element(doc))
+
+
+def xml_decode_stream(filename_or_file, errors="raise"):
+    """Iterates over the locations of an XML file with many OpenLR elements
+
+    The file is parsed incrementally with the iterparse of the XML backend
+    and every OpenLR element is decoded as soon as it is complete and then discarded,
+    so the memory usage does not grow with the file size. The OpenLR elements
+    may be the root or appear anywhere in an enclosing document.
+
+    Parameters
+    ----------
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in binary mode
+    errors : str
+        Policy for OpenLR elements that cannot be decoded: "raise", "skip" or
+        "record", which yields a `DecodeError` holding the serialized element.
+        Malformed XML always raises `XMLParseError`.
+
+    Yields
+    ------
+    location : NamedTuple
+        Location object (or `DecodeError` record), equal to the result of
+        :func:`xml_decode_document` for the element
+    """
+    if errors not in DECODE_ERROR_POLICIES:
+        raise ValueError(
+            "errors requires one of %s but %r is given"
+            % (", ".join(DECODE_ERROR_POLICIES), errors)
+        )
+    parents = []
+    index = 0
+    for event, el in _backend.iterparse(filename_or_file, ("start", "end")):
+        if event == "start":
+            parents.append(el)
+            continue
+        parents.pop()
+        if _local_name(el.tag) != "OpenLR":
+            continue
+        try:
+            location = xml_decode_element(el)
+        except _XML_DECODE_EXCEPTIONS as error:
+            if errors == "raise":
+                raise
+            if errors == "record":
+                yield DecodeError(index, _backend.tostring(el), error)
+        else:
+            yield location
+        index += 1
+        el.clear()
+        if parents:
+            parents[-1].remove(el)
+
+
+def xml_decode_element(el):
+    """Decodes an ElementTree OpenLR element into a location
+
+    The element is decoded in a single walk over its descendants, so the
+    time grows linearly with the number of location reference points. `el`
+    may also be an element or tree containing an OpenLR element, lxml
+    elements are decoded the same way.
+
+    Parameters
+    ----------
+    el : xml.etree.ElementTree.Element, lxml.etree._Element
+        OpenLR element
+
+    Returns
+    -------
+    location : NamedTuple
+        Location object, equal to the result of :func:`xml_decode_document`
+    """
+    if hasattr(el, "getroot"):
+        el = el.getroot()
+    if not isinstance(el.tag, str) or _local_name(el.tag) != "OpenLR":
+        el = _find(el, "OpenLR")
+    el_loc = _find(el, "XMLLocationReference")
 
     for loc_tag, el_child_loc in _iter_children(el_loc):
         if loc_tag == "LineLocationReference":
-            return _parse_line(el_child_loc)
+            return _parse_line(_index(el_child_loc))
         elif loc_tag == "PointLocationReference":
             for point_tag, el_point_loc in _iter_children(el_child_loc):
+                index = _index(el_point_loc)
                 if point_tag == "GeoCoordinate":
-                    return _parse_geo_coordinate(el_point_loc)
+                    return GeoCoordinateLocationReference(
+                        _parse_coordinate(_first(index, "Coordinates"))
+                    )
                 elif point_tag == "PointAlongLine":
-                    return _parse_point_along_line(el_point_loc)
+                    return _parse_point_along_line(index)
                 elif point_tag == "PoiWithAccessPoint":
-                    return _parse_poi(el_point_loc)
+                    return _parse_poi(el_point_loc, index)
                 else:
                     raise ValueError(
                         "Not a known point location: %r in %r"
@@ -88,16 +258,26 @@ def xml_decode_document(doc):
                     )
         elif loc_tag == "AreaLocationReference":
             for area_tag, el_area_loc in _iter_children(el_child_loc):
+                index = _index(el_area_loc)
                 if area_tag == "CircleLocationReference":
-                    return _parse_circle(el_area_loc)
+                    return CircleLocationReference(
+                        _parse_coordinate(_first(index, "Coordinates")),
+                        int(_value(index, "Radius")),
+                    )
                 elif area_tag == "RectangleLocationReference":
-                    return _parse_rectangle(el_area_loc)
+                    return RectangleLocationReference(*_parse_corners(index))
                 elif area_tag == "GridLocationReference":
-                    return _parse_grid(el_area_loc)
+                    return GridLocationReference(
+                        *_parse_corners(index),
+                        int(_value(index, "NumColumns")),
+                        int(_value(index, "NumRows")),
+                    )
                 elif area_tag == "PolygonLocationReference":
-                    return _parse_polygon(el_area_loc)
+                    return PolygonLocationReference(
+                        [_parse_coordinate(e) for e in index.get("Coordinates", ())]
+                    )
                 elif area_tag == "ClosedLineLocationReference":
-                    return _parse_closed_line(el_area_loc)
+                    return _parse_closed_line(index)
                 else:
                     raise ValueError(
                         "Not a known area location: %r in %r" % (area_tag, el_child_loc)
@@ -106,9 +286,13 @@ def xml_decode_document(doc):
 
 
 def xml_encode_to_string(location, is_pretty=True):
-    """Encodes location object into an OpenLR XML string"""
-    doc = xml_encode_to_document(location)
-    return doc.toprettyxml(indent="  ") if is_pretty else doc.toxml()
+    """Encodes location object into an OpenLR XML string
+
+    The string is written directly, without building the minidom document of
+    `xml_encode_to_document`, but is the same as its serialization with
+    ``toprettyxml(indent="  ")`` or ``toxml()``.
+    """
+    return xml_encode_fast(location, is_pretty)
 
 
 def xml_encode_to_document(location):
@@ -181,78 +365,199 @@ def xml_encode_to_document(location):
     return doc
 
 
+class _ElementTreeBackend:
+    """XML parsing with the ElementTree module of the standard library"""
+
+    name = "etree"
+
+    def parse(self, source):
+        try:
+            return ElementTree.parse(source).getroot()
+        except ElementTree.ParseError as error:
+            raise _parse_error(error) from error
+
+    def fromstring(self, string):
+        try:
+            return ElementTree.fromstring(string)
+        except ElementTree.ParseError as error:
+            raise _parse_error(error) from error
+
+    def iterparse(self, source, events):
+        return _iterparse(ElementTree.iterparse(source, events), ElementTree.ParseError)
+
+    def tostring(self, el):
+        return ElementTree.tostring(el)
+
+
+class _LxmlBackend:
+    """XML parsing with lxml, without resolving entities or network access"""
+
+    name = "lxml"
+
+    def __init__(self):
+        self._parser = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+
+    def parse(self, source):
+        try:
+            return lxml_etree.parse(source, self._parser).getroot()
+        except lxml_etree.XMLSyntaxError as error:
+            raise _parse_error(error) from error
+
+    def fromstring(self, string):
+        if isinstance(string, str):
+            string = string.encode("utf-8")
+        try:
+            return lxml_etree.fromstring(string, self._parser)
+        except lxml_etree.XMLSyntaxError as error:
+            raise _parse_error(error) from error
+
+    def iterparse(self, source, events):
+        iterator = lxml_etree.iterparse(
+            source, events=events, resolve_entities=False, no_network=True
+        )
+        return _iterparse(iterator, lxml_etree.XMLSyntaxError)
+
+    def tostring(self, el):
+        return lxml_etree.tostring(el)
+
+
+def _parse_error(error):
+    """the XMLParseError of a parse error of ElementTree or lxml"""
+    position = getattr(error, "position", None) or (error.lineno, error.offset)
+    parse_error = XMLParseError(str(error))
+    parse_error.code = getattr(error, "code", None)
+    parse_error.lineno, parse_error.offset = position
+    parse_error.position = tuple(position)
+    return parse_error
+
+
+def _iterparse(iterator, parse_exception):
+    try:
+        yield from iterator
+    except parse_exception as error:
+        raise _parse_error(error) from error
+
+
+_backend = None
+set_xml_backend()
+
+
+def _minidom_to_element(node):
+    """copies a minidom element into an ElementTree element with local names"""
+    el = ElementTree.Element(node.tagName.split(":")[-1])
+    text = []
+    for child in node.childNodes:
+        if child.nodeType == child.ELEMENT_NODE:
+            el.append(_minidom_to_element(child))
+        elif not len(el) and child.nodeType in (
+            child.TEXT_NODE,
+            child.CDATA_SECTION_NODE,
+        ):
+            text.append(child.data)
+    if text:
+        el.text = "".join(text)
+    return el
+
+
+def _local_name(tag):
+    return tag.rpartition("}")[2]
+
+
+def _find(el, tag):
+    """returns the first descendant of el with the local name tag"""
+    for child in el.iter():
+        if (
+            child is not el
+            and isinstance(child.tag, str)
+            and _local_name(child.tag) == tag
+        ):
+            return child
+    raise ValueError("Tag not found: %r" % tag)
+
+
+def _index(el):
+    """maps the local tag names to the descendants of el in document order"""
+    index = {}
+    for child in el.iter():
+        if child is not el and isinstance(child.tag, str):
+            name = child.tag.rpartition("}")[2]
+            if name in index:
+                index[name].append(child)
+            else:
+                index[name] = [child]
+    return index
+
+
 def _iter_children(el):
-    for child in el.childNodes:
-        if not isinstance(child, minidom.Element) or not child.childNodes:
-            continue
-        tag = child.tagName.split(":")[-1]
-        yield tag, child
+    for child in el:
+        if isinstance(child.tag, str) and (len(child) or child.text):
+            yield _local_name(child.tag), child
 
 
-def _get_first_el(el, tag):
-    res = el.getElementsByTagNameNS("*", tag)
+def _first(index, tag):
+    res = index.get(tag)
     if res:
         return res[0]
-    else:
-        raise ValueError("Tag not found: %r in %r" % (tag, el))
+    raise ValueError("Tag not found: %r" % tag)
 
 
-def _get_el_value(el, tag, default=None):
-    res = el.getElementsByTagNameNS("*", tag)
+def _value(index, tag, default=None):
+    res = index.get(tag)
     if res:
-        return res[0].firstChild.data
+        if res[0].text is None:
+            raise ValueError("Tag without value: %r" % tag)
+        return res[0].text
     if default is None:
-        raise ValueError("Tag not found: %r in %r" % (tag, el))
+        raise ValueError("Tag not found: %r" % tag)
     return default
 
 
 def _parse_point(el):
-    lon = float(_get_el_value(el, "Longitude"))
-    lat = float(_get_el_value(el, "Latitude"))
-    frc = FRC[_get_el_value(el, "FRC")]
-    fow = FOW[_get_el_value(el, "FOW")]
-    bear = int(_get_el_value(el, "BEAR"))
-    lfrcnp = FRC[_get_el_value(el, "LFRCNP", "FRC7")]
-    dnp = int(_get_el_value(el, "DNP", 0))
-    return LocationReferencePoint(lon, lat, frc, fow, bear, lfrcnp, dnp)
+    index = _index(el)
+    return LocationReferencePoint(
+        float(_value(index, "Longitude")),
+        float(_value(index, "Latitude")),
+        FRC[_value(index, "FRC")],
+        FOW[_value(index, "FOW")],
+        int(_value(index, "BEAR")),
+        FRC[_value(index, "LFRCNP", "FRC7")],
+        int(_value(index, "DNP", 0)),
+    )
 
 
 def _parse_coordinate(el):
-    lon = float(_get_el_value(el, "Longitude"))
-    lat = float(_get_el_value(el, "Latitude"))
-    return Coordinates(lon, lat)
+    index = _index(el)
+    return Coordinates(
+        float(_value(index, "Longitude")), float(_value(index, "Latitude"))
+    )
 
 
-def _parse_line(el):
-    point_elements = el.getElementsByTagNameNS("*", "LocationReferencePoint")
-    point_elements += el.getElementsByTagNameNS("*", "LastLocationReferencePoint")
-    points = [_parse_point(e) for e in point_elements]
-    poffs = float(_get_el_value(el, "PosOff", 0)) / points[0].dnp
-    noffs = float(_get_el_value(el, "NegOff", 0)) / points[-2].dnp
-    return LineLocationReference(points, poffs, noffs)
+def _parse_points(index):
+    point_elements = index.get("LocationReferencePoint", [])
+    point_elements = point_elements + index.get("LastLocationReferencePoint", [])
+    return [_parse_point(e) for e in point_elements]
 
 
-def _parse_geo_coordinate(el):
-    point = _parse_coordinate(_get_first_el(el, "Coordinates"))
-    return GeoCoordinateLocationReference(point)
+def _parse_line(index):
+    points = _parse_points(index)
+    poffs = float(_value(index, "PosOff", 0)) / points[0].dnp
+    noffs = float(_value(index, "NegOff", 0)) / points[-2].dnp
+    return LineLocationReference(points, poffs, noffs)
 
 
-def _parse_point_along_line(el):
-    point_elements = el.getElementsByTagNameNS("*", "LocationReferencePoint")
-    point_elements += el.getElementsByTagNameNS("*", "LastLocationReferencePoint")
-    points = [_parse_point(e) for e in point_elements]
-    poffs = float(_get_el_value(el, "PosOff", 0)) / points[0].dnp
-    orientation = Orientation[_get_el_value(el, "Orientation")]
-    sideOfRoad = SideOfRoad[_get_el_value(el, "SideOfRoad")]
+def _parse_point_along_line(index):
+    points = _parse_points(index)
+    poffs = float(_value(index, "PosOff", 0)) / points[0].dnp
+    orientation = Orientation[_value(index, "Orientation")]
+    sideOfRoad = SideOfRoad[_value(index, "SideOfRoad")]
     return PointAlongLineLocationReference(points, poffs, orientation, sideOfRoad)
 
 
-def _parse_poi(el):
-    pal = _parse_point_along_line(el)
+def _parse_poi(el, index):
+    pal = _parse_point_along_line(index)
     for child_tag, el_child in _iter_children(el):
         if child_tag == "Coordinates":
-            lon = float(_get_el_value(el_child, "Longitude"))
-            lat = float(_get_el_value(el_child, "Latitude"))
+            lon, lat = _parse_coordinate(el_child)
             break
     else:
         raise ValueError("no Coordinates element found for PoiWithAccessPoint")
@@ -261,38 +566,18 @@ def _parse_poi(el):
     )
 
 
-def _parse_circle(el):
-    point = _parse_coordinate(_get_first_el(el, "Coordinates"))
-    radius = int(_get_el_value(el, "Radius"))
-    return CircleLocationReference(point, radius)
-
-
-def _parse_rectangle(el):
-    lowerLeft = _parse_coordinate(_get_first_el(el, "LowerLeft"))
-    upperRight = _parse_coordinate(_get_first_el(el, "UpperRight"))
-    return RectangleLocationReference(lowerLeft, upperRight)
-
+def _parse_corners(index):
+    lowerLeft = _parse_coordinate(_first(index, "LowerLeft"))
+    upperRight = _parse_coordinate(_first(index, "UpperRight"))
+    return lowerLeft, upperRight
 
-def _parse_grid(el):
-    rectangle = _parse_rectangle(el)
-    cols = int(_get_el_value(el, "NumColumns"))
-    rows = int(_get_el_value(el, "NumRows"))
-    return GridLocationReference(rectangle.lowerLeft, rectangle.upperRight, cols, rows)
 
-
-def _parse_polygon(el):
-    corner_elements = el.getElementsByTagNameNS("*", "Coordinates")
-    corners = [_parse_coordinate(e) for e in corner_elements]
-    return PolygonLocationReference(corners)
-
-
-def _parse_closed_line(el):
-    point_elements = el.getElementsByTagNameNS("*", "LocationReferencePoint")
-    points = [_parse_point(e) for e in point_elements]
-    el_last_line = _get_first_el(el, "LastLine")
-    frc = FRC[_get_el_value(el_last_line, "FRC")]
-    fow = FOW[_get_el_value(el_last_line, "FOW")]
-    bear = int(_get_el_value(el_last_line, "BEAR"))
+def _parse_closed_line(index):
+    points = [_parse_point(e) for e in index.get("LocationReferencePoint", ())]
+    last_line = _index(_first(index, "LastLine"))
+    frc = FRC[_value(last_line, "FRC")]
+    fow = FOW[_value(last_line, "FOW")]
+    bear = int(_value(last_line, "BEAR"))
     return ClosedLineLocationReference(points, LineAttributes(frc, fow, bear))
 
 
@@ -336,17 +621,7 @@ def _create_last_point_el(doc, point):
 
 
 def _create_offset_el(doc, el_loc):
-
-    if el_loc.poffs > 0:
-        poffs = j_round(float(el_loc.points[0].dnp) * el_loc.poffs)
-    else:
-        poffs = 0
-
-    if hasattr(el_loc, "noffs") and el_loc.noffs > 0:
-        noffs = j_round(float(el_loc.points[-2].dnp) * el_loc.noffs)
-    else:
-        noffs = 0
-
+    poffs, noffs = _offsets(el_loc)
     el_offset = doc.createElement("Offsets")
     el_offset.appendChild(_create_data_el(doc, "PosOff", poffs))
     el_offset.appendChild(_create_data_el(doc, "NegOff", noffs))
@@ -0,0 +1,373 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+OpenLR XML writer emitting text directly, without building a minidom DOM.
+
+The output is the same as serializing the document of
+:func:`openlr.xml_encode_to_document` with minidom.
+"""
+
+import os
+
+from openlr.locations import (
+    LineLocationReference,
+    GeoCoordinateLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    CircleLocationReference,
+    RectangleLocationReference,
+    GridLocationReference,
+    PolygonLocationReference,
+    ClosedLineLocationReference,
+)
+from openlr.utils import j_round
+
+NAMESPACE_URI = "http://www.openlr.org/openlr"
+XML_DECLARATION = '<?xml version="1.0" ?>'
+DEFAULT_ROOT_TAG = "OpenLRs"
+
+
+def xml_encode_fast(location, is_pretty=True):
+    """Encodes a location object into an OpenLR XML string without minidom
+
+    Parameters
+    -------
+    location : NamedTuple
+        Location object
+    is_pretty : bool
+        Boolean flag for pretty printed output with two space indentation
+
+    Returns
+    -------
+    xml : str
+        The same string as the minidom serialization of
+        :func:`openlr.xml_encode_to_document`
+    """
+    fmt = _PRETTY if is_pretty else _COMPACT
+    out = [XML_DECLARATION, fmt.newline]
+    _write_document(out, fmt, 0, location)
+    return "".join(out)
+
+
+def xml_encode_to_file(locations, filename_or_file, is_pretty=True, root_tag=None):
+    """Writes many location objects into one OpenLR XML file
+
+    Parameters
+    -------
+    locations : iterable of NamedTuple
+        Location objects
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in text mode
+    is_pretty : bool
+        Boolean flag for pretty printed output
+    root_tag : str
+        Tag of the element containing the OpenLR elements, "OpenLRs" by default
+
+    Returns
+    -------
+    count : int
+        Number of written locations
+    """
+    with XMLWriter(filename_or_file, is_pretty, root_tag) as writer:
+        for location in locations:
+            writer.write(location)
+    return writer.count
+
+
+class XMLWriter:
+    """Streams location objects as OpenLR elements into an XML file
+
+    The file holds an XML declaration and a root element containing one
+    OpenLR element per location, which is written as soon as it is given.
+    Each OpenLR element is formatted like :func:`openlr.xml_encode_to_string`,
+    indented by one more level when pretty printed.
+
+    Parameters
+    -------
+    filename_or_file : str, os.PathLike, file object
+        File name or a file object opened in text mode, file objects are
+        left open
+    is_pretty : bool
+        Boolean flag for pretty printed output
+    root_tag : str
+        Tag of the element containing the OpenLR elements, "OpenLRs" by default
+    """
+
+    def __init__(self, filename_or_file, is_pretty=True, root_tag=None):
+        self.root_tag = root_tag or DEFAULT_ROOT_TAG
+        self.count = 0
+        self._fmt = _PRETTY if is_pretty else _COMPACT
+        self._is_filename = isinstance(filename_or_file, (str, bytes, os.PathLike))
+        if self._is_filename:
+            self._file = open(filename_or_file, "w", encoding="utf-8")
+        else:
+            self._file = filename_or_file
+        self._file.write(
+            "%s%s<%s>%s"
+            % (XML_DECLARATION, self._fmt.newline, self.root_tag, self._fmt.newline)
+        )
+
+    def write(self, location):
+        """Writes the OpenLR element of a location object"""
+        out = []
+        _write_document(out, self._fmt, 1, location)
+        self._file.write("".join(out))
+        self.count += 1
+
+    def close(self):
+        """Closes the root element and the file if opened by the writer"""
+        if self._file is None:
+            return
+        self._file.write("</%s>%s" % (self.root_tag, self._fmt.newline))
+        if self._is_filename:
+            self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _Format:
+    """indentation strings per depth and the newline of an output format"""
+
+    def __init__(self, indent, newline, max_depth=16):
+        self.indents = [indent * depth for depth in range(max_depth)]
+        self.newline = newline
+
+
+_PRETTY = _Format("  ", "\n")
+_COMPACT = _Format("", "")
+
+
+def _escape(text):
+    # the same replacements as minidom
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
+
+def _offsets(location):
+    """positive and negative offsets in meters as written to OpenLR XML"""
+    if location.poffs > 0:
+        poffs = j_round(float(location.points[0].dnp) * location.poffs)
+    else:
+        poffs = 0
+
+    if hasattr(location, "noffs") and location.noffs > 0:
+        noffs = j_round(float(location.points[-2].dnp) * location.noffs)
+    else:
+        noffs = 0
+    return poffs, noffs
+
+
+def _data(out, fmt, depth, tag, data):
+    out.append(
+        "%s<%s>%s</%s>%s"
+        % (fmt.indents[depth], tag, _escape(str(data)), tag, fmt.newline)
+    )
+
+
+def _open(out, fmt, depth, tag):
+    out.append("%s<%s>%s" % (fmt.indents[depth], tag, fmt.newline))
+
+
+def _close(out, fmt, depth, tag):
+    out.append("%s</%s>%s" % (fmt.indents[depth], tag, fmt.newline))
+
+
+def _write_coordinates(out, fmt, depth, coord, tag="Coordinates"):
+    _open(out, fmt, depth, tag)
+    _data(out, fmt, depth + 1, "Longitude", coord.lon)
+    _data(out, fmt, depth + 1, "Latitude", coord.lat)
+    _close(out, fmt, depth, tag)
+
+
+def _write_line_attributes(out, fmt, depth, attributes, tag="LineAttributes"):
+    _open(out, fmt, depth, tag)
+    _data(out, fmt, depth + 1, "FRC", attributes.frc.name)
+    _data(out, fmt, depth + 1, "FOW", attributes.fow.name)
+    _data(out, fmt, depth + 1, "BEAR", attributes.bear)
+    _close(out, fmt, depth, tag)
+
+
+def _write_point(out, fmt, depth, point):
+    _open(out, fmt, depth, "LocationReferencePoint")
+    _write_coordinates(out, fmt, depth + 1, point)
+    _write_line_attributes(out, fmt, depth + 1, point)
+    _open(out, fmt, depth + 1, "PathAttributes")
+    _data(out, fmt, depth + 2, "LFRCNP", point.lfrcnp.name)
+    _data(out, fmt, depth + 2, "DNP", point.dnp)
+    _close(out, fmt, depth + 1, "PathAttributes")
+    _close(out, fmt, depth, "LocationReferencePoint")
+
+
+def _write_last_point(out, fmt, depth, point):
+    _open(out, fmt, depth, "LastLocationReferencePoint")
+    _write_coordinates(out, fmt, depth + 1, point)
+    _write_line_attributes(out, fmt, depth + 1, point)
+    _close(out, fmt, depth, "LastLocationReferencePoint")
+
+
+def _write_offsets(out, fmt, depth, location):
+    poffs, noffs = _offsets(location)
+    _open(out, fmt, depth, "Offsets")
+    _data(out, fmt, depth + 1, "PosOff", poffs)
+    _data(out, fmt, depth + 1, "NegOff", noffs)
+    _close(out, fmt, depth, "Offsets")
+
+
+def _write_line(out, fmt, depth, location):
+    for point in location.points[0:-1]:
+        _write_point(out, fmt, depth, point)
+    _write_last_point(out, fmt, depth, location.points[-1])
+    _write_offsets(out, fmt, depth, location)
+
+
+def _write_geo_coordinate(out, fmt, depth, location):
+    _write_coordinates(out, fmt, depth, location.point)
+
+
+def _write_point_along_line(out, fmt, depth, location):
+    _write_point(out, fmt, depth, location.points[0])
+    _write_last_point(out, fmt, depth, location.points[-1])
+    _write_offsets(out, fmt, depth, location)
+    _data(out, fmt, depth, "SideOfRoad", location.sideOfRoad.name)
+    _data(out, fmt, depth, "Orientation", location.orientation.name)
+
+
+def _write_poi(out, fmt, depth, location):
+    _write_point_along_line(out, fmt, depth, location)
+    _write_coordinates(out, fmt, depth, location)
+
+
+def _write_circle(out, fmt, depth, location):
+    _open(out, fmt, depth, "GeoCoordinate")
+    _write_coordinates(out, fmt, depth + 1, location.point)
+    _close(out, fmt, depth, "GeoCoordinate")
+    _data(out, fmt, depth, "Radius", location.radius)
+
+
+def _write_rectangle(out, fmt, depth, location):
+    _write_coordinates(out, fmt, depth, location.lowerLeft, "LowerLeft")
+    _write_coordinates(out, fmt, depth, location.upperRight, "UpperRight")
+
+
+def _write_grid(out, fmt, depth, location):
+    _open(out, fmt, depth, "Rectangle")
+    _write_rectangle(out, fmt, depth + 1, location)
+    _close(out, fmt, depth, "Rectangle")
+    _data(out, fmt, depth, "NumColumns", location.n_cols)
+    _data(out, fmt, depth, "NumRows", location.n_rows)
+
+
+def _write_polygon(out, fmt, depth, location):
+    if not location.corners:
+        out.append("%s<PolygonCorners/>%s" % (fmt.indents[depth], fmt.newline))
+        return
+    _open(out, fmt, depth, "PolygonCorners")
+    for corner in location.corners:
+        _write_coordinates(out, fmt, depth + 1, corner)
+    _close(out, fmt, depth, "PolygonCorners")
+
+
+def _write_closed_line(out, fmt, depth, location):
+    for point in location.points:
+        _write_point(out, fmt, depth, point)
+    _write_line_attributes(out, fmt, depth, location.lastLine, "LastLine")
+
+
+# location type, reference type element, location element and writer in the
+# order of the type checks of xml_encode_to_document
+_LOCATION_WRITERS = (
+    (LineLocationReference, "LineLocationReference", None, _write_line),
+    (
+        GeoCoordinateLocationReference,
+        "PointLocationReference",
+        "GeoCoordinate",
+        _write_geo_coordinate,
+    ),
+    (
+        PointAlongLineLocationReference,
+        "PointLocationReference",
+        "PointAlongLine",
+        _write_point_along_line,
+    ),
+    (
+        PoiWithAccessPointLocationReference,
+        "PointLocationReference",
+        "PoiWithAccessPoint",
+        _write_poi,
+    ),
+    (
+        CircleLocationReference,
+        "AreaLocationReference",
+        "CircleLocationReference",
+        _write_circle,
+    ),
+    (
+        RectangleLocationReference,
+        "AreaLocationReference",
+        "RectangleLocationReference",
+        _write_rectangle,
+    ),
+    (
+        GridLocationReference,
+        "AreaLocationReference",
+        "GridLocationReference",
+        _write_grid,
+    ),
+    (
+        PolygonLocationReference,
+        "AreaLocationReference",
+        "PolygonLocationReference",
+        _write_polygon,
+    ),
+    (
+        ClosedLineLocationReference,
+        "AreaLocationReference",
+        "ClosedLineLocationReference",
+        _write_closed_line,
+    ),
+)
+
+
+def _write_document(out, fmt, depth, location):
+    for location_type, reference_tag, location_tag, write in _LOCATION_WRITERS:
+        if isinstance(location, location_type):
+            break
+    else:
+        raise ValueError("object %r is not a Location type" % (location,))
+
+    out.append(
+        '%s<OpenLR xmlns="%s">%s'
+        % (fmt.indents[depth], _escape(NAMESPACE_URI), fmt.newline)
+    )
+    _data(out, fmt, depth + 1, "LocationID", "")
+    _open(out, fmt, depth + 1, "XMLLocationReference")
+    _open(out, fmt, depth + 2, reference_tag)
+    if location_tag is None:
+        write(out, fmt, depth + 3, location)
+    else:
+        _open(out, fmt, depth + 3, location_tag)
+        write(out, fmt, depth + 4, location)
+        _close(out, fmt, depth + 3, location_tag)
+    _close(out, fmt, depth + 2, reference_tag)
+    _close(out, fmt, depth + 1, "XMLLocationReference")
+    _close(out, fmt, depth, "OpenLR")
@@ -39,4 +39,9 @@ setup(
     ],
     packages=["openlr"],
     install_requires=[],
+    extras_require={
+        "numpy": ["numpy"],
+        "lxml": ["lxml"],
+        "arrow": ["numpy", "pyarrow"],
+    },
 )
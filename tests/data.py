@@ -11,6 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import random
+
 from openlr.locations import (
     FRC,
     FOW,
@@ -107,3 +109,105 @@ LineAttributes(FRC.FRC2,FOW.SINGLE_CARRIAGEWAY,242))),
 )
 
 # fmt: on
+
+
+def random_locations(n, seed=0):
+    """random but encodable locations of all types"""
+    rng = random.Random(seed)
+
+    def coordinates(max_delta=None, prev=None):
+        if prev is None:
+            return Coordinates(rng.uniform(-179, 179), rng.uniform(-89, 89))
+        return Coordinates(
+            prev.lon + rng.uniform(0, max_delta), prev.lat + rng.uniform(0, max_delta)
+        )
+
+    def point(lon, lat, last=False):
+        return LocationReferencePoint(
+            lon,
+            lat,
+            FRC(rng.randrange(8)),
+            FOW(rng.randrange(8)),
+            rng.randrange(360),
+            FRC.FRC7 if last else FRC(rng.randrange(8)),
+            0 if last else rng.randrange(30, 14900),
+        )
+
+    def points(n_points, last=True):
+        lon, lat = coordinates()
+        result = []
+        for i in range(n_points):
+            result.append(point(lon, lat, last and i == n_points - 1))
+            lon += rng.uniform(-0.3, 0.3)
+            lat += rng.uniform(-0.3, 0.3)
+        return result
+
+    def offset():
+        return rng.choice([0, rng.uniform(0.001, 0.99)])
+
+    def line():
+        return LineLocationReference(points(rng.randint(2, 12)), offset(), offset())
+
+    def geo_coordinate():
+        return GeoCoordinateLocationReference(coordinates())
+
+    def point_along_line():
+        return PointAlongLineLocationReference(
+            points(2),
+            offset(),
+            Orientation(rng.randrange(4)),
+            SideOfRoad(rng.randrange(4)),
+        )
+
+    def poi():
+        pal = point_along_line()
+        lon = pal.points[0].lon + rng.uniform(-0.3, 0.3)
+        lat = pal.points[0].lat + rng.uniform(-0.3, 0.3)
+        return PoiWithAccessPointLocationReference(
+            pal.points, pal.poffs, lon, lat, pal.orientation, pal.sideOfRoad
+        )
+
+    def circle():
+        radius = rng.choice([0, rng.randrange(1 << rng.choice([8, 16, 24, 32]))])
+        return CircleLocationReference(coordinates(), radius)
+
+    def rectangle():
+        lowerLeft = coordinates()
+        return RectangleLocationReference(
+            lowerLeft, coordinates(rng.choice([0.3, 0.9]), lowerLeft)
+        )
+
+    def grid():
+        lowerLeft, upperRight = rectangle()
+        n_cols, n_rows = rng.randrange(1 << 16), rng.randrange(1 << 16)
+        return GridLocationReference(lowerLeft, upperRight, n_cols, n_rows)
+
+    def polygon():
+        corners = [coordinates()]
+        for _ in range(rng.randint(2, 10)):
+            corners.append(
+                Coordinates(
+                    corners[-1].lon + rng.uniform(-0.3, 0.3),
+                    corners[-1].lat + rng.uniform(-0.3, 0.3),
+                )
+            )
+        return PolygonLocationReference(corners)
+
+    def closed_line():
+        lastLine = LineAttributes(
+            FRC(rng.randrange(8)), FOW(rng.randrange(8)), rng.randrange(360)
+        )
+        return ClosedLineLocationReference(points(rng.randint(2, 8), False), lastLine)
+
+    factories = (
+        line,
+        geo_coordinate,
+        point_along_line,
+        poi,
+        circle,
+        rectangle,
+        grid,
+        polygon,
+        closed_line,
+    )
+    return [rng.choice(factories)() for _ in range(n)]
@@ -0,0 +1,143 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import base64
+import socket
+import struct
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from openlr import binary_decode, DecodeError
+from openlr.aio import aiter_references
+
+from .data import LOCATIONS
+
+REFERENCES = [data for _, data, _ in LOCATIONS]
+MALFORMED = "ewGkNSK5Wg=="
+
+
+def framed(references):
+    raw = [base64.b64decode(data) for data in references]
+    return b"".join(struct.pack(">H", len(data)) + data for data in raw)
+
+
+async def collect(iterator):
+    return [location async for location in iterator]
+
+
+class TestAio(unittest.IsolatedAsyncioTestCase):
+    __name__ = "testing the asyncio decoder of reference feeds"
+
+    async def asyncSetUp(self):
+        self.sender, receiver = socket.socketpair()
+        self.reader, self.writer = await asyncio.open_connection(sock=receiver)
+        self.addAsyncCleanup(self.close)
+
+    async def close(self):
+        self.sender.close()
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def send(self, data, piece_size=7):
+        """writes the data in small pieces, splitting the frames"""
+        loop = asyncio.get_running_loop()
+        self.sender.setblocking(False)
+        for i in range(0, len(data), piece_size):
+            await loop.sock_sendall(self.sender, data[i : i + piece_size])
+            await asyncio.sleep(0)
+        self.sender.shutdown(socket.SHUT_WR)
+
+    async def decode(self, data, **kwargs):
+        sending = asyncio.ensure_future(self.send(data))
+        try:
+            return await collect(aiter_references(self.reader, **kwargs))
+        finally:
+            await sending
+
+    async def test_line_framing(self):
+        data = ("\r\n".join(REFERENCES) + "\n\n").encode()
+        results = await self.decode(data, batch_size=3)
+        self.assertEqual(results, [binary_decode(item) for item in REFERENCES])
+
+    async def test_length_framing(self):
+        results = await self.decode(framed(REFERENCES), framing="length")
+        self.assertEqual(results, [binary_decode(item) for item in REFERENCES])
+
+    async def test_error_records_count_frames(self):
+        references = REFERENCES * 3
+        references[4] = references[20] = MALFORMED
+        results = await self.decode(
+            "\n".join(references).encode(), errors="record", batch_size=2
+        )
+        errors = [r for r in results if isinstance(r, DecodeError)]
+        self.assertEqual([e.index for e in errors], [4, 20])
+        self.assertEqual(len(results), len(references))
+
+    async def test_raise_policy(self):
+        with self.assertRaises(ValueError):
+            await self.decode(("\n".join([MALFORMED] + REFERENCES)).encode())
+
+    async def test_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            results = await self.decode(
+                framed(REFERENCES * 10), framing="length", executor=executor
+            )
+        self.assertEqual(results, [binary_decode(item) for item in REFERENCES * 10])
+
+    async def test_truncated_record(self):
+        data = framed(REFERENCES)
+        with self.assertRaises(ValueError):
+            await self.decode(data[:-3], framing="length", errors="skip")
+
+    async def test_bounded_queue_stops_reading(self):
+        reader = asyncio.StreamReader()
+        reader.feed_data(("\n".join(REFERENCES * 100) + "\n").encode())
+        reader.feed_eof()
+        iterator = aiter_references(reader, batch_size=1, max_pending=2, read_size=64)
+        await iterator.__anext__()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        self.assertFalse(reader.at_eof())
+        results = await collect(iterator)
+        self.assertEqual(len(results), len(REFERENCES) * 100 - 1)
+        self.assertTrue(reader.at_eof())
+
+    async def test_record_limit(self):
+        reader = asyncio.StreamReader()
+        # a stream that never sends a newline nor ends
+        reader.feed_data(b"A" * 100000)
+        with self.assertRaisesRegex(ValueError, "limit of 1000 bytes"):
+            await collect(aiter_references(reader, limit=1000, read_size=64))
+        # a complete line over the limit in a single read
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"A" * 1500 + b"\n" + REFERENCES[0].encode() + b"\n")
+        reader.feed_eof()
+        with self.assertRaisesRegex(ValueError, "limit of 1000 bytes"):
+            await collect(aiter_references(reader, limit=1000, read_size=4096))
+        longest = max(REFERENCES, key=len)
+        data = framed(REFERENCES)
+        size = len(base64.b64decode(longest))
+        results = await self.decode(data, framing="length", limit=size)
+        self.assertEqual(len(results), len(REFERENCES))
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        with self.assertRaisesRegex(ValueError, "limit"):
+            await collect(aiter_references(reader, framing="length", limit=size - 1))
+        with self.assertRaises(ValueError):
+            await collect(aiter_references(self.reader, limit=0))
+
+    async def test_invalid_framing(self):
+        with self.assertRaises(ValueError):
+            await collect(aiter_references(self.reader, framing="json"))
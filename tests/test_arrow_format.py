@@ -0,0 +1,105 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import unittest
+
+from openlr import binary_decode, binary_encode, to_dict
+from openlr.arrow_format import (
+    arrow_schema,
+    binary_decode_arrow,
+    binary_encode_arrow,
+    iter_parquet,
+    write_parquet,
+    pa,
+    pq,
+)
+from openlr.binary_format import LocationTypeCode
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS, random_locations
+
+# the nine location types in the order of LocationTypeCode
+TYPE_NAMES = (
+    "LineLocationReference",
+    "GeoCoordinateLocationReference",
+    "PointAlongLineLocationReference",
+    "PoiWithAccessPointLocationReference",
+    "CircleLocationReference",
+    "RectangleLocationReference",
+    "GridLocationReference",
+    "PolygonLocationReference",
+    "ClosedLineLocation",
+)
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestArrowFormat(OpenlrBaseTestCase):
+    __name__ = "testing Arrow tables and Parquet files"
+
+    def test_rows_match_locations(self):
+        references = [data for _, data, _ in LOCATIONS]
+        table = binary_decode_arrow(references)
+        self.assertEqual(table.schema, arrow_schema())
+        self.assertEqual(table.num_rows, len(references))
+        for row, reference in zip(table.to_pylist(), references):
+            location_dict = to_dict(binary_decode(reference))
+            code = row.pop("location_type")
+            self.assertEqual(TYPE_NAMES[code], location_dict["type"])
+            properties = location_dict["properties"]
+            for name, value in row.items():
+                if name in properties:
+                    self.assertEqual(value, properties[name], name)
+                elif name == "point" and "lon" in properties:
+                    # the coordinates of POIs
+                    self.assertEqual(value, {k: properties[k] for k in ("lon", "lat")})
+                else:
+                    self.assertIsNone(value, name)
+
+    def test_round_trip(self):
+        references = [binary_encode(location) for location in random_locations(2000)]
+        table = binary_decode_arrow(references)
+        self.assertEqual(binary_encode_arrow(table), references)
+        raws = [binary_encode(binary_decode(r), is_base64=False) for r in references]
+        self.assertEqual(binary_decode_arrow(raws, is_base64=False), table)
+        self.assertEqual(binary_encode_arrow(table, is_base64=False), raws)
+        batch = table.slice(100, 300).to_batches()[0]
+        self.assertEqual(binary_encode_arrow(batch), references[100:400])
+
+    def test_partial_columns(self):
+        lines = [
+            binary_encode(location)
+            for location in random_locations(200)
+            if type(location).__name__ == "LineLocationReference"
+        ]
+        table = binary_decode_arrow(lines).select(
+            ["location_type", "points", "poffs", "noffs"]
+        )
+        self.assertEqual(binary_encode_arrow(table), lines)
+
+    def test_parquet(self):
+        references = [binary_encode(location) for location in random_locations(1000)]
+        output = io.BytesIO()
+        self.assertEqual(write_parquet(references, output, row_group_size=300), 1000)
+        output.seek(0)
+        self.assertEqual(pq.ParquetFile(output).metadata.num_row_groups, 4)
+        output.seek(0)
+        self.assertEqual(list(iter_parquet(output, batch_size=128)), references)
+        self.assertRaises(ValueError, write_parquet, references, io.BytesIO(), True, 0)
+
+    def test_errors(self):
+        self.assertRaisesRegex(ValueError, "index 1", binary_decode_arrow, ["CwRb", ""])
+        table = binary_decode_arrow([LOCATIONS[0][1]])
+        codes = pa.array([LocationTypeCode.GeoCoordinateLocation], pa.uint8())
+        table = table.set_column(0, "location_type", codes)
+        self.assertRaisesRegex(ValueError, "no point", binary_encode_arrow, table)
@@ -0,0 +1,106 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from openlr import (
+    binary_decode,
+    binary_encode,
+    locations,
+    xml_decode_string,
+    xml_encode_to_string,
+)
+from openlr.__main__ import main as cli_main
+from openlr.benchmark import build_cases, compare, main, run
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+
+
+class TestBenchmark(OpenlrBaseTestCase):
+    __name__ = "testing the benchmark suite"
+
+    def test_cases_cover_all_location_types(self):
+        cases = build_cases(5)
+        location_types = {
+            name
+            for name in dir(locations)
+            if name.endswith("LocationReference") and not name.startswith("Frozen")
+        }
+        self.assertEqual({case.location_type for case in cases}, location_types)
+        self.assertEqual(
+            [c.size for c in cases if c.location_type == "PolygonLocationReference"],
+            [3, 10, 30, 100],
+        )
+        for case in cases:
+            self.assertEqual(len(case.locations), 5)
+            for location in case.locations:
+                if case.size:
+                    items = getattr(location, "points", None) or location.corners
+                    self.assertEqual(len(items), case.size, case.name)
+                decoded = binary_decode(binary_encode(location))
+                self.assertEqual(type(decoded).__name__, type(location).__name__)
+                self.assertEqual(
+                    xml_decode_string(xml_encode_to_string(location)).__class__,
+                    location.__class__,
+                )
+        self.assertEqual(build_cases(5, seed=3), build_cases(5, seed=3))
+
+    def test_run(self):
+        cases = build_cases(3)
+        results = run(cases, repeat=2, pattern="/lrps=20")
+        self.assertEqual(
+            {r["name"] for r in results},
+            {
+                "%s/%s/%s/lrps=20" % (f, o, t)
+                for f in ("binary", "xml")
+                for o in ("encode", "decode")
+                for t in ("LineLocationReference", "ClosedLineLocationReference")
+            },
+        )
+        for result in results:
+            self.assertEqual(result["n"], 6)
+            self.assertGreater(result["ops_per_sec"], 0)
+            latency = result["latency_us"]
+            self.assertLessEqual(latency["p50"], latency["p90"])
+            self.assertLessEqual(latency["p90"], latency["p99"])
+            self.assertGreater(result["alloc_peak_bytes"], 0)
+        results = run(cases, ("xml",), ("decode",), 1, False)
+        self.assertEqual(len(results), len(cases))
+        self.assertIsNone(results[0]["alloc_peak_bytes"])
+
+    def test_main_report(self):
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "bench.json")
+            args = ["-n", "2", "-r", "1", "--format", "binary", "-k", "Circle"]
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(cli_main(["bench", "-o", filename] + args), 0)
+                with open(filename) as f:
+                    report = json.load(f)
+                self.assertEqual(
+                    [r["name"] for r in report["results"]],
+                    [
+                        "binary/encode/CircleLocationReference",
+                        "binary/decode/CircleLocationReference",
+                    ],
+                )
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        main(args + ["--compare", filename])
+                self.assertIn("x\n", stderr.getvalue())
+        ratios = compare(report, report)
+        self.assertEqual(set(ratios.values()), {1.0})
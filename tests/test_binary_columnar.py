@@ -0,0 +1,236 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import base64
+import math
+import unittest
+
+from openlr import (
+    binary_decode,
+    binary_encode,
+    FRC,
+    FOW,
+    Orientation,
+    SideOfRoad,
+    LocationReferencePoint,
+    LineLocationReference,
+    PointAlongLineLocationReference,
+    PoiWithAccessPointLocationReference,
+    ClosedLineLocationReference,
+    LineAttributes,
+)
+from openlr.binary_format import (
+    binary_decode_columnar,
+    binary_encode_columnar,
+    ColumnarLocations,
+    LocationTypeCode,
+    np,
+)
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS, random_locations
+
+LRP_TYPES = {
+    LineLocationReference: LocationTypeCode.LineLocation,
+    PointAlongLineLocationReference: LocationTypeCode.PointAlongLineLocation,
+    PoiWithAccessPointLocationReference: LocationTypeCode.PoiWithAccessPointLocation,
+    ClosedLineLocationReference: LocationTypeCode.ClosedLineLocation,
+}
+
+
+def random_lrp_locations(n, seed=0):
+    """random line, point along line, POI and closed line locations"""
+    return [loc for loc in random_locations(n, seed) if type(loc) in LRP_TYPES]
+
+
+def to_columns(locations):
+    """builds the struct of arrays layout from location objects"""
+    columns = {name: [] for name in ColumnarLocations._fields}
+    columns["offsets"].append(0)
+    for location in locations:
+        columns["location_type"].append(LRP_TYPES[type(location)])
+        columns["offsets"].append(columns["offsets"][-1] + len(location.points))
+        columns["poffs"].append(location.poffs if hasattr(location, "poffs") else 0)
+        columns["noffs"].append(location.noffs if hasattr(location, "noffs") else 0)
+        columns["orientation"].append(getattr(location, "orientation", 0))
+        columns["sideOfRoad"].append(getattr(location, "sideOfRoad", 0))
+        columns["poi_lon"].append(getattr(location, "lon", math.nan))
+        columns["poi_lat"].append(getattr(location, "lat", math.nan))
+        lastLine = getattr(location, "lastLine", LineAttributes(0, 0, 0))
+        columns["last_frc"].append(lastLine.frc)
+        columns["last_fow"].append(lastLine.fow)
+        columns["last_bear"].append(lastLine.bear)
+        for point in location.points:
+            for name in LocationReferencePoint._fields:
+                columns[name].append(getattr(point, name))
+    return ColumnarLocations(**{k: np.array(v) for k, v in columns.items()})
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBinaryColumnar(OpenlrBaseTestCase):
+    __name__ = "testing columnar binary decoding into numpy arrays"
+
+    def assert_columns_match(self, columns, data):
+        self.assertEqual(len(columns.location_type), len(data))
+        for i, item in enumerate(data):
+            expected = binary_decode(item)
+            start, end = columns.offsets[i], columns.offsets[i + 1]
+            self.assertEqual(columns.location_type[i], LRP_TYPES[type(expected)])
+            self.assertEqual(end - start, len(expected.points))
+            for j, point in enumerate(expected.points):
+                k = start + j
+                # decoding is exact, not just within the format's accuracy
+                self.assertEqual(columns.lon[k], point.lon)
+                self.assertEqual(columns.lat[k], point.lat)
+                self.assertEqual(columns.frc[k], point.frc)
+                self.assertEqual(columns.fow[k], point.fow)
+                self.assertEqual(columns.bear[k], point.bear)
+                self.assertEqual(columns.lfrcnp[k], point.lfrcnp)
+                self.assertEqual(columns.dnp[k], point.dnp)
+            self.assertEqual(columns.poffs[i], getattr(expected, "poffs", 0))
+            self.assertEqual(columns.noffs[i], getattr(expected, "noffs", 0))
+            self.assertEqual(
+                columns.orientation[i], getattr(expected, "orientation", 0)
+            )
+            self.assertEqual(columns.sideOfRoad[i], getattr(expected, "sideOfRoad", 0))
+            if hasattr(expected, "lon"):
+                self.assertEqual(columns.poi_lon[i], expected.lon)
+                self.assertEqual(columns.poi_lat[i], expected.lat)
+            else:
+                self.assertTrue(math.isnan(columns.poi_lon[i]))
+            if hasattr(expected, "lastLine"):
+                self.assertEqual(columns.last_frc[i], expected.lastLine.frc)
+                self.assertEqual(columns.last_fow[i], expected.lastLine.fow)
+                self.assertEqual(columns.last_bear[i], expected.lastLine.bear)
+
+    def test_decoding_columnar_examples(self):
+        data = [data for _, data, loc in LOCATIONS if type(loc) in LRP_TYPES]
+        self.assert_columns_match(binary_decode_columnar(data), data)
+
+    def test_decoding_columnar_random_locations(self):
+        data = [binary_encode(loc) for loc in random_lrp_locations(500)]
+        self.assert_columns_match(binary_decode_columnar(data), data)
+        raw = [binary_encode(loc, is_base64=False) for loc in random_lrp_locations(50)]
+        columns = binary_decode_columnar(raw, is_base64=False)
+        self.assert_columns_match(
+            columns, [binary_encode(loc) for loc in random_lrp_locations(50)]
+        )
+
+    def test_decoding_columnar_empty(self):
+        columns = binary_decode_columnar([])
+        self.assertEqual(len(columns.location_type), 0)
+        self.assertEqual(list(columns.offsets), [0])
+        self.assertEqual(len(columns.lon), 0)
+
+    def test_decoding_columnar_errors(self):
+        self.assertRaisesRegex(
+            ValueError,
+            "index 1 is not a location reference point",
+            binary_decode_columnar,
+            [LOCATIONS[0][1], "AwOgxCUNmwEs"],
+        )
+        self.assertRaisesRegex(
+            NotImplementedError,
+            "detected version 1",
+            binary_decode_columnar,
+            ["CQcm6yX4vTPGFwM7AskzCw=="],
+        )
+
+    def test_decoding_columnar_truncated(self):
+        references = [
+            base64.b64decode(data)
+            for _, data, location in LOCATIONS
+            if type(location) in LRP_TYPES
+        ]
+        for raw in references:
+            for size in range(1, len(raw)):
+                data = [references[0], raw[:size]]
+                try:
+                    binary_decode_columnar(data, is_base64=False)
+                except ValueError as error:
+                    self.assertIn("index 1", str(error))
+
+    def test_encoding_columnar_is_byte_identical(self):
+        locations = [loc for _, _, loc in LOCATIONS if type(loc) in LRP_TYPES]
+        locations += random_lrp_locations(1000, seed=1)
+        expected = [binary_encode(loc) for loc in locations]
+        columns = to_columns(locations)
+        self.assertEqual(binary_encode_columnar(columns), expected)
+        data, offsets = binary_encode_columnar(columns, is_base64=False)
+        self.assertEqual(len(offsets), len(locations) + 1)
+        for i, location in enumerate(locations):
+            self.assertEqual(
+                data[offsets[i] : offsets[i + 1]],
+                binary_encode(location, is_base64=False),
+            )
+
+    def test_encoding_columnar_round_trip(self):
+        data = [binary_encode(loc) for loc in random_lrp_locations(300, seed=2)]
+        columns = binary_decode_columnar(data)
+        self.assertEqual(binary_encode_columnar(columns), data)
+
+    def test_encoding_columnar_lines_only(self):
+        locations = [LOCATIONS[0][2], LOCATIONS[1][2]]
+        columns = to_columns(locations)
+        lines_only = ColumnarLocations(
+            **{
+                name: (
+                    getattr(columns, name)
+                    if name
+                    in LocationReferencePoint._fields + ("offsets", "poffs", "noffs")
+                    else None
+                )
+                for name in ColumnarLocations._fields
+            }
+        )
+        self.assertEqual(
+            binary_encode_columnar(lines_only),
+            [binary_encode(loc) for loc in locations],
+        )
+
+    def test_encoding_columnar_errors(self):
+        columns = to_columns([LOCATIONS[0][2], LOCATIONS[1][2]])
+        columns.bear[3] = 360
+        self.assertRaisesRegex(
+            ValueError,
+            "Bearing angle .* at location 1",
+            binary_encode_columnar,
+            columns,
+        )
+        columns = to_columns([LOCATIONS[0][2], LOCATIONS[1][2]])
+        columns.lon[1] += 0.5
+        self.assertRaisesRegex(
+            ValueError, "relative coordinate", binary_encode_columnar, columns
+        )
+        columns = to_columns([LOCATIONS[0][2]])
+        columns.poffs[0] = 1
+        self.assertRaisesRegex(ValueError, "offset", binary_encode_columnar, columns)
+        columns = to_columns([LOCATIONS[0][2]])
+        columns.location_type[0] = LocationTypeCode.CircleLocation
+        self.assertRaisesRegex(
+            ValueError, "index 0 is not a valid", binary_encode_columnar, columns
+        )
+        # a line needs its first and last point, a closed line only the first
+        line = LineLocationReference(LOCATIONS[0][2].points[:1], 0.0, 0.0)
+        columns = to_columns([LOCATIONS[0][2], line])
+        self.assertRaisesRegex(
+            ValueError, "index 1 is not a valid", binary_encode_columnar, columns
+        )
+        closed_line = ClosedLineLocationReference(
+            LOCATIONS[0][2].points[:1],
+            LineAttributes(FRC.FRC2, FOW.SINGLE_CARRIAGEWAY, 90),
+        )
+        self.assertEqual(
+            binary_encode_columnar(to_columns([closed_line])),
+            [binary_encode(closed_line)],
+        )
@@ -11,10 +11,41 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from openlr import binary_decode, binary_encode
+import array
+import base64
+import mmap
+import random
+import struct
+
+from openlr import (
+    binary_decode,
+    binary_decode_many,
+    binary_decode_from,
+    binary_decode_framed,
+    binary_decode_filtered,
+    binary_decode_lazy,
+    binary_encode,
+    get_lonlat_list,
+    DecodeError,
+    FilterCounts,
+)
+from openlr.binary_format import _decode, LocationTypeCode, LocationTypes
+from openlr.openlr_bytes_io import OpenLRBytesIO
 
 from .openlr_base_test_case import OpenlrBaseTestCase
-from .data import LOCATIONS
+from .data import LOCATIONS, random_locations
+
+
+def decode_reference(data):
+    """decodes raw binary data with the OpenLRBytesIO reader"""
+    return _decode(OpenLRBytesIO(data), len(data))
+
+
+def outcome(decode, data):
+    try:
+        return decode(data)
+    except Exception as error:
+        return type(error)
 
 
 class TestBinaryFormat(OpenlrBaseTestCase):
@@ -60,3 +91,201 @@ class TestBinaryFormat(OpenlrBaseTestCase):
             except AssertionError:
                 print("failed input: " + name)
                 raise
+
+    def test_decoding_many_binary_examples(self):
+        data = [data for _, data, _ in LOCATIONS]
+        results = binary_decode_many(data)
+        self.assertEqual(len(results), len(LOCATIONS))
+        for result, (_, data, location) in zip(results, LOCATIONS):
+            self.assertEqual(result, binary_decode(data))
+            self.assert_locations(result, location)
+
+    def test_decoding_many_raw_binary(self):
+        data = [base64.b64decode(data) for _, data, _ in LOCATIONS]
+        results = binary_decode_many(iter(data), is_base64=False)
+        for result, (_, _, location) in zip(results, LOCATIONS):
+            self.assert_locations(result, location)
+
+    def test_decoding_many_error_policies(self):
+        data = [LOCATIONS[0][1], "ewGkNSK5Wg==", LOCATIONS[1][1], "CQ==", ""]
+        self.assertRaisesRegex(
+            ValueError, "cannot be identified", binary_decode_many, data
+        )
+        results = binary_decode_many(data, errors="skip")
+        self.assertEqual(results, [binary_decode(data[0]), binary_decode(data[2])])
+        results = binary_decode_many(data, errors="record")
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0], binary_decode(data[0]))
+        self.assertEqual(results[2], binary_decode(data[2]))
+        for index in (1, 3, 4):
+            self.assertIsInstance(results[index], DecodeError)
+            self.assertEqual(results[index].index, index)
+            self.assertEqual(results[index].data, data[index])
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertIsInstance(results[3].error, NotImplementedError)
+        self.assertRaisesRegex(
+            ValueError, "errors requires", binary_decode_many, data, errors="x"
+        )
+
+    def test_decoding_plans_match_reader(self):
+        locations = [location for _, _, location in LOCATIONS]
+        locations += random_locations(2000)
+        types = set()
+        for location in locations:
+            data = binary_encode(location, is_base64=False)
+            result = binary_decode(data, is_base64=False)
+            # exact equality, including the float values
+            self.assertEqual(result, decode_reference(data))
+            self.assertIs(type(result), type(location))
+            types.add(type(location))
+        self.assertEqual(len(types), len(LocationTypeCode))
+
+    def test_decoding_plans_match_reader_on_malformed_data(self):
+        rng = random.Random(0)
+        examples = [base64.b64decode(data) for _, data, _ in LOCATIONS]
+        for _ in range(20000):
+            data = bytearray(rng.choice(examples))
+            mutation = rng.randrange(3)
+            if mutation == 0:
+                data = data[: rng.randrange(len(data) + 1)]
+            elif mutation == 1:
+                data[rng.randrange(len(data))] = rng.randrange(256)
+            else:
+                data += bytes(rng.randrange(256) for _ in range(rng.randint(1, 8)))
+            data = bytes(data)
+            self.assertEqual(
+                outcome(lambda d: binary_decode(d, is_base64=False), data),
+                outcome(decode_reference, data),
+                msg="input: %s" % data.hex(),
+            )
+
+    def test_decoding_from_buffers_in_place(self):
+        records = [base64.b64decode(data) for _, data, _ in LOCATIONS]
+        blob = b"\x00" + b"".join(records)
+        with mmap.mmap(-1, len(blob)) as mapped:
+            mapped.write(blob)
+            buffers = [blob, bytearray(blob), memoryview(blob), mapped]
+            buffers.append(array.array("B", blob))
+            for buffer in buffers:
+                offset = 1
+                for record, (_, _, location) in zip(records, LOCATIONS):
+                    result = binary_decode_from(buffer, offset, len(record))
+                    self.assertEqual(result, binary_decode(record, is_base64=False))
+                    self.assert_locations(result, location)
+                    offset += len(record)
+        self.assertEqual(
+            binary_decode_from(records[0]), binary_decode(records[0], is_base64=False)
+        )
+        self.assertRaisesRegex(
+            ValueError, "exceeds the buffer", binary_decode_from, blob, len(blob), 1
+        )
+
+    def test_decoding_framed_records(self):
+        records = [base64.b64decode(data) for _, data, _ in LOCATIONS]
+        framed = b"".join(struct.pack(">H", len(r)) + r for r in records)
+        results = list(binary_decode_framed(framed))
+        self.assertEqual(len(results), len(LOCATIONS))
+        for result, (_, _, location) in zip(results, LOCATIONS):
+            self.assert_locations(result, location)
+        framed = b"".join(struct.pack("B", len(r)) + r for r in records)
+        results = list(binary_decode_framed(bytearray(framed), length_format="B"))
+        self.assertEqual(len(results), len(LOCATIONS))
+
+    def test_decoding_framed_releases_mmap_on_close(self):
+        records = [base64.b64decode(data) for _, data, _ in LOCATIONS]
+        framed = b"".join(struct.pack(">H", len(r)) + r for r in records)
+        mapped = mmap.mmap(-1, len(framed))
+        mapped.write(framed)
+        binary_decode_from(mapped, 2, len(records[0]))
+        locations = binary_decode_framed(mapped)
+        next(locations)
+        # the partially iterated generator holds a view of the mmap
+        self.assertRaises(BufferError, mapped.close)
+        locations.close()
+        mapped.close()
+        self.assertTrue(mapped.closed)
+
+    def test_decoding_framed_malformed_records(self):
+        good = base64.b64decode(LOCATIONS[0][1])
+        bad = base64.b64decode("ewGkNSK5Wg==")
+        framed = b"".join(struct.pack(">H", len(r)) + r for r in (good, bad, good))
+        self.assertRaises(ValueError, list, binary_decode_framed(framed))
+        self.assertEqual(len(list(binary_decode_framed(framed, errors="skip"))), 2)
+        results = list(binary_decode_framed(framed, errors="record"))
+        self.assertEqual(results[1].index, 1)
+        self.assertEqual(results[1].data, bad)
+        self.assertRaisesRegex(
+            ValueError,
+            "Truncated record",
+            list,
+            binary_decode_framed(framed[:-1], errors="skip"),
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            "Truncated length",
+            list,
+            binary_decode_framed(framed + b"\x00", errors="skip"),
+        )
+
+    def test_decoding_filtered_by_type(self):
+        data = [binary_encode(location) for location in random_locations(900)]
+        cases = (
+            ({LocationTypes.PointAlongLineLocation}, (2, 3)),
+            ({LocationTypeCode.PointAlongLineLocation}, (2,)),
+            (
+                [LocationTypes.RectangleLocation, LocationTypeCode.LineLocation],
+                (0, 5, 6),
+            ),
+        )
+        for types, codes in cases:
+            expected = [
+                binary_decode(item)
+                for item in data
+                if binary_decode_lazy(item).location_type in codes
+            ]
+            locations, counts = binary_decode_filtered(data, types)
+            self.assertEqual(locations, expected)
+            self.assertEqual(
+                counts, FilterCounts(len(expected), 900 - len(expected), 0, 0)
+            )
+
+    def test_decoding_filtered_by_bbox(self):
+        data = [binary_encode(location) for location in random_locations(900)]
+        bbox = (-20.0, -10.0, 40.0, 50.0)
+
+        def inside(location):
+            lon, lat = get_lonlat_list(location)[0]
+            if hasattr(location, "points"):
+                lon, lat = location.points[0][:2]
+            return bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]
+
+        expected = [
+            location for location in map(binary_decode, data) if inside(location)
+        ]
+        self.assertGreater(len(expected), 0)
+        self.assertLess(len(expected), 900)
+        locations, counts = binary_decode_filtered(data, bbox=bbox)
+        self.assertEqual(locations, expected)
+        self.assertEqual(counts.rejected_bbox, 900 - len(expected))
+
+    def test_decoding_filtered_errors(self):
+        data = [item for _, item, _ in LOCATIONS] + [
+            "ewGkNSK5Wg==",
+            "CQcm6yX4vTPGFwM7AskzCw==",
+        ]
+        with self.assertRaises(ValueError):
+            binary_decode_filtered(data)
+        locations, counts = binary_decode_filtered(data, errors="record")
+        self.assertEqual(counts, FilterCounts(len(LOCATIONS), 0, 0, 2))
+        self.assertIsInstance(locations[-1], DecodeError)
+        # headers of unknown version or type fail before the type filter
+        locations, counts = binary_decode_filtered(
+            data, {LocationTypeCode.CircleLocation}, errors="skip"
+        )
+        self.assertEqual(counts.errors, 2)
+        self.assertEqual(counts.matched + counts.rejected_type, len(LOCATIONS))
+        self.assertEqual(len(locations), counts.matched)
+        with self.assertRaises(ValueError):
+            binary_decode_filtered(data, ["LineLocation"])
+        with self.assertRaises(ValueError):
+            binary_decode_filtered(data, bbox=(1, 1, 0, 0))
@@ -0,0 +1,167 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import base64
+import os
+import tempfile
+import threading
+
+from openlr import (
+    binary_decode,
+    binary_encode,
+    xml_encode_to_string,
+    freeze,
+    CacheStats,
+    DecodeCache,
+    EncodeCache,
+)
+from openlr.cache import _entry_size
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS, random_locations
+
+REFERENCES = [data for _, data, _ in LOCATIONS]
+
+
+class TestDecodeCache(OpenlrBaseTestCase):
+    __name__ = "testing the LRU decode cache"
+
+    def test_repeats_are_hits(self):
+        cache = DecodeCache()
+        first = [cache.decode(data) for data in REFERENCES]
+        second = [cache(data) for data in REFERENCES]
+        self.assertEqual(first, [freeze(binary_decode(data)) for data in REFERENCES])
+        for a, b in zip(first, second):
+            self.assertIs(a, b)
+            # the shared location cannot be changed by a caller
+            for items in (getattr(a, "points", ()), getattr(a, "corners", ())):
+                self.assertIsInstance(items, tuple)
+        n = len(REFERENCES)
+        size = sum(_entry_size(data, loc) for data, loc in zip(REFERENCES, first))
+        self.assertEqual(cache.stats(), CacheStats(n, n, 0, n, size))
+        cache.reset_stats()
+        self.assertEqual(cache.stats().hits, 0)
+        self.assertEqual(len(cache), n)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = DecodeCache(max_entries=2)
+        a, b, c = REFERENCES[:3]
+        cache.decode(a)
+        cache.decode(b)
+        cache.decode(a)
+        cache.decode(c)
+        self.assertIn(a, cache)
+        self.assertNotIn(b, cache)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_byte_budget(self):
+        unbounded = DecodeCache(max_entries=None)
+        sizes = []
+        for data in REFERENCES:
+            size = unbounded.stats().size
+            unbounded.decode(data)
+            sizes.append(unbounded.stats().size - size)
+        # the decoded location is charged, not only the key
+        for data, size in zip(REFERENCES, sizes):
+            self.assertGreater(size, 4 * len(data))
+        budget = max(sizes) * 2
+        cache = DecodeCache(max_entries=None, max_bytes=budget)
+        for data in REFERENCES:
+            cache.decode(data)
+        self.assertLessEqual(cache.stats().size, budget)
+        self.assertIn(REFERENCES[-1], cache)
+        self.assertGreater(cache.stats().evictions, 0)
+
+    def test_errors_are_not_cached(self):
+        cache = DecodeCache()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.decode("ewGkNSK5Wg==")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats().misses, 2)
+
+    def test_raw_keys(self):
+        cache = DecodeCache(is_base64=False)
+        raw = base64.b64decode(REFERENCES[0])
+        self.assertEqual(
+            cache.decode(bytearray(raw)), freeze(binary_decode(raw, False))
+        )
+        self.assertIn(raw, cache)
+
+    def test_threads(self):
+        cache = DecodeCache(max_entries=5)
+
+        def work():
+            for _ in range(200):
+                for data in REFERENCES:
+                    self.assertEqual(cache.decode(data), freeze(binary_decode(data)))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, 4 * 200 * len(REFERENCES))
+        self.assertEqual(stats.entries, 5)
+
+    def test_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "cache.txt")
+            for is_base64 in (True, False):
+                cache = DecodeCache(is_base64=is_base64)
+                keys = (
+                    REFERENCES if is_base64 else list(map(base64.b64decode, REFERENCES))
+                )
+                for key in keys:
+                    cache.decode(key)
+                cache.decode(keys[0])
+                cache.save(filename)
+
+                warm = DecodeCache(max_entries=3, is_base64=is_base64)
+                self.assertEqual(warm.load(filename), len(keys))
+                # the most recently used references survive
+                self.assertIn(keys[0], warm)
+                self.assertIn(keys[-1], warm)
+                self.assertEqual(warm.stats().misses, 0)
+                self.assertEqual(
+                    warm.decode(keys[0]), freeze(binary_decode(keys[0], is_base64))
+                )
+                self.assertEqual(warm.stats().hits, 1)
+
+
+class TestEncodeCache(OpenlrBaseTestCase):
+    __name__ = "testing the LRU encode cache"
+
+    def test_equal_locations_are_hits(self):
+        locations = random_locations(100)
+        cache = EncodeCache()
+        for _ in range(2):
+            for location in locations:
+                self.assertEqual(cache.encode(location), binary_encode(location))
+        # frozen and list based locations share the entries
+        for location in locations:
+            self.assertEqual(cache(freeze(location)), binary_encode(location))
+        self.assertEqual(cache.stats()[:4], (200, 100, 0, 100))
+
+    def test_xml_and_budget(self):
+        locations = random_locations(20)
+        cache = EncodeCache(max_entries=None, max_bytes=5000, format="xml")
+        for location in locations:
+            self.assertEqual(cache.encode(location), xml_encode_to_string(location))
+        self.assertLessEqual(cache.stats().size, 5000)
+        self.assertGreater(cache.stats().evictions, 0)
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            EncodeCache(format="json")
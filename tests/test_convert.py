@@ -0,0 +1,199 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from openlr import binary_decode, xml_encode_to_file
+from openlr.__main__ import main
+from openlr.convert import convert, location_to_text
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS
+
+BASE64 = "".join(data + "\n" for _, data, _ in LOCATIONS)
+
+
+def run(text, *args, **kwargs):
+    output = io.BytesIO() if kwargs.get("to_format") == "framed" else io.StringIO()
+    stats = convert([io.BytesIO(text)], output, *args, **kwargs)
+    return output.getvalue(), stats
+
+
+class TestConvert(OpenlrBaseTestCase):
+    __name__ = "testing the conversion of reference files"
+
+    def test_round_trips(self):
+        for fmt in ("base64", "hex", "framed", "ndjson"):
+            converted, stats = run(BASE64.encode(), to_format=fmt)
+            self.assertEqual(stats.converted, len(LOCATIONS))
+            if isinstance(converted, str):
+                converted = converted.encode()
+            result, stats = run(converted, from_format=fmt, to_format="base64")
+            self.assertEqual(stats.failed, 0)
+            self.assertEqual(result, BASE64, fmt)
+
+    def test_input_left_open(self):
+        source = io.BytesIO(BASE64.encode())
+        stats = convert([source], io.StringIO())
+        self.assertEqual(stats.converted, len(LOCATIONS))
+        self.assertFalse(source.closed)
+
+    def test_xml(self):
+        # offsets are given in meters in XML, so compare XML with XML
+        expected, _ = run(BASE64.encode(), to_format="xml")
+        result, stats = run(expected.encode(), "xml", "xml")
+        self.assertEqual(stats.failed, 0)
+        self.assertEqual(result, expected)
+        locations = [binary_decode(data) for _, data, _ in LOCATIONS]
+        document = io.StringIO()
+        xml_encode_to_file(locations, document)
+        result, stats = run(document.getvalue().encode(), "xml", "xml")
+        self.assertEqual(stats.converted, len(LOCATIONS))
+        self.assertEqual(result, expected)
+
+    def test_geojson(self):
+        result, _ = run(BASE64.encode(), to_format="geojson")
+        features = [json.loads(line) for line in result.splitlines()]
+        self.assertEqual(len(features), len(LOCATIONS))
+        for feature, (_, data, _) in zip(features, LOCATIONS):
+            self.assertEqual(feature["type"], "Feature")
+            self.assertIn(
+                feature["geometry"]["type"], ("Point", "LineString", "Polygon")
+            )
+            geometry = feature["geometry"]
+            if geometry["type"] == "Polygon":
+                ring = geometry["coordinates"][0]
+                self.assertEqual(ring[0], ring[-1])
+        self.assertEqual(
+            features[0]["properties"]["type"],
+            type(binary_decode(LOCATIONS[0][1])).__name__,
+        )
+
+    def test_error_policies(self):
+        text = ("invalid\n" + BASE64).encode()
+        errors = io.StringIO()
+        result, stats = run(text, error_file=errors)
+        self.assertEqual((stats.converted, stats.failed), (len(LOCATIONS), 1))
+        self.assertIn("line 1:", errors.getvalue())
+        self.assertEqual(len(result.splitlines()), len(LOCATIONS))
+        errors = io.StringIO()
+        result, stats = run(text, errors="skip", error_file=errors)
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(errors.getvalue(), "")
+        self.assertRaisesRegex(ValueError, "line 1:", run, text, errors="fail")
+        self.assertRaisesRegex(ValueError, "errors requires", run, text, errors="x")
+        self.assertRaisesRegex(ValueError, "to_format", run, text, to_format="x")
+
+    def test_invalid_records(self):
+        ndjson, _ = run(BASE64.encode(), to_format="ndjson")
+        xml, _ = run(BASE64.encode(), to_format="xml")
+        invalid = {
+            "ndjson": ['{"type":"LineLocationReference"}', "[1]", "{", "null"],
+            "xml": [xml.splitlines()[0].replace("FRC3", "FRC9"), "<OpenLR>"],
+            "hex": ["0b", "xyz"],
+        }
+        for from_format, lines in invalid.items():
+            text = "\n".join(lines).encode()
+            _, stats = run(text, from_format, "base64", errors="skip")
+            self.assertEqual(stats.failed, len(lines), from_format)
+        self.assertEqual(run(ndjson.encode(), "ndjson", "base64")[0], BASE64)
+        # errors of the writers are not taken for invalid records
+        with mock.patch.dict(
+            "openlr.convert._WRITERS", {"base64": mock.Mock(side_effect=TypeError)}
+        ):
+            self.assertRaises(TypeError, run, BASE64.encode(), to_format="base64")
+
+    def test_truncated_frame(self):
+        framed, _ = run(BASE64.encode(), to_format="framed")
+        errors = io.StringIO()
+        result, stats = run(framed[:-3], "framed", "base64", error_file=errors)
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(stats.converted, len(LOCATIONS) - 1)
+        self.assertIn("record %d:" % len(LOCATIONS), errors.getvalue())
+
+    def test_workers(self):
+        expected, expected_stats = run(BASE64.encode(), to_format="ndjson")
+        result, stats = run(BASE64.encode(), to_format="ndjson", workers=2)
+        self.assertEqual(result, expected)
+        self.assertEqual(stats.types, expected_stats.types)
+
+    def test_stats(self):
+        _, stats = run(BASE64.encode())
+        self.assertEqual(sum(stats.types.values()), len(LOCATIONS))
+        summary = stats.summary()
+        self.assertIn("converted %d records, 0 failed" % len(LOCATIONS), summary)
+        self.assertIn("LineLocationReference", summary)
+
+    def test_location_to_text(self):
+        location = binary_decode(LOCATIONS[0][1])
+        self.assertEqual(location_to_text(location, "base64"), LOCATIONS[0][1] + "\n")
+
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = os.path.join(tmp_dir, "in.txt")
+            target = os.path.join(tmp_dir, "out.bin")
+            with open(source, "w") as f:
+                f.write(BASE64)
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                code = main(["-f", source, "--to", "framed", "-o", target, "--stats"])
+            self.assertEqual(code, 0)
+            self.assertIn("converted %d records" % len(LOCATIONS), stderr.getvalue())
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                code = main(
+                    ["-f", target, "-f", target, "--from", "framed", "--to", "base64"]
+                )
+            self.assertEqual(code, 0)
+            self.assertEqual(stdout.getvalue(), BASE64 * 2)
+
+    def test_command_line_converts_reference(self):
+        reference = LOCATIONS[0][1]
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            code = main([reference, "--to", "ndjson"])
+        self.assertEqual(code, 0)
+        expected, _ = run(reference.encode(), to_format="ndjson")
+        self.assertEqual(stdout.getvalue(), expected)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            code = main(["invalid", "--to", "hex", "--stats"])
+        self.assertEqual(code, 1)
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertIn("line 1:", stderr.getvalue())
+        self.assertIn("converted 0 records, 1 failed", stderr.getvalue())
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, main, [reference, "-f", "-"])
+
+    def test_command_line_reads_piped_stdin(self):
+        stdin = io.TextIOWrapper(io.BytesIO(BASE64.encode()))
+        stdout = io.StringIO()
+        with mock.patch("sys.stdin", stdin), contextlib.redirect_stdout(stdout):
+            code = main(["--to", "hex"])
+        self.assertEqual(code, 0)
+        expected, _ = run(BASE64.encode(), to_format="hex")
+        self.assertEqual(stdout.getvalue(), expected)
+
+        class Terminal(io.StringIO):
+            def isatty(self):
+                return True
+
+        with mock.patch("sys.stdin", Terminal()), contextlib.redirect_stderr(
+            io.StringIO()
+        ):
+            self.assertRaises(SystemExit, main, [])
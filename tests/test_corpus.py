@@ -0,0 +1,103 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from openlr import (
+    binary_decode,
+    freeze,
+    CircleLocationReference,
+    Coordinates,
+    GeoCoordinateLocationReference,
+    LocationCorpus,
+    LocationReferencePoint,
+)
+from openlr.binary_format import LocationTypeCode
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS, random_locations
+
+
+class TestLocationCorpus(OpenlrBaseTestCase):
+    __name__ = "testing the array-backed location corpus"
+
+    def test_views_read_like_locations(self):
+        locations = random_locations(1000)
+        corpus = LocationCorpus(locations)
+        self.assertEqual(len(corpus), len(locations))
+        for view, location in zip(corpus, locations):
+            self.assertEqual(view, location)
+            self.assertEqual(tuple(view), tuple(location))
+            self.assertEqual(view._fields, location._fields)
+            for field in location._fields:
+                self.assertEqual(getattr(view, field), getattr(location, field))
+            self.assertEqual(view.to_location(), location)
+            self.assertEqual(type(view.to_location()), type(location))
+
+    def test_points_view(self):
+        corpus = LocationCorpus(freeze(location) for _, _, location in LOCATIONS)
+        line = LOCATIONS[0][2]
+        view = corpus[0]
+        self.assertEqual(view.location_type, LocationTypeCode.LineLocation)
+        self.assertEqual(len(view.points), len(line.points))
+        self.assertEqual(view.points[-1], line.points[-1])
+        self.assertEqual(view.points[1:], line.points[1:])
+        self.assertIsInstance(view.points[0], LocationReferencePoint)
+        self.assertEqual(view[0], line.points)
+        self.assertEqual(corpus[-1], LOCATIONS[-1][2])
+        with self.assertRaises(AttributeError):
+            view.corners
+        with self.assertRaises(IndexError):
+            corpus[len(LOCATIONS)]
+
+    def test_int32_coordinates(self):
+        locations = random_locations(200, seed=3)
+        corpus = LocationCorpus(locations, coordinates="int32")
+        for view, location in zip(corpus, locations):
+            self.assert_locations(view.to_location(), location)
+        self.assertLess(corpus.nbytes, LocationCorpus(locations).nbytes)
+
+    def test_from_binary(self):
+        data = [data for _, data, _ in LOCATIONS] + ["ewGkNSK5Wg=="]
+        corpus = LocationCorpus.from_binary(iter(data), errors="skip")
+        self.assertEqual(
+            [corpus.location(i) for i in range(len(corpus))],
+            [binary_decode(item) for item in data[:-1]],
+        )
+        with self.assertRaises(ValueError):
+            LocationCorpus.from_binary(data)
+
+    def test_failed_append_leaves_corpus_unchanged(self):
+        locations = [location for _, _, location in LOCATIONS]
+        line = next(loc for loc in locations if type(loc).__name__.startswith("Line"))
+        last = line.points[-1]
+        invalid = [
+            # a bearing out of range in the last point only
+            line._replace(points=line.points[:-1] + [last._replace(bear=-1)]),
+            line._replace(poffs="x"),
+            CircleLocationReference(Coordinates(5.0, 52.0), 1 << 64),
+            Coordinates(5.0, 52.0),
+        ]
+        # a coordinate out of the int32 range
+        out_of_range = GeoCoordinateLocationReference(Coordinates(500.0, 52.0))
+        for coordinates, extra in (("float64", []), ("int32", [out_of_range])):
+            corpus = LocationCorpus(locations, coordinates)
+            views = [tuple(view) for view in corpus]
+            nbytes = corpus.nbytes
+            for location in invalid + extra:
+                with self.assertRaises((OverflowError, TypeError, ValueError)):
+                    corpus.append(location)
+                self.assertEqual(len(corpus), len(locations))
+                self.assertEqual(corpus.nbytes, nbytes)
+            self.assertEqual([tuple(view) for view in corpus], views)
+            corpus.append(line)
+            self.assertEqual(len(corpus), len(locations) + 1)
+            self.assertEqual(tuple(corpus[-2]), views[-1])
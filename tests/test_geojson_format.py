@@ -0,0 +1,112 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import json
+import math
+import os
+import tempfile
+
+from openlr import (
+    freeze,
+    geojson_encode_feature,
+    geojson_encode_geometry,
+    geojson_encode_to_file,
+    geojson_encode_to_string,
+    GeoJSONWriter,
+    Coordinates,
+    CircleLocationReference,
+    GridLocationReference,
+)
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS
+
+GEOMETRY_TYPES = {
+    "LineLocationReference": "LineString",
+    "GeoCoordinateLocationReference": "Point",
+    "PointAlongLineLocationReference": "Point",
+    "PoiWithAccessPointLocationReference": "Point",
+    "CircleLocationReference": "Polygon",
+    "RectangleLocationReference": "Polygon",
+    "GridLocationReference": "Polygon",
+    "PolygonLocationReference": "Polygon",
+    "ClosedLineLocationReference": "Polygon",
+}
+
+
+class TestGeoJSONFormat(OpenlrBaseTestCase):
+    __name__ = "testing GeoJSON export"
+
+    def test_geometry_types(self):
+        for name, _, location in LOCATIONS:
+            feature = geojson_encode_feature(location)
+            type_name = feature["properties"]["type"]
+            self.assertEqual(feature["geometry"]["type"], GEOMETRY_TYPES[type_name])
+            if feature["geometry"]["type"] == "Polygon":
+                (ring,) = feature["geometry"]["coordinates"]
+                self.assertEqual(ring[0], ring[-1], name)
+            self.assertEqual(feature, geojson_encode_feature(freeze(location)))
+            self.assertEqual(json.loads(geojson_encode_to_string(location)), feature)
+
+    def test_properties(self):
+        line = LOCATIONS[0][2]
+        properties = geojson_encode_feature(line)["properties"]
+        self.assertEqual(properties["points"][0]["frc"], line.points[0].frc.name)
+        self.assertEqual(properties["points"][0]["fow"], line.points[0].fow.name)
+        self.assertEqual(properties["poffs"], line.poffs)
+        self.assertEqual(properties["noffs"], line.noffs)
+
+    def test_circle(self):
+        location = CircleLocationReference(Coordinates(5.0, 52.0), 1000)
+        geometry = geojson_encode_geometry(location, circle_vertices=16)
+        (ring,) = geometry["coordinates"]
+        self.assertEqual(len(ring), 17)
+        for lon, lat in ring:
+            d_lat = (lat - 52.0) * 111320.0
+            d_lon = (lon - 5.0) * 111320.0 * math.cos(math.radians(52.0))
+            self.assertAlmostEqual(math.hypot(d_lon, d_lat), 1000, delta=1e-6)
+        # exterior rings are counterclockwise, with a positive signed area
+        area = sum(
+            lon_a * lat_b - lon_b * lat_a
+            for (lon_a, lat_a), (lon_b, lat_b) in zip(ring, ring[1:])
+        )
+        self.assertGreater(area, 0)
+        properties = geojson_encode_feature(location)["properties"]
+        self.assertEqual(properties["radius"], 1000)
+
+    def test_grid_extent(self):
+        location = GridLocationReference(
+            Coordinates(5.0, 52.0), Coordinates(5.5, 52.25), 4, 2
+        )
+        (ring,) = geojson_encode_geometry(location)["coordinates"]
+        self.assertEqual(ring[2], [7.0, 52.5])
+
+    def test_feature_collection(self):
+        locations = [location for _, _, location in LOCATIONS]
+        output = io.StringIO()
+        self.assertEqual(geojson_encode_to_file(locations, output), len(locations))
+        collection = json.loads(output.getvalue())
+        self.assertEqual(collection["type"], "FeatureCollection")
+        self.assertEqual(
+            collection["features"], [geojson_encode_feature(l) for l in locations]
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "empty.geojson")
+            with GeoJSONWriter(filename) as writer:
+                pass
+            self.assertEqual(writer.count, 0)
+            with open(filename) as f:
+                self.assertEqual(json.load(f)["features"], [])
+        self.assertRaises(ValueError, GeoJSONWriter, output, circle_vertices=2)
+        self.assertRaises(ValueError, geojson_encode_feature, (1, 2))
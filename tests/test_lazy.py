@@ -0,0 +1,72 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import base64
+
+from openlr import (
+    binary_decode,
+    binary_decode_lazy,
+    binary_encode,
+    get_lonlat_list,
+    PoiWithAccessPointLocationReference,
+)
+from openlr.binary_format import LocationTypeCode, _LOCATION_TYPE_FLAGS
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS, random_locations
+
+
+class TestLazyDecoding(OpenlrBaseTestCase):
+    __name__ = "testing lazy binary decoding"
+
+    def test_header_fields(self):
+        for location in random_locations(1000):
+            data = binary_encode(location)
+            lazy = binary_decode_lazy(data)
+            full = binary_decode(data)
+            self.assertEqual(
+                _LOCATION_TYPE_FLAGS[lazy.location_type],
+                base64.b64decode(data)[0] >> 3 & 0b1111,
+            )
+            self.assertEqual(lazy.lrp_count, len(getattr(full, "points", ())))
+            if not isinstance(full, PoiWithAccessPointLocationReference):
+                self.assertEqual(tuple(lazy.first_point), get_lonlat_list(full)[0])
+            else:
+                self.assertEqual(lazy.first_point, full.points[0][:2])
+            self.assertFalse(lazy.is_materialized)
+            self.assertEqual(lazy, full)
+            self.assertTrue(lazy.is_materialized)
+
+    def test_fields_are_decoded_once(self):
+        lazy = binary_decode_lazy(LOCATIONS[0][1])
+        self.assertEqual(lazy.location_type, LocationTypeCode.LineLocation)
+        self.assertEqual(lazy.points, binary_decode(LOCATIONS[0][1]).points)
+        self.assertIs(lazy.points, lazy.points)
+        self.assertIs(lazy.to_location(), lazy.to_location())
+        self.assertEqual(lazy._fields, ("points", "poffs", "noffs"))
+        self.assertEqual(lazy[1], lazy.poffs)
+        with self.assertRaises(AttributeError):
+            lazy.corners
+
+    def test_raw_data(self):
+        raw = base64.b64decode(LOCATIONS[1][1])
+        lazy = binary_decode_lazy(bytearray(raw), is_base64=False)
+        self.assertEqual(lazy.to_location(), binary_decode(raw, False))
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            binary_decode_lazy("ewGkNSK5Wg==")
+        with self.assertRaises(NotImplementedError):
+            binary_decode_lazy(b"\x09" + bytes(6), is_base64=False)
+        with self.assertRaises(ValueError):
+            binary_decode_lazy(b"\x0b\x00", is_base64=False)
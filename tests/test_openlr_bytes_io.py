@@ -18,6 +18,10 @@ from openlr.openlr_bytes_io import bytes_to_int, int_to_bytes
 from .openlr_base_test_case import OpenlrBaseTestCase, OFFSET_DELTA, DEG_DELTA
 
 
+class Integer(int):
+    """an integer that is not of type int"""
+
+
 class TestOpenLRBytesIO(OpenlrBaseTestCase):
     __name__ = "testing OpenLRBytesIO class and related conversion methods"
 
@@ -56,6 +60,19 @@ class TestOpenLRBytesIO(OpenlrBaseTestCase):
         self.assertEqual(bytearray(b"\x80\x01"), int_to_bytes(-32767, size=2))
         self.assertEqual(bytearray(b"\x80\x80"), int_to_bytes(-32640, size=2))
         self.assertEqual(bytearray(b"\xff"), int_to_bytes(-1, size=1))
+        # every value of one byte and the limits of three bytes, also for
+        # integers of other types than int
+        for size, signed, values in (
+            (1, True, range(-128, 128)),
+            (1, False, range(256)),
+            (3, True, (-(1 << 23), -1, 0, (1 << 23) - 1)),
+            (3, False, (0, (1 << 24) - 1)),
+        ):
+            for value in values:
+                data = int_to_bytes(value, size, signed)
+                self.assertEqual(len(data), size)
+                self.assertEqual(bytes_to_int(data, signed), value)
+                self.assertEqual(int_to_bytes(Integer(value), size, signed), data)
         self.assertEqual(bytearray(b"\xff\xff"), int_to_bytes(-1, size=2))
         self.assertEqual(bytearray(b"\xff\xff\xff"), int_to_bytes(-1, size=3))
         self.assertEqual(bytearray(b"\xff\xff\xff\xff"), int_to_bytes(-1, size=4))
@@ -11,10 +11,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+
 import openlr
 
 from .openlr_base_test_case import OpenlrBaseTestCase
-from .data import LOCATIONS
+from .data import LOCATIONS, random_locations
 
 
 class TestXMLFormat(OpenlrBaseTestCase):
@@ -29,3 +31,48 @@ class TestXMLFormat(OpenlrBaseTestCase):
         for name, _, location in LOCATIONS:
             location_dict = openlr.get_dict(location)
             self.assertIsNotNone(location_dict)
+
+    def test_dict_round_trip(self):
+        types = set()
+        for name, _, location in LOCATIONS:
+            types.add(type(location))
+            self.assertEqual(openlr.to_dict(location), openlr.get_dict(location))
+            self.assertEqual(openlr.from_dict(openlr.get_dict(location)), location)
+            for enum_names in (False, True):
+                location_dict = openlr.to_dict(location, enum_names)
+                self.assertEqual(openlr.from_dict(location_dict), location, name)
+                json_string = openlr.to_json(location, enum_names)
+                self.assertEqual(json.loads(json_string), location_dict)
+                self.assertEqual(openlr.from_json(json_string), location, name)
+            frozen = openlr.freeze(location)
+            self.assertEqual(openlr.to_dict(frozen), openlr.to_dict(location))
+        self.assertEqual(len(types), 9)
+        line_dict = openlr.to_dict(LOCATIONS[0][2], enum_names=True)
+        self.assertEqual(line_dict["properties"]["points"][0]["frc"], "FRC3")
+        self.assertIs(
+            type(openlr.to_dict(LOCATIONS[0][2])["properties"]["points"][0]["frc"]), int
+        )
+        self.assertRaises(ValueError, openlr.to_dict, (1, 2))
+        self.assertRaises(ValueError, openlr.from_dict, {"type": "x", "properties": {}})
+
+    def test_freeze_and_thaw(self):
+        for location in random_locations(500):
+            frozen = openlr.freeze(location)
+            self.assertIsInstance(frozen, type(location))
+            self.assertEqual(hash(frozen), hash(openlr.freeze(location)))
+            self.assertIs(openlr.freeze(frozen), frozen)
+            self.assertEqual(openlr.thaw(frozen), location)
+            self.assertEqual(type(openlr.thaw(frozen)), type(location))
+            self.assertEqual(
+                openlr.binary_encode(frozen), openlr.binary_encode(location)
+            )
+            self.assertEqual(openlr.get_dict(frozen), openlr.get_dict(location))
+
+    def test_frozen_locations_are_hashable(self):
+        frozen = {openlr.freeze(location) for _, _, location in LOCATIONS * 2}
+        self.assertEqual(len(frozen), len(LOCATIONS))
+        line = openlr.freeze(LOCATIONS[0][2])
+        self.assertIsInstance(line, openlr.FrozenLineLocationReference)
+        self.assertIsInstance(line.points, tuple)
+        with self.assertRaises(AttributeError):
+            line.poffs = 0
@@ -0,0 +1,87 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from openlr import (
+    binary_decode,
+    binary_encode,
+    decode_many,
+    encode_many,
+    xml_decode_string,
+    xml_encode_to_string,
+    DecodeError,
+)
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS, random_locations
+
+MALFORMED = "ewGkNSK5Wg=="
+
+
+class TestParallel(OpenlrBaseTestCase):
+    __name__ = "testing parallel encoding and decoding"
+
+    def test_decode_many_keeps_order(self):
+        data = [binary_encode(location) for location in random_locations(500)]
+        expected = [binary_decode(item) for item in data]
+        for workers in (1, 2):
+            result = list(decode_many(data, workers=workers, chunksize=7))
+            self.assertEqual(result, expected)
+
+    def test_decode_many_from_iterator(self):
+        data = [item for _, item, _ in LOCATIONS] * 20
+        result = list(decode_many(iter(data), workers=2, chunksize=5))
+        self.assertEqual(result, [binary_decode(item) for item in data])
+
+    def test_decode_many_error_policies(self):
+        data = [item for _, item, _ in LOCATIONS] * 3
+        data[5] = data[30] = MALFORMED
+        result = list(decode_many(data, workers=2, chunksize=4, errors="record"))
+        self.assertEqual(len(result), len(data))
+        errors = [r for r in result if isinstance(r, DecodeError)]
+        self.assertEqual([e.index for e in errors], [5, 30])
+        self.assertEqual(errors[1].data, MALFORMED)
+
+        result = list(decode_many(data, workers=2, chunksize=4, errors="skip"))
+        self.assertEqual(len(result), len(data) - 2)
+
+        with self.assertRaises(ValueError):
+            list(decode_many(data, workers=2, chunksize=4))
+
+    def test_xml_round_trip(self):
+        locations = random_locations(100, seed=1)
+        documents = list(encode_many(locations, workers=2, format="xml"))
+        self.assertEqual(
+            documents, [xml_encode_to_string(location) for location in locations]
+        )
+        result = list(decode_many(documents, workers=2, format="xml"))
+        self.assertEqual(result, [xml_decode_string(item) for item in documents])
+
+    def test_xml_error_records(self):
+        documents = ["<OpenLR>", xml_encode_to_string(LOCATIONS[0][2])]
+        result = list(decode_many(documents, workers=1, format="xml", errors="record"))
+        self.assertIsInstance(result[0], DecodeError)
+        self.assertEqual(result[0].index, 0)
+
+    def test_binary_encode_many(self):
+        locations = random_locations(200, seed=2)
+        expected = [binary_encode(location, False) for location in locations]
+        result = list(encode_many(locations, workers=2, is_base64=False))
+        self.assertEqual(result, expected)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            decode_many([], format="json")
+        with self.assertRaises(ValueError):
+            decode_many([], errors="ignore")
+        with self.assertRaises(ValueError):
+            encode_many([], workers=0)
@@ -0,0 +1,113 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import decimal
+import math
+import os
+
+from openlr.utils import j_round, sgn
+from openlr.openlr_bytes_io import (
+    OpenLRBytesIO,
+    deg_to_int,
+    int_to_deg,
+    DISTANCE_PER_INTERVAL,
+    BEAR_SECTOR,
+    DECA_MICRO_DEG_FACTOR,
+)
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+
+# the full 24 bit range takes about a minute, by default every 97th value is used
+COORDINATE_STEP = 1 if os.environ.get("OPENLR_EXHAUSTIVE_TESTS") else 97
+
+
+def decimal_j_round(float_num):
+    """the former Decimal based rounding, used as reference"""
+    num = decimal.Decimal(float_num).to_integral_value(rounding=decimal.ROUND_HALF_UP)
+    return int(num)
+
+
+def reference_deg_to_int(deg, resolution=24):
+    val = sgn(deg) * 0.5 + float(deg * (1 << resolution)) / 360.0
+    return decimal_j_round(val)
+
+
+class TestRounding(OpenlrBaseTestCase):
+    __name__ = "testing the rounding kernels against the Decimal reference"
+
+    def assert_j_round(self, value):
+        self.assertEqual(j_round(value), decimal_j_round(value), msg=repr(value))
+
+    def test_j_round_edge_cases(self):
+        self.assertEqual(j_round(2.5), 3)
+        self.assertEqual(j_round(-2.5), -3)
+        self.assertEqual(j_round(0.49999999999999994), 0)
+        self.assertEqual(j_round(-0.49999999999999994), 0)
+        for value in [0.0, -0.0, 0.5, -0.5, 1.5, 2**52 + 0.5, 2.0**53, -(2.0**60)]:
+            self.assert_j_round(value)
+        for value in [math.inf, -math.inf]:
+            self.assertRaises(OverflowError, j_round, value)
+        self.assertRaises(ValueError, j_round, math.nan)
+
+    def test_j_round_around_halves(self):
+        for i in range(-(1 << 16), 1 << 16, 7):
+            half = i + 0.5
+            for value in (half, math.nextafter(half, 0), math.nextafter(half, i + 1)):
+                self.assert_j_round(value)
+                self.assert_j_round(value / 3)
+
+    def test_coordinates_in_24_bit_range(self):
+        values = list(range(-(1 << 23), 1 << 23, COORDINATE_STEP))
+        values += [-(1 << 23), -1, 0, 1, (1 << 23) - 1]
+        for val in values:
+            deg = int_to_deg(val)
+            self.assertEqual(deg_to_int(deg), reference_deg_to_int(deg), msg=val)
+
+    def test_byte_lookup_tables(self):
+        for i in range(256):
+            stream = OpenLRBytesIO(bytes([i, i]))
+            self.assertEqual(stream.read_offset(), (float(i) + 0.5) / 256)
+            self.assertEqual(
+                stream.read_dnp(),
+                decimal_j_round((float(i) + 0.5) * DISTANCE_PER_INTERVAL),
+            )
+            stream = OpenLRBytesIO(bytes([i, i]))
+            bear = stream.read_point_attributes()[2]
+            self.assertEqual(
+                bear, decimal_j_round((i & 0b11111) * BEAR_SECTOR + BEAR_SECTOR / 2)
+            )
+
+    def test_writing_every_byte_value(self):
+        for i in range(256):
+            offset = (float(i) + 0.5) / 256
+            stream = OpenLRBytesIO()
+            stream.write_offset(offset)
+            self.assertEqual(
+                stream.getvalue()[0], decimal_j_round(float(offset) * 256 - 0.5)
+            )
+            dnp = OpenLRBytesIO(bytes([i])).read_dnp()
+            stream = OpenLRBytesIO()
+            stream.write_dnp(dnp)
+            self.assertEqual(stream.getvalue()[0], i)
+        for bear in range(360):
+            stream = OpenLRBytesIO()
+            stream.write_point_attributes(0, 0, bear, 0, 0)
+            expected = decimal_j_round((bear - BEAR_SECTOR / 2) / BEAR_SECTOR)
+            self.assertEqual(stream.getvalue()[1], expected & 0b11111)
+
+    def test_relative_coordinates(self):
+        for i in range(-(1 << 15), 1 << 15, 3):
+            delta = i / DECA_MICRO_DEG_FACTOR
+            for prev in (0.0, 13.4616744, -58.3732688):
+                value = DECA_MICRO_DEG_FACTOR * ((prev + delta) - prev)
+                self.assert_j_round(value)
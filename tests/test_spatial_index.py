@@ -0,0 +1,155 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+import random
+
+from openlr import (
+    Coordinates,
+    CircleLocationReference,
+    GridLocationReference,
+    LocationIndex,
+    RectangleLocationReference,
+    get_bbox,
+    get_lonlat_list,
+)
+from openlr.testing import GeneratorConfig, generate_locations
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS
+
+CONFIG = GeneratorConfig(
+    extent=(5.0, 45.0, 7.0, 47.0),
+    dnp=(50, 2000),
+    radius=(10, 20000),
+    grid_size=(1, 20),
+    rectangle_size=(0.001, 0.05),
+)
+
+
+def distance(lon, lat, bbox):
+    """equirectangular distance in meters from a point to a box"""
+    d_lon = max(bbox[0] - lon, 0.0, lon - bbox[2]) * math.cos(math.radians(lat))
+    d_lat = max(bbox[1] - lat, 0.0, lat - bbox[3])
+    return math.hypot(d_lon, d_lat) * 111320.0
+
+
+class TestSpatialIndex(OpenlrBaseTestCase):
+    __name__ = "testing the spatial index of locations"
+
+    def test_get_bbox(self):
+        for name, _, location in LOCATIONS:
+            min_lon, min_lat, max_lon, max_lat = get_bbox(location)
+            self.assertLessEqual(min_lon, max_lon, name)
+            self.assertLessEqual(min_lat, max_lat, name)
+            for lon, lat in get_lonlat_list(location):
+                self.assertTrue(min_lon <= lon <= max_lon, name)
+                self.assertTrue(min_lat <= lat <= max_lat, name)
+        circle = CircleLocationReference(Coordinates(6.0, 60.0), 11132)
+        bbox = get_bbox(circle)
+        self.assertAlmostEqual(bbox[1], 59.9)
+        self.assertAlmostEqual(bbox[3], 60.1)
+        self.assertAlmostEqual(bbox[0], 5.8)
+        self.assertAlmostEqual(bbox[2], 6.2)
+        grid = GridLocationReference(
+            Coordinates(5.0, 52.0), Coordinates(5.5, 52.25), 4, 3
+        )
+        self.assertEqual(get_bbox(grid), (5.0, 52.0, 7.0, 52.75))
+        rectangle = RectangleLocationReference(
+            Coordinates(5.0, 52.0), Coordinates(5.5, 52.25)
+        )
+        self.assertEqual(get_bbox(rectangle), (5.0, 52.0, 5.5, 52.25))
+
+    def test_queries_match_linear_scan(self):
+        locations = dict(enumerate(generate_locations(1500, config=CONFIG)))
+        index = LocationIndex(locations, cell_size=0.02)
+        # incremental updates: removals, replacements and insertions
+        for key in range(0, 1500, 7):
+            index.delete(key)
+            del locations[key]
+        replacements = generate_locations(300, seed=1, config=CONFIG)
+        for key, location in zip(range(0, 1500, 5), replacements):
+            index.insert(key, location)
+            locations[key] = location
+        self.assertEqual(len(index), len(locations))
+        self.assertEqual(set(index), set(locations))
+        # the bounds of the occupied cells are kept up to date
+        xs = [x for x, _ in index._cells]
+        ys = [y for _, y in index._cells]
+        self.assertEqual(index._occupied_bounds(), (min(xs), min(ys), max(xs), max(ys)))
+        bboxes = {key: get_bbox(location) for key, location in locations.items()}
+        for key in locations:
+            self.assertIs(index[key], locations[key])
+            self.assertEqual(index.bbox(key), bboxes[key])
+
+        rng = random.Random(0)
+        for _ in range(100):
+            lon, lat = rng.uniform(4.8, 7.2), rng.uniform(44.8, 47.2)
+            size = rng.choice((0.0, 0.01, 0.1, 1.0))
+            query = (lon, lat, lon + size, lat + size)
+            expected = {
+                key
+                for key, b in bboxes.items()
+                if b[0] <= query[2]
+                and query[0] <= b[2]
+                and b[1] <= query[3]
+                and query[1] <= b[3]
+            }
+            self.assertEqual(set(index.query_bbox(*query)), expected)
+
+            radius = rng.choice((0, 100, 2000, 50000))
+            expected = {
+                key
+                for key, b in bboxes.items()
+                if distance(lon, lat, b) <= radius * (1 - 1e-9)
+            }
+            found = set(index.query_radius(lon, lat, radius))
+            self.assertLessEqual(expected, found)
+            for key in found:
+                self.assertLessEqual(distance(lon, lat, bboxes[key]), radius * 1.000001)
+
+            k = rng.choice((1, 5, 50))
+            nearest = index.nearest(lon, lat, k)
+            distances = sorted(distance(lon, lat, b) for b in bboxes.values())
+            self.assertEqual(len(nearest), k)
+            for (d, key), expected_d in zip(nearest, distances):
+                self.assertAlmostEqual(d, expected_d, places=6)
+                self.assertAlmostEqual(distance(lon, lat, bboxes[key]), d, places=6)
+
+    def test_large_and_empty(self):
+        index = LocationIndex(cell_size=0.01)
+        self.assertEqual(index.nearest(6.0, 46.0, 3), [])
+        self.assertEqual(index.query_bbox(5.0, 45.0, 7.0, 47.0), [])
+        grid = GridLocationReference(
+            Coordinates(5.0, 45.0), Coordinates(5.5, 45.5), 4, 4
+        )
+        circle = CircleLocationReference(Coordinates(6.0, 46.0), 10)
+        index.update([("grid", grid), ("circle", circle)])
+        self.assertEqual(set(index.query_bbox(6.5, 46.5, 6.6, 46.6)), {"grid"})
+        self.assertEqual(set(index.query_radius(6.0, 46.0, 1)), {"grid", "circle"})
+        self.assertEqual(index.nearest(9.0, 46.0, 1)[0][1], "grid")
+        self.assertEqual(index.nearest(6.0, 46.0, 5), [(0.0, "grid"), (0.0, "circle")])
+        index.delete("grid")
+        self.assertEqual(index.query_bbox(6.5, 46.5, 6.6, 46.6), [])
+        far = CircleLocationReference(Coordinates(9.0, 48.0), 10)
+        index.insert("far", far)
+        self.assertEqual(index.nearest(9.0, 48.0, 1), [(0.0, "far")])
+        index.delete("far")
+        self.assertEqual(index.nearest(9.0, 48.0, 1)[0][1], "circle")
+        index.delete("circle")
+        self.assertEqual(index.nearest(9.0, 48.0, 1), [])
+        index.insert("circle", circle)
+        self.assertNotIn("grid", index)
+        self.assertRaises(KeyError, index.delete, "grid")
+        self.assertRaises(ValueError, index.query_bbox, 7.0, 45.0, 5.0, 47.0)
+        self.assertRaises(ValueError, LocationIndex, cell_size=0)
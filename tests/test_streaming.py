@@ -0,0 +1,160 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bz2
+import contextlib
+import gc
+import gzip
+import io
+import lzma
+import os
+import tempfile
+
+from openlr import binary_decode, DecodeError
+from openlr.__main__ import main
+from openlr.streaming import iter_lines, iter_reference_file, open_reference_file
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS
+
+CONTENT = (
+    "\n".join(data for _, data, _ in LOCATIONS[:5])
+    + "\n\n  ewGkNSK5Wg==  \r\n"
+    + "\n".join(data for _, data, _ in LOCATIONS[5:])
+).encode()
+
+COMPRESSORS = {
+    "txt": lambda data: data,
+    "gz": gzip.compress,
+    "bz2": bz2.compress,
+    "xz": lzma.compress,
+}
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+
+class TestStreaming(OpenlrBaseTestCase):
+    __name__ = "testing the streaming reader of reference files"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write_file(self, extension, content=CONTENT):
+        filename = os.path.join(self.tmp_dir.name, "dump." + extension)
+        with open(filename, "wb") as f:
+            f.write(COMPRESSORS[extension](content))
+        return filename
+
+    def assert_results(self, results):
+        self.assertEqual(len(results), len(LOCATIONS) + 1)
+        error_line, error = results[5]
+        self.assertEqual(error_line, 7)
+        self.assertIsInstance(error, DecodeError)
+        self.assertEqual(error.index, 7)
+        self.assertEqual(error.data, b"ewGkNSK5Wg==")
+        locations = results[:5] + results[6:]
+        for (line_number, result), (_, data, location) in zip(locations, LOCATIONS):
+            self.assertEqual(result, binary_decode(data))
+            self.assert_locations(result, location)
+        self.assertEqual(locations[-1][0], len(LOCATIONS) + 2)
+
+    def test_reading_compressed_files(self):
+        for extension in COMPRESSORS:
+            filename = self.write_file(extension)
+            self.assert_results(list(iter_reference_file(filename)))
+            # small blocks split the lines at arbitrary positions
+            self.assert_results(list(iter_reference_file(filename, block_size=7)))
+            with open(filename, "rb") as f:
+                self.assert_results(list(iter_reference_file(f)))
+                self.assertFalse(f.closed)
+
+    def test_reading_file_objects(self):
+        for extension, compress in COMPRESSORS.items():
+            fileobj = io.BytesIO(compress(CONTENT))
+            self.assert_results(list(iter_reference_file(fileobj)))
+            with open_reference_file(io.BytesIO(compress(CONTENT))) as f:
+                self.assertEqual(f.read(), CONTENT)
+
+    def test_file_objects_left_open(self):
+        for extension, compress in COMPRESSORS.items():
+            data = compress(CONTENT)
+            fileobj = io.BytesIO(data)
+            self.assert_results(list(iter_reference_file(fileobj)))
+            # a stream that can neither peek nor seek
+            stream = NonSeekable(data)
+            self.assert_results(list(iter_reference_file(stream)))
+            gc.collect()
+            self.assertFalse(fileobj.closed, extension)
+            self.assertFalse(stream.closed, extension)
+            stream = NonSeekable(data)
+            open_reference_file(stream).close()
+            self.assertFalse(stream.closed, extension)
+
+    def test_lines_longer_than_blocks(self):
+        data = b"a" * 100000 + b"\n\n b \n" + b"c" * 5000
+        for block_size in (1, 7, 4096, 1 << 20):
+            self.assertEqual(
+                list(iter_lines(io.BytesIO(data), block_size)),
+                [(1, b"a" * 100000), (3, b"b"), (4, b"c" * 5000)],
+            )
+
+    def test_reading_raw_lines(self):
+        filename = self.write_file("gz")
+        results = list(iter_reference_file(filename, decode=False))
+        self.assertEqual(results[0], (1, LOCATIONS[0][1].encode()))
+        self.assertEqual(results[5], (7, b"ewGkNSK5Wg=="))
+
+    def test_error_policies(self):
+        filename = self.write_file("txt")
+        self.assertRaisesRegex(
+            ValueError,
+            "cannot be identified",
+            list,
+            iter_reference_file(filename, errors="raise"),
+        )
+        results = list(iter_reference_file(filename, errors="skip"))
+        self.assertEqual(len(results), len(LOCATIONS))
+        self.assertRaisesRegex(
+            ValueError,
+            "errors requires",
+            list,
+            iter_reference_file(filename, errors="x"),
+        )
+
+    def test_last_line_without_newline(self):
+        filename = self.write_file("txt", LOCATIONS[0][1].encode())
+        self.assertEqual(
+            list(iter_reference_file(filename)), [(1, binary_decode(LOCATIONS[0][1]))]
+        )
+
+    def test_command_line(self):
+        filename = self.write_file("xz")
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            self.assertEqual(main(["--file", filename]), 1)
+        self.assertEqual(len(stdout.getvalue().splitlines()), len(LOCATIONS))
+        self.assertIn("line 7:", stderr.getvalue())
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.assertEqual(main([LOCATIONS[0][1]]), 0)
+        self.assertIn("<LineLocationReference>", stdout.getvalue())
@@ -0,0 +1,167 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import json
+import os
+import tempfile
+from collections import Counter
+
+from openlr import (
+    binary_decode,
+    binary_encode,
+    get_lonlat_list,
+    iter_reference_file,
+    xml_decode_stream,
+    xml_decode_string,
+    xml_encode_to_string,
+)
+from openlr.__main__ import main as cli_main
+from openlr.testing import (
+    CHUNK_SIZE,
+    GeneratorConfig,
+    generate_locations,
+    generate_references,
+    write_references,
+)
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+
+
+class TestGenerator(OpenlrBaseTestCase):
+    __name__ = "testing the synthetic location generator"
+
+    def test_reproducible(self):
+        locations = list(generate_locations(CHUNK_SIZE + 10, seed=7))
+        self.assertEqual(list(generate_locations(CHUNK_SIZE + 10, seed=7)), locations)
+        self.assertEqual(list(generate_locations(20, seed=7)), locations[:20])
+        self.assertNotEqual(list(generate_locations(20, seed=8)), locations[:20])
+        self.assertEqual(len(locations), CHUNK_SIZE + 10)
+
+    def test_encodable(self):
+        locations = list(generate_locations(3000, seed=1))
+        self.assertEqual(
+            {type(location).__qualname__ for location in locations},
+            {
+                "LineLocationReference",
+                "GeoCoordinateLocationReference",
+                "PointAlongLineLocationReference",
+                "PoiWithAccessPointLocationReference",
+                "CircleLocationReference",
+                "RectangleLocationReference",
+                "GridLocationReference",
+                "PolygonLocationReference",
+                "ClosedLineLocationReference",
+            },
+        )
+        for location in locations:
+            decoded = binary_decode(binary_encode(location))
+            self.assertEqual(type(decoded), type(location))
+            self.assertEqual(len(decoded), len(location))
+        for location in locations[:300]:
+            decoded = xml_decode_string(xml_encode_to_string(location))
+            self.assertEqual(type(decoded), type(location))
+
+    def test_distributions(self):
+        config = GeneratorConfig(
+            type_weights={"PolygonLocationReference": 1, "LineLocationReference": 3},
+            lrps={"2": 1, "20": 1},
+            polygon_corners=[3, 100],
+            dnp=(14000, 14900),
+            frc_weights=(0, 0, 0, 0, 0, 0, 1, 0),
+            extent=(5.0, 50.0, 6.0, 51.0),
+        )
+        locations = list(generate_locations(2000, seed=3, config=config))
+        types = Counter(type(location).__name__ for location in locations)
+        self.assertEqual(
+            set(types), {"PolygonLocationReference", "LineLocationReference"}
+        )
+        self.assertGreater(
+            types["LineLocationReference"], types["PolygonLocationReference"]
+        )
+        for location in locations:
+            for lon, lat in get_lonlat_list(location):
+                self.assertTrue(5.0 <= lon <= 6.0 and 50.0 <= lat <= 51.0)
+            if type(location).__name__ == "LineLocationReference":
+                self.assertIn(len(location.points), (2, 20))
+                for point in location.points[:-1]:
+                    self.assertEqual(point.frc, 6)
+                    self.assertTrue(14000 <= point.dnp <= 14900)
+            else:
+                self.assertTrue(3 <= len(location.corners) <= 100)
+            binary_encode(location)
+
+    def test_invalid_config(self):
+        for config in (
+            GeneratorConfig(type_weights={"Line": 1}),
+            GeneratorConfig(lrps=(1, 5)),
+            GeneratorConfig(polygon_corners=(2, 5)),
+            GeneratorConfig(dnp=(10, 20000)),
+            GeneratorConfig(bearings=(0, 360)),
+            GeneratorConfig(frc_weights=(1, 2)),
+            GeneratorConfig(offset_probability=1.5),
+            GeneratorConfig(extent=(0, 0, 190, 10)),
+            GeneratorConfig(extent=(0, 0, 1, 1), rectangle_size=(0.1, 2)),
+        ):
+            with self.assertRaises(ValueError):
+                list(generate_locations(1, config=config))
+            with self.assertRaises(ValueError):
+                generate_references(1, config=config)
+        with self.assertRaises(ValueError):
+            generate_references(1, format="json")
+
+    def test_references(self):
+        n = CHUNK_SIZE + 3
+        locations = list(generate_locations(n, seed=5))
+        references = list(generate_references(n, seed=5))
+        self.assertEqual(references, [binary_encode(loc) for loc in locations])
+        self.assertEqual(list(generate_references(n, seed=5, workers=2)), references)
+        xml_references = list(generate_references(5, seed=5, format="xml"))
+        self.assertEqual(
+            xml_references, [xml_encode_to_string(loc, False) for loc in locations[:5]]
+        )
+
+    def test_write_references(self):
+        expected = list(generate_references(50, seed=2))
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "references.txt.gz")
+            self.assertEqual(write_references(filename, 50, seed=2), 50)
+            decoded = [location for _, location in iter_reference_file(filename)]
+            self.assertEqual(decoded, [binary_decode(r) for r in expected])
+
+            filename = os.path.join(folder, "references.xml")
+            self.assertEqual(write_references(filename, 20, 2, format="xml"), 20)
+            self.assertEqual(
+                list(xml_decode_stream(filename)),
+                [
+                    xml_decode_string(xml_encode_to_string(location))
+                    for location in generate_locations(20, seed=2)
+                ],
+            )
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as folder:
+            config = os.path.join(folder, "config.json")
+            with open(config, "w") as f:
+                json.dump({"type_weights": {"CircleLocationReference": 1}}, f)
+            output = os.path.join(folder, "references.txt")
+            args = ["generate", "30", "-o", output, "--seed", "4", "--config", config]
+            self.assertEqual(cli_main(args), 0)
+            with open(output) as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), 30)
+        config = GeneratorConfig(type_weights={"CircleLocationReference": 1})
+        self.assertEqual(lines, list(generate_references(30, 4, config)))
+        buffer = io.StringIO()
+        write_references(buffer, 3, 4, config)
+        self.assertEqual(buffer.getvalue().splitlines(), lines[:3])
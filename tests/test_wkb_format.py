@@ -0,0 +1,198 @@
+# Copyright (C) 2012-2021, TomTom (http://tomtom.com).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import os
+import re
+import struct
+import tempfile
+from unittest import mock
+
+from openlr import (
+    Coordinates,
+    GeoCoordinateLocationReference,
+    PolygonLocationReference,
+    geojson_encode_feature,
+    geojson_encode_geometry,
+    wkb_format,
+)
+from openlr.wkb_format import (
+    wkb_encode,
+    wkb_encode_many,
+    wkt_encode,
+    wkt_encode_many,
+    write_pgcopy,
+)
+
+from .openlr_base_test_case import OpenlrBaseTestCase
+from .data import LOCATIONS
+
+GEOMETRY_TYPES = {1: "Point", 2: "LineString", 3: "Polygon"}
+
+
+class Float(float):
+    """a float with the repr of NumPy scalars"""
+
+    def __repr__(self):
+        return "numpy.float64(%s)" % float.__repr__(self)
+
+
+class Reader:
+    """reads values of a byte string one after the other"""
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def read(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+
+def parse_wkb(data):
+    """returns the GeoJSON geometry and SRID of (E)WKB"""
+    reader = Reader(data)
+    (byte_order,) = reader.read("<B")
+    endian = "<" if byte_order == 1 else ">"
+    (wkb_type,) = reader.read(endian + "I")
+    srid = None
+    if wkb_type & 0x20000000:
+        (srid,) = reader.read(endian + "I")
+    geometry_type = GEOMETRY_TYPES[wkb_type & 0xFFFF]
+
+    def positions():
+        (n,) = reader.read(endian + "I")
+        return [list(reader.read(endian + "2d")) for _ in range(n)]
+
+    if geometry_type == "Point":
+        coordinates = list(reader.read(endian + "2d"))
+    elif geometry_type == "LineString":
+        coordinates = positions()
+    else:
+        (n_rings,) = reader.read(endian + "I")
+        coordinates = [positions() for _ in range(n_rings)]
+    assert reader.offset == len(data), "trailing bytes"
+    return {"type": geometry_type, "coordinates": coordinates}, srid
+
+
+def parse_wkt(text):
+    """returns the GeoJSON geometry of WKT"""
+    match = re.fullmatch(r"(POINT|LINESTRING|POLYGON) \((.*)\)", text)
+    geometry_type, body = match.groups()
+
+    def positions(part):
+        return [[float(v) for v in p.split(" ")] for p in part.split(", ")]
+
+    if geometry_type == "POINT":
+        return {"type": "Point", "coordinates": positions(body)[0]}
+    if geometry_type == "LINESTRING":
+        return {"type": "LineString", "coordinates": positions(body)}
+    rings = re.findall(r"\(([^()]*)\)", body)
+    return {"type": "Polygon", "coordinates": [positions(r) for r in rings]}
+
+
+def parse_pgcopy(data):
+    """returns the rows of a PostgreSQL binary COPY file"""
+    reader = Reader(data)
+    assert data.startswith(b"PGCOPY\n\xff\r\n\x00")
+    reader.offset = 11
+    flags, extension = reader.read(">ii")
+    assert (flags, extension) == (0, 0)
+    rows = []
+    while True:
+        (n_fields,) = reader.read(">h")
+        if n_fields == -1:
+            break
+        row = []
+        for _ in range(n_fields):
+            (length,) = reader.read(">i")
+            row.append(data[reader.offset : reader.offset + length])
+            reader.offset += length
+        rows.append(row)
+    assert reader.offset == len(data), "trailing bytes"
+    return rows
+
+
+class TestWKBFormat(OpenlrBaseTestCase):
+    __name__ = "testing WKB, WKT and PostgreSQL COPY export"
+
+    def test_wkb(self):
+        for name, _, location in LOCATIONS:
+            expected = geojson_encode_geometry(location)
+            self.assertEqual(parse_wkb(wkb_encode(location)), (expected, None), name)
+            self.assertEqual(
+                parse_wkb(wkb_encode(location, srid=4326)), (expected, 4326), name
+            )
+        locations = [location for _, _, location in LOCATIONS]
+        self.assertEqual(
+            wkb_encode_many(locations, 3857),
+            [wkb_encode(location, 3857) for location in locations],
+        )
+        self.assertEqual(wkb_encode(LOCATIONS[0][2])[:5], b"\x01\x02\x00\x00\x00")
+
+    def test_empty_polygon(self):
+        location = PolygonLocationReference([])
+        empty = {"type": "Polygon", "coordinates": []}
+        self.assertEqual(parse_wkb(wkb_encode(location)), (empty, None))
+        self.assertEqual(parse_wkb(wkb_encode(location, srid=4326)), (empty, 4326))
+        self.assertEqual(wkt_encode(location), "POLYGON EMPTY")
+        output = io.BytesIO()
+        self.assertEqual(write_pgcopy([location], output), 1)
+        self.assertEqual(
+            parse_wkb(parse_pgcopy(output.getvalue())[0][1]), (empty, 4326)
+        )
+
+    def test_struct_cache_is_bounded(self):
+        with mock.patch.dict(wkb_format._STRUCTS, clear=True), mock.patch.object(
+            wkb_format, "_MAX_STRUCTS", 4
+        ):
+            for n in range(3, 20):
+                corners = [Coordinates(5.0 + i * 0.01, 52.0 + i % 2) for i in range(n)]
+                location = PolygonLocationReference(corners)
+                self.assertEqual(
+                    parse_wkb(wkb_encode(location))[0],
+                    geojson_encode_geometry(location),
+                )
+            self.assertEqual(len(wkb_format._STRUCTS), 4)
+
+    def test_wkt(self):
+        for name, _, location in LOCATIONS:
+            expected = geojson_encode_geometry(location, circle_vertices=8)
+            wkt = wkt_encode(location, circle_vertices=8)
+            self.assertEqual(parse_wkt(wkt), expected, name)
+        locations = [location for _, _, location in LOCATIONS]
+        self.assertEqual(wkt_encode_many(locations), [wkt_encode(l) for l in locations])
+        self.assertEqual(
+            wkt_encode(LOCATIONS[0][2]),
+            "LINESTRING (6.1268198 49.6085178, 6.1283698 49.6039878, "
+            "6.1281598 49.6030578)",
+        )
+        point = GeoCoordinateLocationReference(Coordinates(Float(5.1), Float(52.25)))
+        self.assertEqual(wkt_encode(point), "POINT (5.1 52.25)")
+
+    def test_pgcopy(self):
+        locations = [location for _, _, location in LOCATIONS]
+        output = io.BytesIO()
+        self.assertEqual(write_pgcopy(locations, output), len(locations))
+        rows = parse_pgcopy(output.getvalue())
+        self.assertEqual(len(rows), len(locations))
+        for (type_name, wkb), location in zip(rows, locations):
+            feature = geojson_encode_feature(location)
+            self.assertEqual(type_name.decode(), feature["properties"]["type"])
+            self.assertEqual(parse_wkb(wkb), (feature["geometry"], 4326))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "empty.pgcopy")
+            self.assertEqual(write_pgcopy([], filename), 0)
+            with open(filename, "rb") as f:
+                self.assertEqual(parse_pgcopy(f.read()), [])
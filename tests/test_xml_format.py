@@ -11,12 +11,46 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import io
 import os
+import tempfile
+import unittest
+from xml.dom import minidom
+from xml.etree import ElementTree
+from xml.parsers.expat import ExpatError
 
-from openlr import xml_decode_file, xml_decode_string, xml_encode_to_string
+from openlr import (
+    FRC,
+    FOW,
+    LineLocationReference,
+    LocationReferencePoint,
+    xml_decode_document,
+    xml_decode_element,
+    xml_decode_file,
+    xml_decode_stream,
+    xml_decode_string,
+    xml_encode_to_document,
+    xml_encode_to_file,
+    xml_encode_to_string,
+    XMLWriter,
+    DecodeError,
+    set_xml_backend,
+    XMLParseError,
+)
+from openlr import xml_format
+from openlr.xml_writer import _escape
 
 from .openlr_base_test_case import OpenlrBaseTestCase
-from .data import LOCATIONS
+from .data import LOCATIONS, random_locations
+
+
+def xml_multi_document(locations, is_pretty=False):
+    """one document with an OpenLR element per location in a container"""
+    elements = [
+        xml_encode_to_string(location, is_pretty).split("?>", 1)[1]
+        for location in locations
+    ]
+    return ("<Export><Header/>" + "".join(elements) + "</Export>").encode()
 
 
 class TestXMLFormat(OpenlrBaseTestCase):
@@ -52,3 +86,173 @@ class TestXMLFormat(OpenlrBaseTestCase):
         xml_string = xml_encode_to_string(location, is_pretty=True)
         parsed_location = xml_decode_string(xml_string)
         self.assert_locations(location, parsed_location)
+
+    def test_decoding_xml_stream_examples(self):
+        for name, _, _ in LOCATIONS:
+            filename = os.path.join(
+                os.path.dirname(__file__), "xml_data", name + ".xml"
+            )
+            self.assertEqual(
+                list(xml_decode_stream(filename)), [xml_decode_file(filename)]
+            )
+
+    def test_decoding_xml_stream_matches_minidom(self):
+        locations = random_locations(300)
+        for is_pretty in (False, True):
+            data = xml_multi_document(locations, is_pretty)
+            doc = minidom.parseString(data)
+            expected = [
+                xml_decode_document(el)
+                for el in doc.getElementsByTagNameNS("*", "OpenLR")
+            ]
+            self.assertEqual(len(expected), len(locations))
+            self.assertEqual(list(xml_decode_stream(io.BytesIO(data))), expected)
+
+    def test_decoding_xml_element(self):
+        data = xml_encode_to_string(LOCATIONS[0][2])
+        expected = xml_decode_string(data)
+        root = ElementTree.fromstring(data)
+        self.assertEqual(xml_decode_element(root), expected)
+        self.assertEqual(xml_decode_element(ElementTree.ElementTree(root)), expected)
+
+    def test_decoding_xml_stream_errors(self):
+        data = xml_multi_document([LOCATIONS[0][2], LOCATIONS[1][2]])
+        data = data.replace(b"<FRC>FRC3</FRC>", b"<FRC>FRC9</FRC>", 1)
+        with self.assertRaises(KeyError):
+            list(xml_decode_stream(io.BytesIO(data)))
+        results = list(xml_decode_stream(io.BytesIO(data), errors="skip"))
+        self.assertEqual(
+            results, [xml_decode_string(xml_encode_to_string(LOCATIONS[1][2]))]
+        )
+        results = list(xml_decode_stream(io.BytesIO(data), errors="record"))
+        self.assertIsInstance(results[0], DecodeError)
+        self.assertEqual(results[0].index, 0)
+        self.assertIn(b"FRC9", results[0].data)
+        with self.assertRaises(XMLParseError):
+            list(xml_decode_stream(io.BytesIO(data[:-5]), errors="skip"))
+
+    def test_encoding_xml_matches_minidom(self):
+        locations = [location for _, _, location in LOCATIONS]
+        locations += random_locations(300)
+        for location in locations:
+            doc = xml_encode_to_document(location)
+            self.assertEqual(
+                xml_encode_to_string(location), doc.toprettyxml(indent="  ")
+            )
+            self.assertEqual(xml_encode_to_string(location, False), doc.toxml())
+
+    def test_encoding_xml_file(self):
+        locations = random_locations(100)
+        expected = [
+            xml_decode_string(xml_encode_to_string(location)) for location in locations
+        ]
+        for is_pretty in (False, True):
+            buffer = io.StringIO()
+            count = xml_encode_to_file(locations, buffer, is_pretty)
+            self.assertEqual(count, len(locations))
+            data = buffer.getvalue()
+            self.assertTrue(data.startswith('<?xml version="1.0" ?>'))
+            self.assertEqual(data.count("<OpenLR "), len(locations))
+            stream = io.BytesIO(data.encode())
+            self.assertEqual(list(xml_decode_stream(stream)), expected)
+
+    def test_encoding_xml_writer(self):
+        location = LOCATIONS[0][2]
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "locations.xml")
+            with XMLWriter(filename, root_tag="Export") as writer:
+                writer.write(location)
+                writer.write(location)
+            with open(filename, encoding="utf-8") as file:
+                data = file.read()
+            element = xml_encode_to_string(location).split("?>\n", 1)[1]
+            indented = "".join("  " + line for line in element.splitlines(True))
+            self.assertEqual(
+                data,
+                '<?xml version="1.0" ?>\n<Export>\n' + indented * 2 + "</Export>\n",
+            )
+            self.assertEqual(len(list(xml_decode_stream(filename))), 2)
+        with self.assertRaises(ValueError):
+            XMLWriter(io.StringIO()).write(object())
+
+    def test_encoding_xml_escaping(self):
+        location = LOCATIONS[0][2]
+        doc = xml_encode_to_document(location)
+        doc.documentElement.firstChild.firstChild.data = '<&"id">'
+        self.assertIn(
+            "<LocationID>&lt;&amp;&quot;id&quot;&gt;</LocationID>", doc.toxml()
+        )
+        self.assertEqual(_escape('<&"id">'), "&lt;&amp;&quot;id&quot;&gt;")
+
+    def test_decoding_minidom_document(self):
+        for location in random_locations(200):
+            data = xml_encode_to_string(location)
+            expected = xml_decode_element(ElementTree.fromstring(data))
+            doc = minidom.parseString(data)
+            self.assertEqual(xml_decode_document(doc), expected)
+            self.assertEqual(xml_decode_document(doc.documentElement), expected)
+            self.assertEqual(xml_decode_string(data), expected)
+        with self.assertRaises(ValueError):
+            xml_decode_document(minidom.parseString("<Export/>"))
+
+    def test_decoding_xml_long_line(self):
+        points = [
+            LocationReferencePoint(
+                5.0 + i * 1e-3, 52.0, FRC.FRC3, FOW.SINGLE_CARRIAGEWAY, 90, FRC.FRC3, 70
+            )
+            for i in range(2000)
+        ]
+        points[-1] = points[-1]._replace(lfrcnp=FRC.FRC7, dnp=0)
+        location = LineLocationReference(points, 0.5, 0.25)
+        data = xml_encode_to_string(location)
+        result = xml_decode_string(data)
+        self.assertEqual(result.points, points)
+        self.assertEqual(xml_decode_document(minidom.parseString(data)), result)
+
+    def test_xml_backends(self):
+        self.assertIn(set_xml_backend("etree"), xml_format.XML_BACKENDS)
+        try:
+            self.assertEqual(set_xml_backend("etree"), "etree")
+            with self.assertRaises(ValueError):
+                set_xml_backend("minidom")
+            if xml_format.lxml_etree is None:
+                with self.assertRaises(ImportError):
+                    set_xml_backend("lxml")
+        finally:
+            set_xml_backend()
+
+    def test_parse_errors(self):
+        data = xml_encode_to_string(LOCATIONS[0][2])[:-5]
+        backends = ["etree"] + (["lxml"] if xml_format.lxml_etree is not None else [])
+        try:
+            for backend in backends:
+                set_xml_backend(backend)
+                with self.assertRaises(ExpatError) as context:
+                    xml_decode_string(data)
+                self.assertIsInstance(context.exception, XMLParseError)
+                self.assertIsInstance(context.exception, SyntaxError)
+                self.assertEqual(context.exception.lineno, data.count("\n") + 1)
+                with self.assertRaises(XMLParseError):
+                    xml_decode_file(io.BytesIO(data.encode()))
+                with self.assertRaises(XMLParseError):
+                    list(xml_decode_stream(io.BytesIO(data.encode())))
+        finally:
+            set_xml_backend()
+
+    @unittest.skipIf(xml_format.lxml_etree is None, "lxml is not installed")
+    def test_lxml_backend(self):
+        locations = random_locations(100)
+        data = xml_multi_document(locations, True)
+        set_xml_backend("etree")
+        try:
+            expected = list(xml_decode_stream(io.BytesIO(data)))
+            set_xml_backend("lxml")
+            self.assertEqual(list(xml_decode_stream(io.BytesIO(data))), expected)
+            for location in locations[:10]:
+                data = xml_encode_to_string(location)
+                self.assertEqual(
+                    xml_decode_string(data),
+                    xml_decode_element(ElementTree.fromstring(data)),
+                )
+        finally:
+            set_xml_backend()